@@ -0,0 +1,105 @@
+import tracemalloc
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Callable, List
+
+import numpy as np
+
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork, Topology
+from model.neuroevolution.compact import CompactPopulation
+from model.neuroevolution.individual import AdultIndividual, ChildIndividual
+
+
+@dataclass
+class MemoryResult:
+    representation: str
+    individuals: int
+    layers: str
+    peak: int
+    """
+    Peak of memory allocated while the population was being created, in bytes.
+    """
+    weights: int
+    """
+    Size of weights and biases of a single individual in bytes.
+    """
+
+    @property
+    def per_individual(self) -> float:
+        return self.peak / self.individuals
+
+    @property
+    def overhead(self) -> float:
+        """Memory of an individual relative to its weights."""
+        return self.per_individual / self.weights
+
+
+def _peak(build: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        population = build()
+        _, peak = tracemalloc.get_traced_memory()
+        del population
+        return peak - start
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(
+    layers: List[LayerInfo], individuals: int, output_neurons_count: int = 2
+) -> List[MemoryResult]:
+    """
+    Measures memory of a population of networks kept as individuals
+    (`AdultIndividual`), of their children copied with `deepcopy`
+    and of a `CompactPopulation`.
+    """
+    topology = Topology.shared(tuple(layers), output_neurons_count)
+    weights = topology.size * np.dtype(np.float64).itemsize
+    description = "-".join(str(layer.neurons_count) for layer in layers)
+    adults = [
+        AdultIndividual(NeuralNetwork(layers, output_neurons_count), 0.0)
+        for _ in range(individuals)
+    ]
+    cases = {
+        "individuals": lambda: [
+            AdultIndividual(NeuralNetwork(layers, output_neurons_count), 0.0)
+            for _ in range(individuals)
+        ],
+        "deepcopy": lambda: [
+            ChildIndividual(deepcopy(adult.neural_network)) for adult in adults
+        ],
+        "compact": lambda: CompactPopulation(topology, individuals),
+    }
+    return [
+        MemoryResult(name, individuals, description, _peak(build), weights)
+        for name, build in cases.items()
+    ]
+
+
+def run_memory(
+    layers: List[List[LayerInfo]], populations: List[int]
+) -> List[MemoryResult]:
+    return [
+        result
+        for network in layers
+        for individuals in populations
+        for result in run_case(network, individuals)
+    ]
+
+
+def report(results: List[MemoryResult]) -> str:
+    """Formats results as a markdown table."""
+    lines = [
+        "| representation | layers | individuals | peak MiB | bytes / individual"
+        " | weights bytes | overhead |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.representation} | {r.layers} | {r.individuals}"
+            f" | {r.peak / 2**20:.2f} | {r.per_individual:.0f} | {r.weights}"
+            f" | x{r.overhead:.2f} |"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,359 @@
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmark.precision import evolved_networks
+from model.fitness import Progress, fitness_functions
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork
+from model.simulation import FIXED_DELTA_TIME, Simulation
+from model.track.catalog import TrackCatalog
+from model.track.track import Track
+from model.trajectory import (
+    HEADING,
+    SEGMENT,
+    SENSORS,
+    X,
+    Y,
+    Trajectory,
+    TrajectoryRecorder,
+)
+from view.silent_environment import SilentEnvironment
+
+GROUP = "cars"
+
+
+class Engine(ABC):
+    """
+    A way of simulating cars, compared with the reference one.
+
+    An engine gets the same networks, track and time step as the reference
+    and must record the same trajectories and progress of the cars,
+    however it computes them.
+    """
+
+    def prepare(self, networks: List[NeuralNetwork]) -> List[NeuralNetwork]:
+        """Networks the engine runs, e.g. converted to another type (not timed)."""
+        return networks
+
+    @abstractmethod
+    def simulate(
+        self,
+        track: Track,
+        networks: List[NeuralNetwork],
+        delta_time: float,
+        recorder: Optional[TrajectoryRecorder],
+        max_ticks: int,
+    ) -> Progress:
+        """
+        Runs cars until all of them crash or for max_ticks ticks.
+
+        Returns:
+            Progress of the cars, in the order of the networks.
+        """
+        raise NotImplementedError
+
+
+class ReferenceEngine(Engine):
+    """`Simulation` of cars as objects, each sensing its surroundings on its own."""
+
+    incremental_sensing = False
+
+    def simulate(
+        self,
+        track: Track,
+        networks: List[NeuralNetwork],
+        delta_time: float,
+        recorder: Optional[TrajectoryRecorder],
+        max_ticks: int,
+    ) -> Progress:
+        simulation = Simulation(
+            track,
+            {GROUP: networks},
+            recorder,
+            delta_time,
+            incremental_sensing=self.incremental_sensing,
+        )
+        simulation.run(max_ticks)
+        return simulation.progress
+
+
+class IncrementalSensingEngine(ReferenceEngine):
+    """`Simulation` with all cars sensing at once with `IncrementalSensing`."""
+
+    incremental_sensing = True
+
+
+class Float32Engine(ReferenceEngine):
+    """`Simulation` of networks with float32 weights, differences are expected."""
+
+    def prepare(self, networks: List[NeuralNetwork]) -> List[NeuralNetwork]:
+        return [network.astype(np.float32) for network in networks]
+
+
+engines: Dict[str, Engine] = {
+    "reference": ReferenceEngine(),
+    "incremental": IncrementalSensingEngine(),
+    "float32": Float32Engine(),
+}
+"""
+Compared engines, new ones are registered here under a unique name.
+"""
+
+
+@dataclass(frozen=True)
+class Tolerances:
+    position: float = 1e-6
+    heading: float = 1e-6
+    """
+    Radians.
+    """
+    sensor: float = 1e-6
+    adaptation: float = 1e-9
+
+
+@dataclass
+class EngineRun:
+    """Recorded trajectories of all cars simulated by an engine."""
+
+    trajectories: List[Trajectory]
+    adaptations: np.ndarray
+    seconds: float
+    """
+    Shortest time of the repeated runs without recording.
+    """
+
+
+@dataclass
+class Divergence:
+    car: int
+    tick: int
+    """
+    First tick where the engines differ, 0 is the state before the first step.
+    """
+    quantity: str
+    """
+    One of "segment", "position", "heading", "sensors" or "length"
+    (a car crashed at a different tick).
+    """
+    difference: float
+
+
+@dataclass
+class EngineParity:
+    track: str
+    engine: str
+    cars: int
+    divergences: List[Divergence]
+    """
+    The first divergence of every car which diverged.
+    """
+    max_differences: Dict[str, float]
+    """
+    Largest difference of every quantity over ticks recorded by both engines.
+    """
+    adaptation_difference: float
+    adaptations_match: bool
+    reference_seconds: float
+    seconds: float
+
+    @property
+    def equivalent(self) -> bool:
+        return not self.divergences and self.adaptations_match
+
+    @property
+    def first_divergence(self) -> Optional[Divergence]:
+        return min(self.divergences, key=lambda d: (d.tick, d.car), default=None)
+
+    @property
+    def speedup(self) -> float:
+        return self.reference_seconds / self.seconds
+
+
+def run_engine(
+    engine: Engine,
+    track: Track,
+    networks: List[NeuralNetwork],
+    delta_time: float = FIXED_DELTA_TIME,
+    max_ticks: int = 2000,
+    repeats: int = 3,
+    fitness: str = "progress",
+) -> EngineRun:
+    """
+    Runs an engine once recording trajectories (in float64),
+    then `repeats` times without recording to time it.
+    """
+    networks = engine.prepare(networks)
+    # one more row for the state before the first step
+    recorder = TrajectoryRecorder(max_ticks + 1, [GROUP], np.float64)
+    progress = engine.simulate(track, networks, delta_time, recorder, max_ticks)
+    seconds = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        engine.simulate(track, networks, delta_time, None, max_ticks)
+        seconds = min(seconds, time.perf_counter() - start)
+    return EngineRun(
+        [recorder.trajectory(GROUP, index) for index in range(len(networks))],
+        np.asarray(fitness_functions[fitness].value(progress), dtype=float),
+        seconds,
+    )
+
+
+def _differences(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, np.ndarray]:
+    """Differences of every quantity per tick of a single car."""
+    heading = reference[:, HEADING] - candidate[:, HEADING]
+    sensors = np.nan_to_num(np.abs(reference[:, SENSORS] - candidate[:, SENSORS]))
+    # a car without sensor readings (NaN) differs from one with them
+    sensors[np.isnan(reference[:, SENSORS]) != np.isnan(candidate[:, SENSORS])] = np.inf
+    return {
+        "segment": np.abs(reference[:, SEGMENT] - candidate[:, SEGMENT]),
+        "position": np.hypot(
+            reference[:, X] - candidate[:, X], reference[:, Y] - candidate[:, Y]
+        ),
+        "heading": np.abs((heading + np.pi) % (2 * np.pi) - np.pi),
+        "sensors": np.max(sensors, axis=1, initial=0.0),
+    }
+
+
+def compare(
+    track: str,
+    engine: str,
+    reference: EngineRun,
+    candidate: EngineRun,
+    tolerances: Optional[Tolerances] = None,
+) -> EngineParity:
+    """
+    Finds the first tick every car diverged at, if it did.
+
+    Tolerances default to `Tolerances()`.
+    """
+    if tolerances is None:
+        tolerances = Tolerances()
+    limits = {
+        "segment": 0.0,
+        "position": tolerances.position,
+        "heading": tolerances.heading,
+        "sensors": tolerances.sensor,
+    }
+    divergences = []
+    max_differences = dict.fromkeys(limits, 0.0)
+    for car, (expected, actual) in enumerate(
+        zip(reference.trajectories, candidate.trajectories)
+    ):
+        length, other_length = len(expected), len(actual)
+        common = min(length, other_length)
+        differences = _differences(expected.data[:common], actual.data[:common])
+        first: Optional[Divergence] = None
+        for quantity, values in differences.items():
+            if not len(values):
+                continue
+            max_differences[quantity] = max(max_differences[quantity], values.max())
+            exceeded = np.flatnonzero(values > limits[quantity])
+            if len(exceeded) and (first is None or exceeded[0] < first.tick):
+                tick = int(exceeded[0])
+                first = Divergence(car, tick, quantity, float(values[tick]))
+        if first is None and length != other_length:
+            first = Divergence(car, common, "length", float(other_length - length))
+        if first is not None:
+            divergences.append(first)
+    adaptation_difference = float(
+        np.max(np.abs(reference.adaptations - candidate.adaptations), initial=0.0)
+    )
+    return EngineParity(
+        track,
+        engine,
+        len(reference.trajectories),
+        divergences,
+        {name: float(value) for name, value in max_differences.items()},
+        adaptation_difference,
+        adaptation_difference <= tolerances.adaptation,
+        reference.seconds,
+        candidate.seconds,
+    )
+
+
+def check_parity(
+    catalog: TrackCatalog,
+    layers_infos: List[LayerInfo],
+    compared: Optional[List[str]] = None,
+    individuals: int = 70,
+    evolve: int = 0,
+    tracks: Optional[List[str]] = None,
+    seed: Optional[int] = 0,
+    delta_time: float = FIXED_DELTA_TIME,
+    max_ticks: int = 2000,
+    repeats: int = 3,
+    tolerances: Optional[Tolerances] = None,
+) -> List[EngineParity]:
+    """
+    Runs the reference engine and the compared ones on the same networks
+    and tracks, and compares their trajectories tick by tick.
+
+    Args:
+        catalog (TrackCatalog): Tracks to use.
+        layers_infos (List[LayerInfo]): Layers of the simulated networks.
+        compared (List[str], optional): Names of the compared engines,
+            defaults to all registered ones except the reference.
+        individuals (int): Amount of simulated cars.
+        evolve (int): Amount of generations to evolve on every track before
+            comparing, random networks mostly crash right away.
+        tracks (List[str], optional): Names of the tracks, defaults to all of them.
+        seed (int, optional): Seed of the random networks.
+        max_ticks (int): Maximal amount of simulated (and recorded) ticks.
+        repeats (int): Amount of timed runs of every engine, the shortest one counts.
+        tolerances (Tolerances, optional): Allowed differences, `Tolerances()` by default.
+
+    Raises:
+        ValueError: If a compared engine isn't registered.
+    """
+    if compared is None:
+        compared = [name for name in engines if name != "reference"]
+    unknown = [name for name in compared if name not in engines]
+    if unknown:
+        raise ValueError(
+            f"Engine must be one of: {', '.join(engines)}, got {', '.join(unknown)}"
+        )
+    results = []
+    for name in tracks if tracks is not None else catalog.names():
+        if seed is not None:
+            np.random.seed(seed)
+        track = catalog.get(name)
+        networks = evolved_networks(
+            SilentEnvironment(track), layers_infos, individuals, evolve
+        )
+        reference = run_engine(
+            engines["reference"], track, networks, delta_time, max_ticks, repeats
+        )
+        for engine in compared:
+            candidate = run_engine(
+                engines[engine], track, networks, delta_time, max_ticks, repeats
+            )
+            results.append(compare(name, engine, reference, candidate, tolerances))
+    return results
+
+
+def report(results: List[EngineParity]) -> str:
+    """Formats results as a markdown table."""
+    lines = [
+        "| track | engine | equivalent | diverged cars | first divergence "
+        "| max position | max sensors | max adaptation | reference s | engine s "
+        "| speedup |",
+        "|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        first = r.first_divergence
+        divergence = (
+            "-"
+            if first is None
+            else f"car {first.car} tick {first.tick} {first.quantity} {first.difference:g}"
+        )
+        lines.append(
+            f"| {r.track} | {r.engine} | {'yes' if r.equivalent else 'NO'} "
+            f"| {len(r.divergences)}/{r.cars} | {divergence} "
+            f"| {r.max_differences['position']:g} | {r.max_differences['sensors']:g} "
+            f"| {r.adaptation_difference:g} | {r.reference_seconds:.3f} "
+            f"| {r.seconds:.3f} | x{r.speedup:.2f} |"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,141 @@
+import io
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from typing import List, Optional, Any
+
+import numpy as np
+
+from model.environment.environment import Environment
+from model.neural_network.neural_network import NeuralNetwork, LayerInfo
+from model.neuroevolution.config import NeuroevolutionConfig
+from model.neuroevolution.neuroevolution import Neuroevolution
+from model.track.catalog import TrackCatalog
+from view.silent_environment import SilentEnvironment
+
+
+def ranks(values: np.ndarray) -> np.ndarray:
+    """Ranks of values (0 for the lowest), tied values get the mean of their ranks."""
+    order = np.argsort(values, kind="stable")
+    ordinal = np.empty(len(values))
+    ordinal[order] = np.arange(len(values))
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ordinal)
+    return np.asarray(sums[inverse] / counts[inverse])
+
+
+@dataclass
+class TrackParity:
+    track: str
+    float64: np.ndarray
+    """
+    Adaptations of the individuals evaluated in float64.
+    """
+    float32: np.ndarray
+    """
+    Adaptations of the same individuals evaluated in float32.
+    """
+
+    @property
+    def same_ranking(self) -> bool:
+        return bool(np.array_equal(ranks(self.float64), ranks(self.float32)))
+
+    @property
+    def spearman(self) -> float:
+        """Rank correlation, 1.0 if the rankings are the same."""
+        if self.same_ranking:
+            return 1.0
+        return float(np.corrcoef(ranks(self.float64), ranks(self.float32))[0, 1])
+
+    @property
+    def changed(self) -> float:
+        """Fraction of individuals whose adaptation changed."""
+        return float(np.mean(self.float64 != self.float32))
+
+    @property
+    def max_difference(self) -> float:
+        return float(np.max(np.abs(self.float64 - self.float32)))
+
+    def top_overlap(self, k: int) -> float:
+        """Fraction of the best k individuals in float64 that are also the best k in float32."""
+        top64 = set(np.argsort(-self.float64, kind="stable")[:k])
+        top32 = set(np.argsort(-self.float32, kind="stable")[:k])
+        return len(top64 & top32) / k
+
+
+def _adaptations(
+    environment: Environment[None, Any], networks: List[NeuralNetwork]
+) -> np.ndarray:
+    adaptations = Environment.compute_adaptations(environment, {"children": networks})
+    return np.array(list(adaptations["children"]), dtype=float)
+
+
+def evolved_networks(
+    environment: Environment[None, Any],
+    layers_infos: List[LayerInfo],
+    individuals: int,
+    evolve: int,
+) -> List[NeuralNetwork]:
+    """Random networks evolved (quietly) for the given amount of generations."""
+    networks = [NeuralNetwork(layers_infos, 2) for _ in range(individuals)]
+    if evolve > 0:
+        neuroevolution = Neuroevolution(
+            networks, NeuroevolutionConfig(individuals=individuals)
+        )
+        with redirect_stdout(io.StringIO()):
+            for _ in range(evolve):
+                neuroevolution.evolve(environment, False)
+        networks = [i.neural_network for i in neuroevolution.individuals]
+    return networks
+
+
+def check_parity(
+    catalog: TrackCatalog,
+    layers_infos: List[LayerInfo],
+    individuals: int = 70,
+    evolve: int = 0,
+    tracks: Optional[List[str]] = None,
+    seed: Optional[int] = 0,
+) -> List[TrackParity]:
+    """
+    Evaluates the same individuals in float64 and float32 on the given tracks.
+
+    The float32 networks are copies of the float64 ones with rounded weights,
+    so any difference in rankings comes from the reduced precision only.
+
+    Args:
+        catalog (TrackCatalog): Tracks to use.
+        layers_infos (List[LayerInfo]): Layers of the compared networks.
+        individuals (int): Amount of compared networks.
+        evolve (int): Amount of generations to evolve (in float64) on every track
+            before comparing, random networks mostly crash right away and tie.
+        tracks (List[str], optional): Names of the tracks, defaults to all of them.
+        seed (int, optional): Seed of the random networks.
+    """
+    results = []
+    for name in tracks if tracks is not None else catalog.names():
+        if seed is not None:
+            np.random.seed(seed)
+        environment = SilentEnvironment(catalog.get(name))
+        networks = evolved_networks(environment, layers_infos, individuals, evolve)
+        results.append(
+            TrackParity(
+                name,
+                _adaptations(environment, networks),
+                _adaptations(environment, [n.astype(np.float32) for n in networks]),
+            )
+        )
+    return results
+
+
+def report(results: List[TrackParity], top_k: int = 10) -> str:
+    lines = [
+        f"| track | same ranking | spearman | top {top_k} overlap "
+        "| changed adaptations | max difference |",
+        "|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.track} | {'yes' if r.same_ranking else 'NO'} | {r.spearman:.4f} "
+            f"| {r.top_overlap(top_k):.2f} | {r.changed:.1%} | {r.max_difference:g} |"
+        )
+    return "\n".join(lines)
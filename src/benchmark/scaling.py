@@ -0,0 +1,285 @@
+import io
+import json
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import dataclass, asdict, field
+from multiprocessing import get_context
+from os.path import getsize
+from typing import List, Generator, Mapping, Iterable, Optional, Dict, Any, Tuple
+
+from model.car.directed_rect import SURROUNDING_RAYS_COUNT
+from model.car.sensing import SensingStats
+from model.neural_network.neural_network import NeuralNetwork, LayerInfo
+from model.neural_network.neural_network_store import NeuralNetworkStore
+from model.neuroevolution.asynchronous import AsyncEvaluator
+from model.neuroevolution.config import NeuroevolutionConfig
+from model.neuroevolution.neuroevolution import Neuroevolution
+from model.simulation import SimState, FIXED_DELTA_TIME
+from model.track.track import Track
+from view.silent_environment import SilentEnvironment
+
+TrackPoints = List[Tuple[Any, Any]]
+
+
+@dataclass
+class ScalingCase:
+    population: int
+    hidden_layers: List[LayerInfo]
+    """
+    Layers after the input one, which is always made to match the car's sensors.
+    """
+    track_length: Optional[int] = None
+    """
+    Amount of track points to use, None for the whole track.
+    """
+    delta_time: float = FIXED_DELTA_TIME
+    incremental_sensing: bool = False
+    steady_state: bool = False
+    """
+    Evolves with `Neuroevolution.evolve_steady_state` on an `AsyncEvaluator`
+    (with the default simulation settings), a generation is then worth
+    population evaluations. Workers don't report car ticks nor evaluation time
+    (so breeding time includes it), compare gen/min.
+    """
+
+    @property
+    def layers(self) -> List[LayerInfo]:
+        return [LayerInfo(SURROUNDING_RAYS_COUNT + 1, "tanh"), *self.hidden_layers]
+
+    @property
+    def key(self) -> str:
+        layers = "-".join(str(layer.neurons_count) for layer in self.hidden_layers)
+        key = f"{self.population}/{layers}/{self.track_length}"
+        if self.delta_time != FIXED_DELTA_TIME:
+            key += f"/{self.delta_time}"
+        if self.incremental_sensing:
+            key += "/incremental"
+        if self.steady_state:
+            key += "/steady"
+        return key
+
+
+@dataclass
+class ScalingResult:
+    case: ScalingCase
+    segments: int
+    generations: int
+    car_ticks: int = 0
+    evaluation_time: float = 0.0
+    evolution_time: float = 0.0
+    population_bytes: int = 0
+    """
+    Memory allocated by a freshly created population.
+    """
+    store_time: float = 0.0
+    load_time: float = 0.0
+    store_bytes: int = 0
+    tracemalloc_peak: int = 0
+    """
+    Peak of memory allocated while evolving a generation and storing the population.
+    """
+    peak_rss: int = 0
+    extra: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def car_ticks_per_second(self) -> float:
+        return self.car_ticks / self.evaluation_time if self.evaluation_time else 0.0
+
+    @property
+    def generations_per_minute(self) -> float:
+        if not self.evolution_time:
+            return 0.0
+        return 60 * self.generations / self.evolution_time
+
+    @property
+    def breeding_time(self) -> float:
+        """Time per generation spent outside of the evaluation (selection, reproduction...)."""
+        return (self.evolution_time - self.evaluation_time) / max(self.generations, 1)
+
+    @property
+    def bytes_per_individual(self) -> float:
+        return self.population_bytes / self.case.population
+
+
+class _MeasuredEnvironment(SilentEnvironment):
+    """Silent environment counting simulated car ticks and time spent simulating."""
+
+    def __init__(self, track: Track):
+        super().__init__(track)
+        self.car_ticks = 0
+        self.evaluation_time = 0.0
+        self.sensing = SensingStats()
+
+    def generate_adaptations(
+        self, networks_groups: Mapping[str, List[NeuralNetwork]]
+    ) -> Generator[None, None, Mapping[str, Iterable[float]]]:
+        start = time.perf_counter()
+        adaptations = yield from super().generate_adaptations(networks_groups)
+        self.evaluation_time += time.perf_counter() - start
+        if self.sensing_stats is not None:
+            self.sensing += self.sensing_stats
+        return adaptations
+
+    def _finalize(self, cars: SimState) -> Mapping[str, Iterable[float]]:
+        self.car_ticks += sum(s.active_ticks for group in cars.values() for s in group)
+        return super()._finalize(cars)
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in kilobytes on Linux, but in bytes on macOS
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def run_case(
+    case: ScalingCase, track_points: TrackPoints, generations: int
+) -> ScalingResult:
+    """Measures a single case in the current process."""
+    track = Track.from_points(track_points[: case.track_length])
+    result = ScalingResult(case, len(track.segments), generations)
+
+    tracemalloc.start()
+    neuroevolution = Neuroevolution.init_with_neural_network_info(
+        case.layers, 2, NeuroevolutionConfig(individuals=case.population)
+    )
+    result.population_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # timing is done without tracing, which slows allocations down a lot
+    environment = _MeasuredEnvironment(track)
+    environment.delta_time = case.delta_time
+    environment.incremental_sensing = case.incremental_sensing
+    evaluator = None
+    if case.steady_state:
+        evaluator = AsyncEvaluator(track_points[: case.track_length])
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(generations):
+            if evaluator is not None:
+                neuroevolution.evolve_steady_state(evaluator)
+            else:
+                neuroevolution.evolve(environment, False)
+    result.evolution_time = time.perf_counter() - start
+    result.evaluation_time = environment.evaluation_time
+    result.car_ticks = environment.car_ticks
+    if case.incremental_sensing:
+        result.extra["sensing hit rate"] = environment.sensing.hit_rate
+
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        if evaluator is not None:
+            neuroevolution.evolve_steady_state(evaluator)
+            evaluator.close()
+        else:
+            neuroevolution.evolve(environment, False)
+    networks = [individual.neural_network for individual in neuroevolution.individuals]
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        NeuralNetworkStore.store(networks, "scaling", directory)
+        result.store_time = time.perf_counter() - start
+        result.store_bytes = getsize(f"{directory}/scaling.nn")
+        start = time.perf_counter()
+        NeuralNetworkStore.load("scaling", directory)
+        result.load_time = time.perf_counter() - start
+    result.tracemalloc_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result.peak_rss = _peak_rss()
+    return result
+
+
+def _run_case_star(args: Tuple[ScalingCase, TrackPoints, int]) -> ScalingResult:
+    return run_case(*args)
+
+
+def run_scaling(
+    cases: List[ScalingCase],
+    track_points: TrackPoints,
+    generations: int = 3,
+    isolate: bool = True,
+) -> List[ScalingResult]:
+    """
+    Measures all cases one after another.
+
+    Args:
+        cases (List[ScalingCase]): Cases to measure.
+        track_points (List): Points of the track, as in resources/tracks.json.
+        generations (int): Amount of generations evolved in every case.
+        isolate (bool): Whether to run every case in a fresh process,
+            otherwise peak RSS is shared by all the cases. Steady state cases
+            always run in this process, the isolating pool's processes can't
+            start workers of their own.
+    """
+    results = []
+    for case in cases:
+        print(f"Measuring {case.key} ...", file=sys.stderr)
+        if isolate and not case.steady_state:
+            with get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+                arguments = [(case, track_points, generations)]
+                result = pool.map(_run_case_star, arguments)[0]
+        else:
+            result = run_case(case, track_points, generations)
+        results.append(result)
+    return results
+
+
+def _result_row(result: ScalingResult) -> Dict[str, float]:
+    return {
+        "car-ticks/s": result.car_ticks_per_second,
+        "gen/min": result.generations_per_minute,
+        "breeding ms/gen": 1000 * result.breeding_time,
+        "KiB/individual": result.bytes_per_individual / 1024,
+        "store MiB": result.store_bytes / 2 ** 20,
+        "store+load s": result.store_time + result.load_time,
+        "tracemalloc peak MiB": result.tracemalloc_peak / 2 ** 20,
+        "peak RSS MiB": result.peak_rss / 2 ** 20,
+        **result.extra,
+    }
+
+
+def report(
+    results: List[ScalingResult], baseline: Optional[Dict[str, Dict[str, float]]] = None
+) -> str:
+    """
+    Formats results as a markdown table.
+
+    If a baseline (as saved by `save_results`) is given, every value
+    measured for a case found in the baseline is followed by its ratio to the baseline.
+    """
+    rows = [(r.case.key, r.segments, _result_row(r)) for r in results]
+    columns = list(rows[0][2]) if rows else []
+    header = ["population/hidden layers/track points", "segments", *columns]
+    lines = ["| " + " | ".join(header) + " |", "|---" * len(header) + "|"]
+    for key, segments, values in rows:
+        base = (baseline or {}).get(key, {})
+        cells = []
+        for column in columns:
+            cell = f"{values[column]:.4g}"
+            if base.get(column):
+                cell += f" ({values[column] / base[column]:.2f}x)"
+            cells.append(cell)
+        lines.append(f"| {key} | {segments} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def save_results(results: List[ScalingResult], file: str) -> None:
+    with open(file, "w") as output:
+        json.dump(
+            {r.case.key: {**_result_row(r), "raw": asdict(r)} for r in results},
+            output,
+            indent=2,
+        )
+
+
+def load_baseline(file: str) -> Dict[str, Dict[str, float]]:
+    with open(file) as baseline:
+        data: Dict[str, Dict[str, Any]] = json.load(baseline)
+    return {
+        key: {k: v for k, v in values.items() if k != "raw"}
+        for key, values in data.items()
+    }
@@ -0,0 +1,141 @@
+import sys
+import time
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+import numpy as np
+from planar.transform import Affine
+
+from model.car.directed_rect import DirectedRectangle
+from model.car.sensor import Sensor
+from model.simulation import CAR_SIZE
+from model.track.generator import DEFAULT_SHAPE, TrackShape, generate_points
+from model.track.track import Track
+from model.track.validation import validate_points
+
+
+@dataclass
+class TrackSizeResult:
+    segments: int
+    generation_time: float = 0.0
+    validation_time: float = 0.0
+    construction_time: float = 0.0
+    """
+    Time to create the track and compute all of its geometry.
+    """
+    sense_time: float = 0.0
+    """
+    Mean time of a single `Track.sense_closest` call.
+    """
+    intersects_time: float = 0.0
+    """
+    Mean time of a single `Track.intersects` call.
+    """
+    render_time: Optional[float] = None
+
+
+def _probes(
+    track: Track, samples: int, rng: np.random.Generator
+) -> List[Tuple[int, DirectedRectangle, List[Sensor]]]:
+    """Cars' rectangles and sensors placed in the middles of random segments."""
+    probes = []
+    for segment_id in rng.integers(len(track.segments), size=samples):
+        rect = DirectedRectangle.new_origin_x(*CAR_SIZE)
+        sensors = [Sensor(ray) for ray in rect.surrounding_rays()]
+        translation = Affine.translation(track.segments[segment_id].region.centroid)
+        rect.transform(translation)
+        for sensor in sensors:
+            sensor.transform(translation)
+        probes.append((int(segment_id), rect, sensors))
+    return probes
+
+
+def _render_time(track: Track, scale: float) -> float:
+    # imported here, so that the rest can be measured without pygame
+    from view.board import render_board
+
+    start = time.perf_counter()
+    render_board(track, scale)
+    return time.perf_counter() - start
+
+
+def run_case(
+    shape: TrackShape,
+    samples: int = 200,
+    seed: int = 0,
+    render_scale: Optional[float] = None,
+) -> TrackSizeResult:
+    """
+    Measures a generated track.
+
+    Args:
+        shape (TrackShape): Shape of the track.
+        samples (int): Amount of positions queries are measured at.
+        seed (int): Seed of the track and of the positions.
+        render_scale (float, optional): Scale of the board rendered
+            with `render_board`, rendering isn't measured without it.
+    """
+    result = TrackSizeResult(shape.segments)
+    start = time.perf_counter()
+    points = generate_points(shape, seed)
+    result.generation_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validation = validate_points(points)
+    result.validation_time = time.perf_counter() - start
+    if not validation.valid:
+        raise ValueError(validation.summary())
+
+    start = time.perf_counter()
+    track = Track.from_points(points.tolist())
+    track.precompute_geometry()
+    result.construction_time = time.perf_counter() - start
+
+    probes = _probes(track, samples, np.random.default_rng(seed))
+    start = time.perf_counter()
+    for segment_id, _, sensors in probes:
+        track.sense_closest(sensors, segment_id)
+    result.sense_time = (time.perf_counter() - start) / samples
+    start = time.perf_counter()
+    for _, rect, _ in probes:
+        track.intersects(rect.shape)
+    result.intersects_time = (time.perf_counter() - start) / samples
+
+    if render_scale is not None:
+        result.render_time = _render_time(track, render_scale)
+    return result
+
+
+def run_track_sizes(
+    segments: List[int],
+    shape: TrackShape = DEFAULT_SHAPE,
+    samples: int = 200,
+    seed: int = 0,
+    render_scale: Optional[float] = None,
+) -> List[TrackSizeResult]:
+    """Measures generated tracks of the given shape with different amounts of segments."""
+    results = []
+    for count in segments:
+        print(f"Measuring {count} segments ...", file=sys.stderr)
+        case_shape = replace(shape, segments=count)
+        results.append(run_case(case_shape, samples, seed, render_scale))
+    return results
+
+
+def report(results: List[TrackSizeResult]) -> str:
+    """Formats results as a markdown table."""
+    lines = [
+        "| segments | generate ms | validate ms | construct ms"
+        " | sense µs | intersects µs | render ms |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        render = "-" if r.render_time is None else f"{1000 * r.render_time:.4g}"
+        lines.append(
+            f"| {r.segments} | {1000 * r.generation_time:.4g}"
+            f" | {1000 * r.validation_time:.4g}"
+            f" | {1000 * r.construction_time:.4g}"
+            f" | {1e6 * r.sense_time:.4g} | {1e6 * r.intersects_time:.4g}"
+            f" | {render} |"
+        )
+    return "\n".join(lines)
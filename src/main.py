@@ -1,6 +1,6 @@
-import json
+import argparse
+from functools import partial
 
-import pygame
 from planar import Point
 from planar.line import Ray
 
@@ -8,9 +8,14 @@ from model.car.car import Car
 from model.car.sensor import Sensor
 from model.neural_network.neural_network import NeuralNetwork, LayerInfo
 from model.neural_network.neural_network_store import NeuralNetworkStore
+from model.track.catalog import TrackCatalog
 from model.track.track import Track
+from model.trajectory import load_trajectories
 from view.action import Action, ActionType
+from view.assets import assets
 from view.menu import Menu
+from view.replay_view import ReplayView
+from view.scheduler import FrameScheduler
 from view.track_view import TrackView
 from view.window import Window
 
@@ -58,30 +63,57 @@ def main_no_ui() -> None:
         car.tick(track, sleep_time)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=WINDOW_NAME)
+    # trajectories recorded by main_cli can be replayed by passing their file
+    parser.add_argument(
+        "replay", nargs="?", default="", help="trajectories to replay, see main_cli"
+    )
+    parser.add_argument(
+        "--release-inactive-views",
+        action="store_true",
+        help="free populations of views which are left, evolution then starts over",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
+    catalog = TrackCatalog(cache=True, validate=True)
     try:
-        with open("resources/tracks.json") as file:
-            tracks = json.load(file)["tracks"]
-    except (IOError, IndexError):
+        catalog.names()
+    except (IOError, KeyError):
         raise IOError("Unable to load tracks from file")
 
-    window = Window(WINDOW_NAME, WINDOW_SIZE, resizable=True, min_size=WINDOW_MIN_SIZE)
+    scheduler = FrameScheduler()
+    window = Window(
+        WINDOW_NAME,
+        WINDOW_SIZE,
+        resizable=True,
+        min_size=WINDOW_MIN_SIZE,
+        release_inactive_views=args.release_inactive_views,
+        scheduler=scheduler,
+    )
 
     menu_options = {
         "Track": Action(ActionType.CHANGE_VIEW, 1),
         "Testing segment": Action(ActionType.CHANGE_VIEW, 2),
-        "Exit": Action(ActionType.SYS_EXIT),
     }
+    replay_file = args.replay
+    if replay_file:
+        menu_options["Replay"] = Action(ActionType.CHANGE_VIEW, 3)
+    menu_options["Exit"] = Action(ActionType.SYS_EXIT)
     menu = Menu(menu_options)
-    menu.background_image = pygame.image.load("resources/graphics/menu-background.png")
-    menu.logo_image = pygame.image.load("resources/graphics/logo.png")
-
-    tv1 = TrackView(Track.from_points(tracks[6]["points"]))
-    tv2 = TrackView(Track.from_points(tracks[3]["points"]))
+    menu.background_image = assets.load("resources/graphics/menu-background.png")
+    menu.logo_image = assets.load("resources/graphics/logo.png", alpha=True)
 
     window.add_view(menu, 0, True)
-    window.add_view(tv1, 1)
-    window.add_view(tv2, 2)
+    # views are created when opened for the first time, tracks and populations
+    # are prepared in the background while the loading screen is shown
+    window.add_view_factory(lambda: TrackView(partial(catalog.get, 6), scheduler), 1)
+    window.add_view_factory(lambda: TrackView(partial(catalog.get, 3), scheduler), 2)
+    if replay_file:
+        window.add_view_factory(lambda: ReplayView(load_trajectories(replay_file)), 3)
 
     window.run()
 
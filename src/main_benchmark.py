@@ -0,0 +1,264 @@
+import argparse
+from typing import List
+
+from benchmark import memory, parity, precision, tracks
+from benchmark.scaling import (
+    ScalingCase,
+    run_scaling,
+    report,
+    save_results,
+    load_baseline,
+)
+from model.car.directed_rect import SURROUNDING_RAYS_COUNT
+from model.neural_network.neural_network import LayerInfo
+from model.simulation import FIXED_DELTA_TIME
+from model.track.catalog import TrackCatalog, track_key
+from model.track.generator import TrackShape, generate_points
+
+DEFAULT_LAYERS = ["4", "8,12,18,9"]
+
+
+def parse_layers(spec: str) -> List[LayerInfo]:
+    """'8,12:sigmoid' -> [LayerInfo(8, 'tanh'), LayerInfo(12, 'sigmoid')]"""
+    layers = []
+    for layer in spec.split(","):
+        neurons, _, activation = layer.partition(":")
+        layers.append(LayerInfo(int(neurons), activation or "tanh"))
+    return layers
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CarsML benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    scaling = subparsers.add_parser(
+        "scaling", help="population, network and track size scaling"
+    )
+    scaling.add_argument(
+        "--population",
+        type=int,
+        nargs="+",
+        default=[70, 250, 1000],
+    )
+    scaling.add_argument(
+        "--layers",
+        nargs="+",
+        default=DEFAULT_LAYERS,
+        help="hidden layers after the input one, e.g. '8,12:sigmoid'",
+    )
+    scaling.add_argument(
+        "--track-length",
+        type=int,
+        nargs="+",
+        default=[0],
+        help="amount of track points to use, 0 for the whole track",
+    )
+    scaling.add_argument(
+        "--delta-time",
+        type=float,
+        nargs="+",
+        default=[FIXED_DELTA_TIME],
+        help="simulation steps, longer than the default ones check swept collisions",
+    )
+    scaling.add_argument(
+        "--incremental-sensing",
+        action="store_true",
+        help="sense walls incrementally, reports the hit rate of reused walls",
+    )
+    scaling.add_argument(
+        "--steady-state",
+        action="store_true",
+        help="evolve asynchronously on a pool of worker processes, compare gen/min",
+    )
+    scaling.add_argument(
+        "--track",
+        type=track_key,
+        default=TrackCatalog.DEFAULT_TRACK,
+        help="name or index of the track, it must be valid",
+    )
+    scaling.add_argument(
+        "--generated",
+        type=int,
+        metavar="SEGMENTS",
+        help="use a generated track with this many segments instead",
+    )
+    scaling.add_argument("--generations", type=int, default=3)
+    scaling.add_argument(
+        "--no-isolation",
+        action="store_true",
+        help="run all cases in this process (peak RSS isn't measured per case)",
+    )
+    scaling.add_argument("--output", help="save results to a JSON file")
+    scaling.add_argument("--baseline", help="compare with results saved earlier")
+
+    rankings = subparsers.add_parser(
+        "precision", help="rankings of float32 and float64 populations"
+    )
+    rankings.add_argument("--population", type=int, default=70)
+    rankings.add_argument("--layers", default=DEFAULT_LAYERS[1])
+    rankings.add_argument(
+        "--evolve",
+        type=int,
+        default=10,
+        help="generations evolved on every track before comparing",
+    )
+    rankings.add_argument(
+        "--track", nargs="+", help="names of the tracks, all of them by default"
+    )
+    rankings.add_argument("--top", type=int, default=10)
+    rankings.add_argument("--seed", type=int, default=0)
+
+    sizes = subparsers.add_parser(
+        "tracks", help="track queries and rendering on large generated tracks"
+    )
+    sizes.add_argument(
+        "--segments", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    sizes.add_argument("--samples", type=int, default=200)
+    sizes.add_argument("--width-variation", type=float, default=0.2)
+    sizes.add_argument("--curvature", type=float, default=0.005)
+    sizes.add_argument(
+        "--gap", type=float, default=20.0, help="distance between neighbouring lanes"
+    )
+    sizes.add_argument("--seed", type=int, default=0)
+    sizes.add_argument(
+        "--render-scale", type=float, help="measure rendering the board at this scale"
+    )
+
+    footprint = subparsers.add_parser(
+        "memory", help="memory of individuals, their copies and compact populations"
+    )
+    footprint.add_argument("--population", type=int, nargs="+", default=[1_000, 10_000])
+    footprint.add_argument(
+        "--layers",
+        nargs="+",
+        default=DEFAULT_LAYERS,
+        help="hidden layers after the input one, e.g. '8,12:sigmoid'",
+    )
+
+    differential = subparsers.add_parser(
+        "parity", help="trajectories and speed of simulation engines and the reference"
+    )
+    differential.add_argument(
+        "--engine",
+        nargs="+",
+        choices=[name for name in parity.engines if name != "reference"],
+        help="compared engines, all of them by default",
+    )
+    differential.add_argument("--population", type=int, default=70)
+    differential.add_argument("--layers", default=DEFAULT_LAYERS[1])
+    differential.add_argument(
+        "--evolve",
+        type=int,
+        default=10,
+        help="generations evolved on every track before comparing",
+    )
+    differential.add_argument(
+        "--track", nargs="+", help="names of the tracks, all of them by default"
+    )
+    differential.add_argument("--seed", type=int, default=0)
+    differential.add_argument("--delta-time", type=float, default=FIXED_DELTA_TIME)
+    differential.add_argument("--max-ticks", type=int, default=2000)
+    differential.add_argument("--repeats", type=int, default=3)
+    differential.add_argument(
+        "--tolerance",
+        type=float,
+        default=1e-6,
+        help="of positions, headings (radians) and sensor distances",
+    )
+    return parser.parse_args()
+
+
+def main_scaling(args: argparse.Namespace) -> None:
+    if args.generated:
+        points = generate_points(TrackShape(segments=args.generated), seed=0)
+    else:
+        catalog = TrackCatalog()
+        points = catalog.points(catalog.check(args.track))
+    track_points = points.tolist()
+
+    cases = [
+        ScalingCase(
+            population,
+            parse_layers(layers),
+            track_length or None,
+            delta_time,
+            args.incremental_sensing,
+            args.steady_state,
+        )
+        for population in args.population
+        for layers in args.layers
+        for track_length in args.track_length
+        for delta_time in args.delta_time
+    ]
+    results = run_scaling(cases, track_points, args.generations, not args.no_isolation)
+    if args.output:
+        save_results(results, args.output)
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    print(report(results, baseline))
+
+
+def main_precision(args: argparse.Namespace) -> None:
+    input_layer = LayerInfo(SURROUNDING_RAYS_COUNT + 1, "tanh")
+    results = precision.check_parity(
+        TrackCatalog(cache=True),
+        [input_layer, *parse_layers(args.layers)],
+        args.population,
+        args.evolve,
+        args.track,
+        args.seed,
+    )
+    print(precision.report(results, args.top))
+
+
+def main_tracks(args: argparse.Namespace) -> None:
+    shape = TrackShape(
+        width_variation=args.width_variation, curvature=args.curvature, gap=args.gap
+    )
+    results = tracks.run_track_sizes(
+        args.segments, shape, args.samples, args.seed, args.render_scale
+    )
+    print(tracks.report(results))
+
+
+def main_memory(args: argparse.Namespace) -> None:
+    input_layer = LayerInfo(SURROUNDING_RAYS_COUNT + 1, "tanh")
+    layers = [[input_layer, *parse_layers(spec)] for spec in args.layers]
+    print(memory.report(memory.run_memory(layers, args.population)))
+
+
+def main_parity(args: argparse.Namespace) -> None:
+    input_layer = LayerInfo(SURROUNDING_RAYS_COUNT + 1, "tanh")
+    tolerances = parity.Tolerances(args.tolerance, args.tolerance, args.tolerance)
+    results = parity.check_parity(
+        TrackCatalog(cache=True),
+        [input_layer, *parse_layers(args.layers)],
+        args.engine,
+        args.population,
+        args.evolve,
+        args.track,
+        args.seed,
+        args.delta_time,
+        args.max_ticks,
+        args.repeats,
+        tolerances,
+    )
+    print(parity.report(results))
+
+
+def main() -> None:
+    args = parse_args()
+    if args.benchmark == "scaling":
+        main_scaling(args)
+    elif args.benchmark == "precision":
+        main_precision(args)
+    elif args.benchmark == "tracks":
+        main_tracks(args)
+    elif args.benchmark == "memory":
+        main_memory(args)
+    elif args.benchmark == "parity":
+        main_parity(args)
+
+
+if __name__ == "__main__":
+    main()
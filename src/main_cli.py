@@ -1,13 +1,16 @@
-import json
 import time
 from itertools import count
-from typing import List
+from typing import Dict, List
 
 from model.car.directed_rect import SURROUNDING_RAYS_COUNT
-from model.track.track import Track
-from model.neural_network.neural_network import LayerInfo
+from model.track.catalog import TrackCatalog
+from model.neural_network.neural_network import LayerInfo, Topology
 from model.neural_network.neural_network_store import NeuralNetworkStore
+from model.neuroevolution.individual import AdultIndividual
 from model.neuroevolution.neuroevolution import Neuroevolution
+from model.run_history import RunHistory
+from model.trajectory import TrajectoryRecorder
+from view.export import EpisodeExporter
 from view.silent_environment import SilentEnvironment
 
 input_neurons = SURROUNDING_RAYS_COUNT + 1
@@ -20,31 +23,56 @@ layers_infos: List[LayerInfo] = [
     LayerInfo(9, "tanh"),
 ]
 
+TRACK = "First"
+"""
+Track the cars learn on, it must be valid ("Second" has crossing cross-sections).
+"""
+
 
 def main() -> None:
+    catalog = TrackCatalog(cache=True, validate=True)
     try:
-        with open("resources/tracks.json") as file:
-            tracks = json.load(file)["tracks"]
-    except (IOError, IndexError):
+        track = catalog.get(TRACK)
+    except (IOError, KeyError):
         raise IOError("Unable to load tracks from file")
 
     print("Initialization ...")
-    track = Track.from_points(tracks[1]["points"])
     env = SilentEnvironment(track)
     neuroevolution = Neuroevolution.init_with_neural_network_info(layers_infos, 2)
     print(
         f"Initialization finished. Running evolution, individuals count: {len(neuroevolution.individuals)}"
     )
     step = 100
+    recorder = TrajectoryRecorder(groups=["children"])
+    history = RunHistory()
+    run = history.start_run("cli", TRACK, Topology.shared(tuple(layers_infos), 2))
+    # individuals stored in the previous generation by their ids,
+    # referenced so that the ids aren't reused by new individuals
+    stored: Dict[int, AdultIndividual] = {}
+    # rendered in the background, episodes are skipped rather than slowing evolution
+    exporter = EpisodeExporter("store/videos")
     time_start = time.time()
     for i in count(0):
+        # record only the generations whose best car is going to be saved
+        env.recorder = recorder if i % step == 0 else None
         neuroevolution.evolve(env, False)
+        # individuals are sorted, only the best ones of every generation are kept,
+        # elites carried over from the previous generation are stored already
+        top = neuroevolution.individuals[:10]
+        new = [b for b in top if id(b) not in stored]
+        history.add_generation(
+            run, i, [b.neural_network for b in new], [b.adaptation for b in new]
+        )
+        stored = {id(b): b for b in top}
         if i % step == 0:
             time_for_step_iterations = time.time() - time_start
             print("Saving networks to file...")
             NeuralNetworkStore.store(
                 [i.neural_network for i in neuroevolution.individuals], f"data{i}"
             )
+            recorder.save(f"store/trajectory{i}.npz", "children")
+            best_trajectory = recorder.trajectory("children", recorder.best("children"))
+            exporter.export([best_trajectory], f"generation{i}")
             print(
                 f"Time for {max(0, i-step)} to {i} iterations: {time_for_step_iterations}."
             )
@@ -0,0 +1,61 @@
+import argparse
+
+from main_cli import layers_infos
+from model.track.catalog import TrackCatalog, track_key
+from model.neuroevolution.islands import IslandDriver, IslandModelSettings, IslandStats
+
+
+def print_stats(stats: IslandStats) -> None:
+    print(
+        f"Island {stats.island}, epoch {stats.epoch} (generation {stats.generation}): "
+        f"best {stats.best_adaptation}, mean {stats.mean_adaptation:.2f}, "
+        f"immigrants {stats.immigrants}, {stats.time:.1f} s"
+    )
+
+
+def main() -> None:
+    defaults = IslandModelSettings()
+    parser = argparse.ArgumentParser(description="Island model evolution")
+    parser.add_argument(
+        "--track",
+        type=track_key,
+        default=TrackCatalog.DEFAULT_TRACK,
+        help="name or index of the track, it must be valid",
+    )
+    parser.add_argument("--islands", type=int, default=defaults.islands)
+    parser.add_argument("--epochs", type=int, default=defaults.epochs)
+    parser.add_argument(
+        "--generations", type=int, default=defaults.generations_per_epoch
+    )
+    parser.add_argument("--migrants", type=int, default=defaults.migrants)
+    parser.add_argument("--checkpoint-every", type=int, default=0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="run all islands in this process instead of one process per island",
+    )
+    args = parser.parse_args()
+
+    # workers map walls of the compiled track and their grid,
+    # only planar geometry of the track is made in every worker
+    catalog = TrackCatalog(cache=True)
+    track = catalog.compiled(catalog.check(args.track)).directory
+
+    settings = IslandModelSettings(
+        islands=args.islands,
+        epochs=args.epochs,
+        generations_per_epoch=args.generations,
+        migrants=args.migrants,
+        checkpoint_every=args.checkpoint_every,
+        seed=args.seed,
+    )
+    driver = IslandDriver(track, layers_infos, settings=settings, on_stats=print_stats)
+    best = driver.run_locally() if args.local else driver.run()
+    for epoch in range(1, settings.epochs + 1):
+        print(f"Epoch {epoch}: best, mean adaptation: {driver.epoch_summary(epoch)}")
+    print(f"Best adaptation: {best[0].adaptation}")
+
+
+if __name__ == "__main__":
+    main()
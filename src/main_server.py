@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+
+from model.environment.server import Address, EvaluationServer
+from model.track.catalog import TrackCatalog
+
+
+async def serve(server: EvaluationServer, address: Address) -> None:
+    address = await server.start(address)
+    print(f"Evaluating tracks {', '.join(server.tracks)} at {address}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local evaluation server")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--unix", help="path of the Unix socket to listen on")
+    group.add_argument("--port", type=int, help="TCP port to listen on at localhost")
+    parser.add_argument("--processes", type=int, help="amount of worker processes")
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-delay", type=float, default=0.005, help="seconds")
+    args = parser.parse_args()
+
+    # workers map walls of the compiled tracks and their grids,
+    # only planar geometry of the tracks is made in every worker
+    catalog = TrackCatalog(cache=True)
+    tracks = {name: catalog.compiled(name).directory for name in catalog.names()}
+    server = EvaluationServer(tracks, args.processes, args.max_batch, args.max_delay)
+    address: Address = args.unix or ("127.0.0.1", args.port)
+    try:
+        asyncio.run(serve(server, address))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import json
+
+from main_cli import layers_infos
+from model.track.catalog import TrackCatalog, track_key
+from model.neuroevolution.sweep import grid, run_sweep, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Evolves populations with many hyperparameter configs at once"
+    )
+    parser.add_argument(
+        "grid",
+        help="JSON file mapping NeuroevolutionConfig fields to lists of values, "
+        'e.g. {"individuals": [70, 140], "max_parents": [1, 2, 4]}',
+    )
+    parser.add_argument(
+        "--track",
+        type=track_key,
+        default=TrackCatalog.DEFAULT_TRACK,
+        help="name or index of the track, it must be valid",
+    )
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    with open(args.grid) as file:
+        configs = grid(**json.load(file))
+    # workers map walls of the compiled track and their grid,
+    # only planar geometry of the track is made in every worker
+    catalog = TrackCatalog(cache=True)
+    track = catalog.compiled(catalog.check(args.track)).directory
+
+    print(f"Evaluating {len(configs)} configs ...")
+    results = run_sweep(
+        configs, track, layers_infos, args.generations, args.processes, args.seed
+    )
+    print(report(results))
+
+
+if __name__ == "__main__":
+    main()
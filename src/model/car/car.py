@@ -1,6 +1,7 @@
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 import numpy as np
+from planar.polygon import Polygon
 from planar.transform import Affine
 
 
@@ -24,6 +25,7 @@ class Car:
     _MAX_BACKWARD_SPEED: float = 50.0
     _MIN_BACKWARD_SPEED: float = 10.0
     _FIRE_WALL_SPEED: float = 1 / 25  # needs 25 ticks per segment
+    _FIRE_WALL_TICK: float = 1 / 10  # fire wall speed is given for ticks that long
 
     __slots__ = (
         "rect",
@@ -33,6 +35,7 @@ class Car:
         "active_segment",
         "ticks",
         "fire_wall",
+        "distances",
     )
 
     def __init__(
@@ -48,6 +51,7 @@ class Car:
         self.speed = 0.0
         self.active_segment: SegmentId = 0
         self.fire_wall = -5.0  # wire wall is set 5 segments before start
+        self.distances: List[float] = []
 
     @classmethod
     def with_standard_sensors(
@@ -63,17 +67,32 @@ class Car:
     def _sense_surroundings(self, track: Track) -> List[float]:
         return track.sense_closest(self.sensors, self.active_segment)
 
-    def _check_collision(self, track: Track) -> bool:
+    def _check_collision(
+        self, track: Track, swept_shapes: Optional[List[Polygon]] = None
+    ) -> bool:
         if self.fire_wall >= self.active_segment:
             return True
-        return track.intersects(self.rect.shape, self.active_segment)
+        if swept_shapes is None:
+            return track.intersects(self.rect.shape)
+        return any(track.intersects(shape, enclosed=True) for shape in swept_shapes)
 
     def transform(self, trans: Affine) -> None:
         for sensor in self.sensors:
             sensor.transform(trans)
         self.rect.transform(trans)
 
-    def _move(self, turning_rate: float, delta_time: float, track: Track) -> None:
+    def _move(
+        self, turning_rate: float, delta_time: float, track: Track, swept: bool = False
+    ) -> Optional[List[Polygon]]:
+        """
+        Returns:
+            Polygons covering the whole motion if `swept`, otherwise None.
+        """
+        swept_shapes = None
+        if swept:
+            swept_shapes = self.rect.swept_shapes(
+                self.speed, Car._TRACTION, turning_rate, delta_time
+            )
         transform = self.rect.turn_curve_transform(
             self.speed, Car._TRACTION, turning_rate, delta_time
         )
@@ -81,6 +100,7 @@ class Car:
         self.transform(transform)
 
         self.active_segment = track.update_active(self.active_segment, self.rect.center)
+        return swept_shapes
 
     def _update_speed(self, acceleration: float, delta_time: float) -> None:
         speed_dir: float = np.sign(self.speed)
@@ -109,13 +129,29 @@ class Car:
             remaining_time = remaining_speed / scaled_acceleration
             self._update_speed(acceleration, remaining_time)
 
-    def tick(self, track: Track, delta_time: float) -> None:
-        self.fire_wall += Car._FIRE_WALL_SPEED
-        distances = self._sense_surroundings(track)
+    def tick(
+        self,
+        track: Track,
+        delta_time: float,
+        swept: bool = False,
+        distances: Optional[List[float]] = None,
+    ) -> None:
+        """
+        Args:
+            swept (bool): Whether to check collisions along the whole motion
+                instead of at its end only, so that walls can't be skipped
+                over with long time steps.
+            distances (List[float], optional): Distances already sensed
+                with this car's sensors in its current position.
+        """
+        self.fire_wall += Car._FIRE_WALL_SPEED * (delta_time / Car._FIRE_WALL_TICK)
+        if distances is None:
+            distances = self._sense_surroundings(track)
+        self.distances = distances
         instructions = self.neural_network_adapter.get_instructions(
-            distances, self.speed
+            self.distances, self.speed
         )
-        self._move(instructions.turning_rate, delta_time, track)
-        if self._check_collision(track):
+        swept_shapes = self._move(instructions.turning_rate, delta_time, track, swept)
+        if self._check_collision(track, swept_shapes):
             raise Collision
         self._update_speed(instructions.acceleration, delta_time)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 from planar import Vec2, Point, EPSILON
@@ -18,6 +18,12 @@ class DirectedRectangle:
     heading: Ray
     shape: Polygon
 
+    _MAX_STEP_ANGLE = 45.0
+    """
+    Maximal angle (in degrees) of a step of `swept_shapes`, apexes of longer ones
+    are too far from the arcs.
+    """
+
     @classmethod
     def new_origin_x(cls, width: float, length: float) -> "DirectedRectangle":
         """Creates a new rect, centered at origin, headed in direction of the X axis."""
@@ -98,6 +104,16 @@ class DirectedRectangle:
         if np.abs(turning_rate) < EPSILON:
             return Affine.translation(self.direction * speed * delta_time)
 
+        radius, angle = self._turn(speed, traction, turning_rate, delta_time)
+        transform = Affine.rotation(angle, self.center + self.right_direction * radius)
+
+        return transform
+
+    @staticmethod
+    def _turn(
+        speed: float, traction: float, turning_rate: float, delta_time: float
+    ) -> Tuple[float, float]:
+        """Returns radius and angle (in degrees) of the circular motion."""
         # increased traction means smaller radius
         # so does increased turning rate, but only to a threshold of 1
         # radius will be positive while turning right and negative while turning left
@@ -110,6 +126,52 @@ class DirectedRectangle:
         # if pivot is on the left, angle's sign is reversed
         angle = -1.0 * _ANGLE_CALCULATION_HELPER * speed * delta_time / radius
 
-        transform = Affine.rotation(angle, self.center + self.right_direction * radius)
+        return radius, angle
 
-        return transform
+    def swept_shapes(
+        self,
+        speed: float,
+        traction: float,
+        turning_rate: float,
+        delta_time: float,
+        max_excess: float = 0.5,
+    ) -> List[Polygon]:
+        """Covers the area swept by the motion of `turn_curve_transform` with convex polygons.
+
+        Straight motion is covered by the convex hull of the rectangle at both ends.
+        Turning is split into steps, each covered by the convex hull of the rectangle
+        at both ends of the step and of the apexes of its corners' arcs: points where
+        tangents of an arc at both ends of the step meet. The swept area never leaves
+        the polygons, which reach at most `max_excess` beyond it.
+
+        Args:
+            speed, traction, turning_rate, delta_time: as in `turn_curve_transform`
+            max_excess (float): maximal distance of the polygons from the swept area
+        """
+        if np.abs(speed) < EPSILON or np.abs(turning_rate) < EPSILON:
+            end = self.shape * self.turn_curve_transform(
+                speed, traction, turning_rate, delta_time
+            )
+            return [Polygon.convex_hull([*self.shape, *end])]
+
+        radius, angle = self._turn(speed, traction, turning_rate, delta_time)
+        pivot = self.center + self.right_direction * radius
+        corner_radius = max(pivot.distance_to(p) for p in self.shape)
+        # an apex is r / cos(a / 2) from the pivot, r * (1 / cos(a / 2) - 1) off the arc
+        max_angle = min(
+            2.0 * np.degrees(np.arccos(corner_radius / (corner_radius + max_excess))),
+            self._MAX_STEP_ANGLE,
+        )
+        steps = max(1, int(np.ceil(np.abs(angle) / max_angle)))
+        step_angle = angle / steps
+        apex_scale = 1.0 / np.cos(np.radians(step_angle / 2.0))
+
+        shapes = []
+        start = self.shape
+        for step in range(1, steps + 1):
+            end = self.shape * Affine.rotation(step_angle * step, pivot)
+            middle = self.shape * Affine.rotation(step_angle * (step - 0.5), pivot)
+            apexes = [pivot + (p - pivot) * apex_scale for p in middle]
+            shapes.append(Polygon.convex_hull([*start, *end, *apexes]))
+            start = end
+        return shapes
@@ -0,0 +1,254 @@
+from dataclasses import dataclass
+from typing import List, Any, Sequence, Tuple
+
+import numpy as np
+from planar import EPSILON
+
+from model.car.sensor import Sensor
+from model.track.track import Track
+
+
+@dataclass
+class SensingStats:
+    hits: int = 0
+    """
+    Rays whose closest wall was the one they hit in the previous tick or its neighbour.
+    """
+    misses: int = 0
+    """
+    Rays whose closest wall was found among walls near the car,
+    tested to certify the expected one.
+    """
+    searches: int = 0
+    """
+    Rays which hit none of the expected walls and were searched from their anchors.
+    """
+    full_scans: int = 0
+    """
+    Searched rays which were then tested against all walls, as a last resort.
+    """
+
+    @property
+    def total(self) -> int:
+        return self.hits + self.misses + self.searches
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.total if self.total else 0.0
+
+    def __add__(self, other: "SensingStats") -> "SensingStats":
+        return SensingStats(
+            self.hits + other.hits,
+            self.misses + other.misses,
+            self.searches + other.searches,
+            self.full_scans + other.full_scans,
+        )
+
+
+class _Walls:
+    """Walls of a track as contiguous arrays of coordinates."""
+
+    def __init__(self, track: Track) -> None:
+        walls = track.wall_array
+        self.count = len(walls)
+        self.x, self.y = walls[:, 0, 0].copy(), walls[:, 0, 1].copy()
+        self.dx = walls[:, 1, 0] - self.x
+        self.dy = walls[:, 1, 1] - self.y
+        self.parallel = EPSILON * np.hypot(self.dx, self.dy)
+        """
+        Like in `Sensor.check_distance`, which compares with the wall's unit vector.
+        """
+        self.grid = track.wall_grid
+
+    def ray_distances(
+        self, x: np.ndarray, y: np.ndarray, rx: np.ndarray, ry: np.ndarray, walls: Any
+    ) -> np.ndarray:
+        """
+        Distances along rays to the given walls, infinity where a ray misses a wall.
+
+        Vectorized `Sensor.check_distance`, rays and walls are broadcast together.
+        """
+        qx, qy = self.x[walls] - x, self.y[walls] - y
+        dx, dy = self.dx[walls], self.dy[walls]
+        rxs = rx * dy - ry * dx
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # fraction of the wall and distance along the ray at the intersection
+            wall_along = (qx * ry - qy * rx) / rxs
+            along = (qx * dy - qy * dx) / rxs
+        hit = (np.abs(rxs) >= self.parallel[walls]) & (along >= 0.0)
+        hit &= (wall_along >= 0.0) & (wall_along <= 1.0)
+        return np.where(hit, along, np.inf)
+
+
+class IncrementalSensing:
+    """
+    Senses distances to the closest walls of a track for many cars at once,
+    reusing the walls hit in the previous tick.
+
+    Every ray is tested against the wall it hit last time and that wall's neighbours
+    on the same side of the track first. A hit at distance d is then certified:
+    a wall which the ray could hit closer must cross the ray's first d units,
+    so only walls in cells of the track's `WallGrid` around that part of the ray
+    are tested as well. Rays which hit none of the expected walls search the grid
+    outwards from their anchors, see `_search`.
+
+    Unlike `Track.sense_closest`, which returns distance to the first wall found while
+    searching segments outwards from the active one, this always returns distances
+    to the closest walls.
+    """
+
+    _NEIGHBOURS = np.array([0, -2, 2])
+    """
+    Offsets of the expected walls from the last hit one in `Track.walls`,
+    the same wall and walls on the same side of the previous and next segment.
+    """
+
+    _MARGIN = 1e-9
+    """
+    Walls this much farther than a hit are still tested, to be safe from rounding.
+    """
+
+    def __init__(self, track: Track, cars: int, sensors: int) -> None:
+        """
+        Args:
+            track (Track): Track to sense.
+            cars (int): Amount of cars, which are then identified by their indexes.
+            sensors (int): Amount of sensors of every car.
+        """
+        self.stats = SensingStats()
+        self._walls = _Walls(track)
+        self._last_walls = np.full((cars, sensors), -1)
+
+    def sense(self, cars: Sequence[int], sensors: Sequence[List[Sensor]]) -> np.ndarray:
+        """
+        Returns distances to the closest walls sensed with sensors of the given cars,
+        an array of shape (cars, sensors).
+
+        Raises:
+            RuntimeError: If any of the sensors doesn't hit any wall.
+        """
+        walls = self._walls
+        cars_count, sensors_count = len(cars), self._last_walls.shape[1]
+        x, y, rx, ry = np.array(
+            [[*s.ray.anchor, *s.ray.direction] for group in sensors for s in group]
+        ).T
+        rays = np.arange(len(x))
+
+        last = self._last_walls[cars].ravel()
+        # wrapping around only adds the first and the last walls to test
+        expected = (last[:, np.newaxis] + self._NEIGHBOURS) % walls.count
+        expected_distances = walls.ray_distances(
+            x[:, np.newaxis],
+            y[:, np.newaxis],
+            rx[:, np.newaxis],
+            ry[:, np.newaxis],
+            expected,
+        )
+        expected_distances[last < 0] = np.inf
+        best = np.argmin(expected_distances, axis=1)
+        bound = expected_distances[rays, best]
+        closest = expected[rays, best]
+
+        searched = np.flatnonzero(np.isfinite(bound))
+        nearest_distances, nearest = self._closest_near(
+            x[searched], y[searched], rx[searched], ry[searched], bound[searched]
+        )
+        improved = nearest_distances < bound[searched]
+        closest[searched[improved]] = nearest[improved]
+        bound[searched[improved]] = nearest_distances[improved]
+
+        unknown = np.flatnonzero(np.isinf(bound))
+        bound[unknown], closest[unknown], scanned = self._search(
+            x[unknown], y[unknown], rx[unknown], ry[unknown]
+        )
+        if np.isinf(bound).any():
+            raise RuntimeError("one of the sensors couldn't find any walls")
+
+        self.stats.hits += len(searched) - int(np.count_nonzero(improved))
+        self.stats.misses += int(np.count_nonzero(improved))
+        self.stats.searches += len(unknown)
+        self.stats.full_scans += scanned
+        self._last_walls[cars] = closest.reshape(cars_count, sensors_count)
+        return np.asarray(bound.reshape(cars_count, sensors_count))
+
+    def _closest_near(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        rx: np.ndarray,
+        ry: np.ndarray,
+        reach: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Closest walls hit by rays among walls in cells around their first `reach`
+        units, so hits within the reach are certainly the closest ones.
+
+        Returns:
+            Distances to the walls and their indexes, infinity and -1 for rays
+            which hit none of the tested walls.
+        """
+        walls = self._walls
+        ends_x, ends_y = x + rx * reach, y + ry * reach
+        lows = np.stack([np.minimum(x, ends_x), np.minimum(y, ends_y)], axis=1)
+        highs = np.stack([np.maximum(x, ends_x), np.maximum(y, ends_y)], axis=1)
+        rays, near = walls.grid.near_boxes(lows - self._MARGIN, highs + self._MARGIN)
+        distances = walls.ray_distances(x[rays], y[rays], rx[rays], ry[rays], near)
+        nearest_distances = np.full(len(x), np.inf)
+        np.minimum.at(nearest_distances, rays, distances)
+        nearest = np.full(len(x), -1)
+        winners = np.isfinite(distances) & (distances == nearest_distances[rays])
+        nearest[rays[winners]] = near[winners]
+        return nearest_distances, nearest
+
+    def _search(
+        self, x: np.ndarray, y: np.ndarray, rx: np.ndarray, ry: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Finds the closest walls of rays without any expected hit.
+
+        Every ray tests walls around its first cell's worth of length and doubles
+        its reach until it hits a wall within it, which is then certified like
+        an expected hit. Rays which reach past the whole grid without a hit are
+        tested against all walls as a last resort.
+
+        Returns:
+            Distances to the closest walls (infinity if there are none), their
+            indexes and the amount of rays tested against all walls.
+        """
+        walls, grid = self._walls, self._walls.grid
+        distances, closest = np.full(len(x), np.inf), np.full(len(x), -1)
+        # a ray reaching this far has passed every cell of the grid
+        far = np.maximum(
+            np.abs(np.stack([x, y], axis=1) - grid.origin),
+            np.abs(
+                np.stack([x, y], axis=1) - (grid.origin + grid.shape * grid.cell_size)
+            ),
+        )
+        limits = np.hypot(far[:, 0], far[:, 1])
+        reach = np.full(len(x), float(grid.cell_size))
+        pending = np.arange(len(x))
+        scanned: List[np.ndarray] = [np.empty(0, dtype=int)]
+        while len(pending):
+            found, nearest = self._closest_near(
+                x[pending], y[pending], rx[pending], ry[pending], reach[pending]
+            )
+            certified = found <= reach[pending]
+            distances[pending[certified]] = found[certified]
+            closest[pending[certified]] = nearest[certified]
+            exhausted = ~certified & (reach[pending] >= limits[pending])
+            scanned.append(pending[exhausted])
+            pending = pending[~certified & ~exhausted]
+            reach[pending] *= 2.0
+
+        rest = np.concatenate(scanned)
+        if len(rest):
+            all_distances = walls.ray_distances(
+                x[rest, np.newaxis],
+                y[rest, np.newaxis],
+                rx[rest, np.newaxis],
+                ry[rest, np.newaxis],
+                np.arange(walls.count),
+            )
+            closest[rest] = np.argmin(all_distances, axis=1)
+            distances[rest] = all_distances[np.arange(len(rest)), closest[rest]]
+        return distances, closest, len(rest)
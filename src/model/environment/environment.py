@@ -1,32 +1,103 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, Mapping, Generator, Generic, TypeVar, List, Any
+from typing import (
+    Iterable,
+    Mapping,
+    Generator,
+    Generic,
+    TypeVar,
+    List,
+    Any,
+    Optional,
+)
+
+import numpy as np
 
 import utils
+from model.car.sensing import SensingStats
+from model.fitness import Progress, fitness_functions
 from model.neural_network.neural_network import NeuralNetwork
 from model.simulation import SimState, Simulation, FIXED_DELTA_TIME, CarState
 from model.track.track import Track
+from model.trajectory import TrajectoryRecorder
 
 T_CONTEXT = TypeVar("T_CONTEXT", contravariant=True)
 T_STATE = TypeVar("T_STATE")
 
 
 class Environment(ABC, Generic[T_CONTEXT, T_STATE]):
+    renders = True
+    """
+    Whether the environment processes every car in every tick. Environments which
+    don't are run headless: ticks are run in a tight loop without suspending
+    and without calling `_process_car_step` and `_finalize_iteration`.
+    """
+
     def __init__(self, track: Track):
         self._track = track
+        self.recorder: Optional[TrajectoryRecorder] = None
+        """
+        Records trajectories of simulated cars when set,
+        holds the data of the last run until the next one starts.
+        """
+        self.delta_time = FIXED_DELTA_TIME
+        """
+        Duration of a simulation step, see `Simulation`.
+        """
+        self.incremental_sensing = False
+        """
+        Whether cars sense walls with `IncrementalSensing`, see `Simulation`.
+        """
+        self.sensing_stats: Optional[SensingStats] = None
+        """
+        Counters of the incremental sensing in the last run.
+        """
+        self.fitness = "progress"
+        """
+        Name of the formula computing adaptations, one of `fitness_functions`.
+        """
+        self.progress: Optional[Progress] = None
+        """
+        Progress of cars in the last run, which adaptations are computed from.
+        """
+        self.ticks_per_resume: Optional[int] = None
+        """
+        Amount of ticks a headless run does before suspending,
+        None to run whole simulations without suspending.
+        """
 
     def __run_simulation(
         self, networks_groups: Mapping[str, List[NeuralNetwork]]
     ) -> Generator[None, T_CONTEXT, SimState]:
-        simulation = Simulation(self._track, networks_groups)
-        frame_time = 0.0
+        if self.fitness not in fitness_functions:
+            raise ValueError(
+                f"Fitness must be one of: {', '.join(fitness_functions)}, "
+                f"got {self.fitness}"
+            )
+        simulation = Simulation(
+            self._track,
+            networks_groups,
+            self.recorder,
+            self.delta_time,
+            incremental_sensing=self.incremental_sensing,
+        )
+        if simulation.sensing is not None:
+            self.sensing_stats = simulation.sensing.stats
+        self.progress = simulation.progress
+        if not self.renders:
+            simulation.run(self.ticks_per_resume)
+            while simulation.active_cars:
+                yield
+                simulation.run(self.ticks_per_resume)
+            return simulation.cars
+
         any_active = True
 
         state: T_STATE = self._initialize()
 
         while any_active:
             context: T_CONTEXT = (yield)
-            frame_time += FIXED_DELTA_TIME
-            frame_time, cars = simulation.update(frame_time)
+            simulation.run(self._ticks_per_step(context))
+            cars = simulation.cars
 
             any_active = False
             # TODO: differentiate cars on group_id
@@ -58,6 +129,10 @@ class Environment(ABC, Generic[T_CONTEXT, T_STATE]):
     ) -> Mapping[str, Iterable[float]]:
         return utils.generator_value(env.generate_adaptations(networks_groups))
 
+    def _ticks_per_step(self, context: T_CONTEXT) -> int:
+        """Amount of ticks run before cars are processed with the given context."""
+        return 1
+
     @abstractmethod
     def _process_car_step(
         self, state: T_STATE, context: T_CONTEXT, group_id: str, car: CarState
@@ -73,12 +148,10 @@ class Environment(ABC, Generic[T_CONTEXT, T_STATE]):
         return state
 
     def _finalize(self, cars: SimState) -> Mapping[str, Iterable[float]]:
-        return {name: self._group_adaptation(group) for name, group in cars.items()}
-
-    def _group_adaptation(self, car_group: Iterable[CarState]) -> Iterable[float]:
-        for car_state in car_group:
-            yield self._car_adaptation(car_state)
-
-    @staticmethod
-    def _car_adaptation(car_state: CarState) -> float:
-        return car_state.car.active_segment
+        assert self.progress is not None
+        adaptations = fitness_functions[self.fitness].value(self.progress)
+        ends = np.cumsum([len(group) for group in cars.values()])
+        return {
+            name: adaptations[end - len(group) : end].tolist()
+            for (name, group), end in zip(cars.items(), ends)
+        }
@@ -0,0 +1,124 @@
+import itertools
+import pickle
+import socket
+from typing import (
+    Any,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    cast,
+)
+
+from model.environment.environment import Environment
+from model.environment.server import HEADER, Address, EvaluationOptions, encode
+from model.neural_network.neural_network import NeuralNetwork
+from model.simulation import CarState
+from model.track.track import Track
+
+
+class RemoteEnvironment(Environment[None, None]):
+    """
+    Environment evaluating networks on an `EvaluationServer`.
+
+    A drop-in replacement of `SilentEnvironment` for `Neuroevolution`, the track is
+    given by its name on the server. Settings of the simulation (`delta_time`,
+    `incremental_sensing` and `fitness`) are sent with every job; trajectories
+    and sensing statistics are not available.
+    """
+
+    renders = False
+
+    def __init__(self, address: Address, track: str, timeout: Optional[float] = None):
+        """
+        Args:
+            address (str or Tuple): Path of the server's Unix socket or its host and port.
+            track (str): Name of the track on the server.
+            timeout (float, optional): Seconds to wait for a job's adaptations.
+        """
+        super().__init__(cast(Track, None))
+        self.address = address
+        self.track = track
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._ids = itertools.count()
+
+    def connect(self) -> None:
+        if self._socket is not None:
+            return
+        if isinstance(self.address, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.settimeout(self.timeout)
+        self._socket.connect(self.address)
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self) -> "RemoteEnvironment":
+        self.connect()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _receive(self, size: int) -> bytes:
+        assert self._socket is not None
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Evaluation server closed the connection")
+            data += chunk
+        return bytes(data)
+
+    def evaluate(
+        self, networks_groups: Mapping[str, List[NeuralNetwork]]
+    ) -> Mapping[str, Iterable[float]]:
+        """
+        Sends networks to the server and waits for their adaptations.
+
+        Raises:
+            RuntimeError: If the server failed to evaluate the networks.
+        """
+        self.connect()
+        assert self._socket is not None
+        job_id = next(self._ids)
+        options = EvaluationOptions(
+            self.delta_time, self.incremental_sensing, self.fitness
+        )
+        groups = {name: list(group) for name, group in networks_groups.items()}
+        self._socket.sendall(encode(("evaluate", job_id, self.track, options, groups)))
+        (length,) = HEADER.unpack(self._receive(HEADER.size))
+        kind, received_id, result = pickle.loads(self._receive(length))
+        if received_id != job_id:
+            raise RuntimeError(f"Expected a result of job {job_id}, got {received_id}")
+        if kind == "error":
+            raise RuntimeError(f"Evaluation server failed: {result}")
+        return cast(Mapping[str, Iterable[float]], result)
+
+    def generate_adaptations(
+        self, networks_groups: Mapping[str, List[NeuralNetwork]]
+    ) -> Generator[None, None, Mapping[str, Iterable[float]]]:
+        return self.evaluate(networks_groups)
+        yield  # makes it a generator, adaptations are returned without suspending
+
+    def run(
+        self, networks_groups: Mapping[str, List[NeuralNetwork]]
+    ) -> Generator[None, None, None]:
+        self.evaluate(networks_groups)
+        yield from ()
+
+    _initialize = type(None)
+
+    def _finalize_iteration(self, state: None, context: None) -> None:
+        return state
+
+    def _process_car_step(
+        self, state: None, context: None, group_id: str, car: CarState
+    ) -> None:
+        pass
@@ -0,0 +1,353 @@
+import asyncio
+import os
+import pickle
+import struct
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing import get_context, get_all_start_methods
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from model.environment.environment import Environment
+from model.neural_network.neural_network import NeuralNetwork
+from model.simulation import FIXED_DELTA_TIME
+from model.track.compiled import TrackSource, load_track
+from model.track.track import Track
+from view.silent_environment import SilentEnvironment
+
+Address = Union[str, Tuple[str, int]]
+"""
+Path of a Unix socket or a host and a port.
+"""
+
+HEADER = struct.Struct("!I")
+
+_tracks: Dict[str, Track] = {}
+"""
+Tracks networks are evaluated on in a worker, by their names.
+"""
+
+
+@dataclass(frozen=True)
+class EvaluationOptions:
+    """Settings of the simulation, see `Environment`."""
+
+    delta_time: float = FIXED_DELTA_TIME
+    incremental_sensing: bool = False
+    fitness: str = "progress"
+
+
+def encode(message: Any) -> bytes:
+    """
+    Frames a message: its length followed by its pickle.
+
+    Messages are unpickled on the other side, so connections must only ever
+    be made between trusted local processes.
+    """
+    body = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    return HEADER.pack(len(body)) + body
+
+
+async def _read_message(reader: asyncio.StreamReader) -> Any:
+    (length,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return pickle.loads(await reader.readexactly(length))
+
+
+def _init_worker(tracks: Optional[Mapping[str, TrackSource]]) -> None:
+    if tracks is not None:
+        _load_tracks(tracks)
+
+
+def _load_tracks(tracks: Mapping[str, TrackSource]) -> None:
+    for name, source in tracks.items():
+        track = load_track(source)
+        track.precompute_geometry()
+        _tracks[name] = track
+
+
+def _evaluate(
+    track: str, options: EvaluationOptions, networks: List[NeuralNetwork]
+) -> List[float]:
+    environment = SilentEnvironment(_tracks[track])
+    environment.delta_time = options.delta_time
+    environment.incremental_sensing = options.incremental_sensing
+    environment.fitness = options.fitness
+    adaptations = Environment.compute_adaptations(environment, {"batch": networks})
+    return list(adaptations["batch"])
+
+
+@dataclass
+class _Job:
+    id: int
+    networks: List[NeuralNetwork]
+    groups: List[Tuple[str, int]]
+    """
+    Names and sizes of the groups the networks were sent in.
+    """
+    writer: asyncio.StreamWriter
+    adaptations: List[float] = field(default_factory=list)
+    pending: int = 0
+    """
+    Amount of the job's networks still being evaluated.
+    """
+
+    def result(self) -> Dict[str, List[float]]:
+        results, start = {}, 0
+        for name, size in self.groups:
+            results[name] = self.adaptations[start : start + size]
+            start += size
+        return results
+
+
+_Slice = Tuple[_Job, int, int]
+"""
+Part of a job's networks, from the first index to the last one (exclusive).
+"""
+
+
+class EvaluationServer:
+    """
+    Evaluates networks for many clients (see `RemoteEnvironment`) on shared workers.
+
+    Jobs coming from all clients are coalesced: networks to be evaluated on
+    the same track with the same options are put together into large batches,
+    every batch is then split between the workers and simulated in one run
+    per worker. Cars don't interact, so a network gets the same adaptation
+    no matter which batch it's evaluated in. Adaptations of every job are sent
+    back as soon as all of its networks are evaluated, in any order.
+
+    Protocol (messages framed by `encode`):
+        client: ("evaluate", job id, track name, options, {group: [networks]})
+        server: ("result", job id, {group: [adaptations]})
+            or ("error", job id, message)
+    """
+
+    def __init__(
+        self,
+        tracks: Mapping[str, TrackSource],
+        processes: Optional[int] = None,
+        max_batch: int = 1024,
+        max_delay: float = 0.005,
+        min_chunk: int = 16,
+    ) -> None:
+        """
+        Args:
+            tracks (Mapping): Tracks clients can ask for, by their names; points
+                of the tracks or directories of the compiled ones.
+            processes (int, optional): Amount of worker processes, defaults to
+                the CPU count. With 0 networks are evaluated in a thread
+                of this process instead, e.g. for testing.
+            max_batch (int): Maximal amount of networks simulated in one batch.
+            max_delay (float): Seconds to wait for more jobs to join a batch.
+            min_chunk (int): Minimal amount of networks sent to a single worker.
+
+        Raises:
+            ValueError: If any of the values is out of its range.
+        """
+        processes = os.cpu_count() or 1 if processes is None else processes
+        if processes < 0 or max_batch < 1 or min_chunk < 1 or max_delay < 0:
+            raise ValueError(
+                "Processes and delay must not be negative, batch and chunk sizes "
+                "must be positive"
+            )
+        self.tracks = dict(tracks)
+        self.processes = processes
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.min_chunk = min_chunk
+        self.evaluated = 0
+        """
+        Amount of networks evaluated so far.
+        """
+        self.batches = 0
+        """
+        Amount of batches evaluated so far.
+        """
+        self._executor: Optional[Executor] = None
+        self._queue: "Optional[asyncio.Queue[Tuple[str, EvaluationOptions, _Slice]]]"
+        self._queue = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: "Optional[asyncio.Task[None]]" = None
+        self._connections: "Dict[asyncio.Task[Any], asyncio.StreamWriter]" = {}
+
+    def _make_executor(self) -> Executor:
+        if self.processes == 0:
+            _load_tracks(self.tracks)
+            return ThreadPoolExecutor(1)
+        if "fork" in get_all_start_methods():
+            _load_tracks(self.tracks)
+            start_method, init_tracks = "fork", None
+        else:
+            start_method, init_tracks = "spawn", self.tracks
+        return ProcessPoolExecutor(
+            self.processes,
+            mp_context=get_context(start_method),
+            initializer=_init_worker,
+            initargs=(init_tracks,),
+        )
+
+    async def start(self, address: Address) -> Address:
+        """
+        Starts listening, returns the address (with the port chosen by the OS
+        if the port 0 was given).
+        """
+        self._executor = self._make_executor()
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_forever())
+        if isinstance(address, str):
+            self._server = await asyncio.start_unix_server(self._serve, address)
+            return address
+        host, port = address
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[:2]  # type: ignore
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # the server doesn't wait for its connections, they end once they're closed
+        for writer in self._connections.values():
+            writer.close()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        tasks = [*self._connections, *([self._batcher] if self._batcher else [])]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    @contextmanager
+    def running(self, address: Address) -> Iterator[Address]:
+        """
+        Runs the server in a background thread with its own event loop,
+        so that clients can connect from this process, e.g. in tests.
+        """
+        loop = asyncio.new_event_loop()
+        started = asyncio.run_coroutine_threadsafe(self.start(address), loop)
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield started.result()
+        finally:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        assert self._queue is not None
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[task] = writer
+        try:
+            while True:
+                kind, client_id, track, options, groups = await _read_message(reader)
+                if kind != "evaluate" or track not in self.tracks:
+                    message = f"Unknown request {kind} or track {track}"
+                    writer.write(encode(("error", client_id, message)))
+                    continue
+                networks = [n for group in groups.values() for n in group]
+                job = _Job(
+                    client_id,
+                    networks,
+                    [(name, len(group)) for name, group in groups.items()],
+                    writer,
+                    [0.0] * len(networks),
+                    len(networks),
+                )
+                if not networks:
+                    writer.write(encode(("result", job.id, job.result())))
+                    continue
+                for start in range(0, len(networks), self.max_batch):
+                    end = min(start + self.max_batch, len(networks))
+                    self._queue.put_nowait((track, options, (job, start, end)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _batch_forever(self) -> None:
+        """Collects slices of jobs into batches and dispatches them."""
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            batches: Dict[Tuple[str, EvaluationOptions], List[_Slice]] = {}
+            sizes: Dict[Tuple[str, EvaluationOptions], int] = {}
+            deadline = loop.time() + self.max_delay
+            item: Optional[Tuple[str, EvaluationOptions, _Slice]] = first
+            while item is not None:
+                track, options, (job, start, end) = item
+                key = (track, options)
+                batches.setdefault(key, []).append((job, start, end))
+                sizes[key] = sizes.get(key, 0) + end - start
+                if sizes[key] >= self.max_batch:
+                    self._dispatch(key, batches.pop(key))
+                    del sizes[key]
+                item = await self._next_slice(deadline - loop.time())
+            for key, slices in batches.items():
+                self._dispatch(key, slices)
+
+    async def _next_slice(
+        self, timeout: float
+    ) -> Optional[Tuple[str, EvaluationOptions, _Slice]]:
+        assert self._queue is not None
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        if timeout <= 0:
+            return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _dispatch(
+        self, key: Tuple[str, EvaluationOptions], slices: List[_Slice]
+    ) -> None:
+        """Splits a batch between the workers and evaluates the parts concurrently."""
+        assert self._executor is not None
+        networks = [n for job, start, end in slices for n in job.networks[start:end]]
+        owners = [(job, i) for job, start, end in slices for i in range(start, end)]
+        workers = max(self.processes, 1)
+        chunks = max(1, min(workers, len(networks) // self.min_chunk))
+        size = -(-len(networks) // chunks)
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        for first in range(0, len(networks), size):
+            future = loop.run_in_executor(
+                self._executor, _evaluate, *key, networks[first : first + size]
+            )
+            future.add_done_callback(
+                partial(self._finish, owners[first : first + size])
+            )
+
+    def _finish(
+        self, owners: List[Tuple[_Job, int]], future: "asyncio.Future[List[float]]"
+    ) -> None:
+        if future.cancelled():
+            return
+        if (error := future.exception()) is not None:
+            for job in {id(job): job for job, _ in owners}.values():
+                if job.pending > 0:
+                    job.pending = 0
+                    job.writer.write(encode(("error", job.id, repr(error))))
+            return
+        self.evaluated += len(owners)
+        for (job, index), adaptation in zip(owners, future.result()):
+            job.adaptations[index] = adaptation
+            job.pending -= 1
+            if job.pending == 0:
+                job.writer.write(encode(("result", job.id, job.result())))
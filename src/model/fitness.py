@@ -0,0 +1,152 @@
+from abc import ABC, abstractmethod
+from typing import Dict
+
+import numpy as np
+
+from model.car.car import Car
+from model.track.track import Track
+
+
+class Progress:
+    """
+    Progress of all cars of a simulation along the track, kept in arrays
+    indexed by the cars' positions in the simulation and updated every tick.
+
+    Cars are projected onto the centerline of their active segment,
+    the line between the middles of its back and front wall.
+    """
+
+    def __init__(self, track: Track, cars: int) -> None:
+        centers = track.points_array().mean(axis=1)
+        self._starts = centers[:-1]
+        vectors = centers[1:] - centers[:-1]
+        self._lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        self._directions = vectors / np.maximum(self._lengths, 1e-12)[:, np.newaxis]
+        self._offsets = np.concatenate([[0.0], np.cumsum(self._lengths)[:-1]])
+
+        self.segments = np.zeros(cars, dtype=int)
+        """
+        Active segment of every car.
+        """
+        self.fraction = np.zeros(cars)
+        """
+        Fraction of the active segment's centerline passed, between 0 and 1.
+        """
+        self.distance = np.zeros(cars)
+        """
+        Distance along the track's centerline from its start.
+        """
+        self.start_distance = np.full(cars, np.nan)
+        """
+        Distance of the car's first position, NaN until it's known.
+        """
+        self.time = np.zeros(cars)
+        """
+        Time the car spent driving.
+        """
+        self.travelled = np.zeros(cars)
+        """
+        Length of the car's path, accumulated from its speed.
+        """
+
+    def update(
+        self,
+        cars: np.ndarray,
+        segments: np.ndarray,
+        centers: np.ndarray,
+        speeds: np.ndarray,
+        delta_time: float,
+    ) -> None:
+        """
+        Args:
+            cars (numpy.ndarray): Indexes of the cars which moved.
+            segments (numpy.ndarray): Their active segments.
+            centers (numpy.ndarray): Their centers, of shape (cars, 2).
+            speeds (numpy.ndarray): Their speeds.
+            delta_time (float): Duration of the move.
+        """
+        along = np.einsum(
+            "ij,ij->i", centers - self._starts[segments], self._directions[segments]
+        )
+        lengths = self._lengths[segments]
+        np.clip(along, 0.0, lengths, out=along)
+        self.segments[cars] = segments
+        self.fraction[cars] = along / np.maximum(lengths, 1e-12)
+        self.distance[cars] = self._offsets[segments] + along
+        unknown = cars[np.isnan(self.start_distance[cars])]
+        self.start_distance[unknown] = self.distance[unknown]
+        self.time[cars] += delta_time
+        self.travelled[cars] += np.abs(speeds) * delta_time
+
+    @property
+    def mean_speed(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.time > 0, self.travelled / self.time, 0.0)
+
+    @property
+    def pace(self) -> np.ndarray:
+        """
+        Distance gained along the centerline per second of driving,
+        unlike `mean_speed` it doesn't grow for cars going in circles or back.
+        """
+        gained = self.distance - np.nan_to_num(self.start_distance)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.time > 0, np.maximum(gained, 0.0) / self.time, 0.0)
+
+
+class Fitness(ABC):
+    @staticmethod
+    @abstractmethod
+    def value(progress: Progress) -> np.ndarray:
+        """Adaptations of all cars."""
+        raise NotImplementedError
+
+
+class SegmentFitness(Fitness):
+    """Active segment, many cars get the same adaptation."""
+
+    @staticmethod
+    def value(progress: Progress) -> np.ndarray:
+        return progress.segments.astype(float)
+
+
+class ProgressFitness(Fitness):
+    """
+    Active segment plus the fraction of it passed, so it orders cars
+    the same as `SegmentFitness` but cars in the same segment get different ones.
+    """
+
+    @staticmethod
+    def value(progress: Progress) -> np.ndarray:
+        return progress.segments + progress.fraction
+
+
+class DistanceFitness(Fitness):
+    """Distance along the track's centerline, long segments count more."""
+
+    @staticmethod
+    def value(progress: Progress) -> np.ndarray:
+        distance: np.ndarray = progress.distance.copy()
+        return distance
+
+
+class SpeedFitness(Fitness):
+    """
+    Progress plus up to half a segment for pace relative to the maximal speed,
+    so slow cars are overtaken by faster ones which got almost as far.
+    """
+
+    MAX_SPEED = Car._MAX_FORWARD_SPEED
+
+    @staticmethod
+    def value(progress: Progress) -> np.ndarray:
+        bonus = np.minimum(progress.pace / SpeedFitness.MAX_SPEED, 1.0)
+        return ProgressFitness.value(progress) + 0.5 * bonus
+
+
+fitness_functions: Dict[str, Fitness] = {
+    "segment": SegmentFitness(),
+    "progress": ProgressFitness(),
+    "distance": DistanceFitness(),
+    "speed": SpeedFitness(),
+}
@@ -10,6 +10,12 @@ class Activation(ABC):
     def value(x: np.ndarray) -> np.ndarray:
         raise NotImplementedError
 
+    @staticmethod
+    @abstractmethod
+    def value_in_place(x: np.ndarray) -> np.ndarray:
+        """Same as `value`, but overwrites x with the result instead of allocating."""
+        raise NotImplementedError
+
     @staticmethod
     @abstractmethod
     def derivative(x: np.ndarray) -> np.ndarray:
@@ -26,6 +32,14 @@ class Sigmoid(Activation):
     def value(x: np.ndarray) -> np.ndarray:
         return 1.0 / (1.0 + np.exp(np.negative(x)))
 
+    @staticmethod
+    def value_in_place(x: np.ndarray) -> np.ndarray:
+        np.negative(x, out=x)
+        np.exp(x, out=x)
+        np.add(x, 1.0, out=x)
+        np.reciprocal(x, out=x)
+        return x
+
     @staticmethod
     def derivative(x: np.ndarray) -> np.ndarray:
         fx = Sigmoid.value(x)
@@ -44,6 +58,11 @@ class Relu(Activation):
     def value(x: np.ndarray) -> np.ndarray:
         return np.maximum(x, 0)
 
+    @staticmethod
+    def value_in_place(x: np.ndarray) -> np.ndarray:
+        np.maximum(x, 0, out=x)
+        return x
+
     @staticmethod
     def derivative(x: np.ndarray) -> np.ndarray:
         return np.where(x > 0, 1, 0)
@@ -61,6 +80,11 @@ class Tanh(Activation):
     def value(x: np.ndarray) -> np.ndarray:
         return np.tanh(x)
 
+    @staticmethod
+    def value_in_place(x: np.ndarray) -> np.ndarray:
+        np.tanh(x, out=x)
+        return x
+
     @staticmethod
     def derivative(x: np.ndarray) -> np.ndarray:
         fx = Tanh.value(x)
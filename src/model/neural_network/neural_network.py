@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Tuple, Callable, Optional, cast
 
 import numpy as np
 
@@ -11,13 +12,81 @@ from model.neural_network.activation_functions import (
 np.set_printoptions(suppress=True)
 
 
-@dataclass
+@dataclass(frozen=True)
 class LayerInfo:
     neurons_count: int
     activation_function_name: str
 
 
+@dataclass(frozen=True)
+class Topology:
+    """
+    Immutable shape of a network, shared by all networks of the same shape.
+
+    All weights and biases of a network are kept in one contiguous vector
+    of parameters: weights (row by row) and biases of the first layer, then
+    of the second one and so on. Layers are views into that vector.
+    """
+
+    layers: Tuple[LayerInfo, ...]
+    output_neurons_count: int
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def shared(layers: Tuple[LayerInfo, ...], output_neurons_count: int) -> "Topology":
+        """Returns the topology of the given shape, the same object for equal shapes."""
+        return Topology(layers, output_neurons_count)
+
+    @property
+    def input_neurons_count(self) -> int:
+        return self.layers[0].neurons_count
+
+    @cached_property
+    def shapes(self) -> Tuple[Tuple[int, int], ...]:
+        """Shapes of the layers' weights, (outputs, inputs) of every layer."""
+        outputs = [info.neurons_count for info in self.layers[1:]]
+        outputs.append(self.output_neurons_count)
+        return tuple(
+            (count, info.neurons_count) for info, count in zip(self.layers, outputs)
+        )
+
+    @cached_property
+    def offsets(self) -> Tuple[int, ...]:
+        """Offsets of the layers' parameters in the vector, with its size at the end."""
+        sizes = [outputs * (inputs + 1) for outputs, inputs in self.shapes]
+        return tuple(np.concatenate([[0], np.cumsum(sizes)]).tolist())
+
+    @property
+    def size(self) -> int:
+        """Amount of parameters of a network."""
+        return self.offsets[-1]
+
+    def views(self, parameters: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Weights and biases of every layer as views into a vector of parameters."""
+        layers = []
+        for (outputs, inputs), start in zip(self.shapes, self.offsets):
+            weights_end = start + outputs * inputs
+            weights = parameters[start:weights_end].reshape(outputs, inputs)
+            layers.append((weights, parameters[weights_end : weights_end + outputs]))
+        return layers
+
+    def randomize(self, parameters: np.ndarray) -> None:
+        """
+        Fills a vector of parameters with random values, uniform in [-1, 1)
+        except for the last layer, whose values are in [0, 1).
+        """
+        layers = self.views(parameters)
+        for (weights, biases), shape in zip(layers[:-1], self.shapes):
+            weights[...] = np.random.uniform(-1, 1, shape)
+            biases[...] = np.random.uniform(-1, 1, shape[0])
+        weights, biases = layers[-1]
+        weights[...] = np.random.rand(*weights.shape)
+        biases[...] = np.random.rand(biases.shape[0])
+
+
 class Layer:
+    __slots__ = ("info", "activation", "weights", "biases")
+
     def __init__(
         self, basic_info: LayerInfo, weights: np.ndarray, biases: np.ndarray,
     ):
@@ -28,31 +97,92 @@ class Layer:
         self.weights: np.ndarray = weights
         self.biases = biases
 
+    def __setstate__(self, state: Any) -> None:
+        # layers pickled before they were slotted have a plain dictionary
+        if isinstance(state, tuple):
+            state = state[1]
+        for name, value in state.items():
+            setattr(self, name, value)
+
 
 class NeuralNetwork:
     """
     Class representing a neural network (multilayer perceptron).
+
+    Weights and biases of the layers are views into the network's contiguous
+    vector of `parameters`, so they must be changed in place, never replaced.
     """
 
+    __slots__ = ("topology", "parameters", "hidden_layers")
+
     def __init__(
-        self, hidden_layers_info: List[LayerInfo], output_neurons_count: int,
+        self,
+        hidden_layers_info: List[LayerInfo],
+        output_neurons_count: int,
+        dtype: type = np.float64,
     ):
         """
         Args:
             hidden_layers_info (List[NeuralNetworkHiddenLayerInfo): A list of objects
                 with info needed for creation of hidden layers. There must be at least two layers,
                 since single layer network is not supported.
+            dtype (type): Type of weights and biases, numpy.float64 or numpy.float32.
         """
         if len(hidden_layers_info) < 2:
             raise NotImplementedError(
                 "This implementation of neural network does not support single layer networks"
             )
-        self.output_neurons_count = output_neurons_count
+        topology = Topology.shared(tuple(hidden_layers_info), output_neurons_count)
+        parameters: np.ndarray = np.empty(topology.size, dtype)
+        topology.randomize(parameters)
+        self._bind(topology, parameters)
 
-        self.hidden_layers_info = hidden_layers_info
-        self.input_layer_neuron_count = self.hidden_layers_info[0].neurons_count
-        self.hidden_layers = self._create_hidden_layers(
-            hidden_layers_info, output_neurons_count
+    @classmethod
+    def from_parameters(
+        cls, topology: Topology, parameters: np.ndarray
+    ) -> "NeuralNetwork":
+        """
+        Creates a network using the given vector of parameters, which isn't copied,
+        e.g. a row of `CompactPopulation.parameters`.
+        """
+        if parameters.shape != (topology.size,):
+            raise ValueError(
+                f"Expected {topology.size} parameters, got shape {parameters.shape}"
+            )
+        network: NeuralNetwork = cls.__new__(cls)
+        network._bind(topology, parameters)
+        return network
+
+    def _bind(self, topology: Topology, parameters: np.ndarray) -> None:
+        self.topology = topology
+        self.parameters = parameters
+        self.hidden_layers = [
+            Layer(info, weights, biases)
+            for info, (weights, biases) in zip(
+                topology.layers, topology.views(parameters)
+            )
+        ]
+
+    @property
+    def hidden_layers_info(self) -> List[LayerInfo]:
+        return list(self.topology.layers)
+
+    @property
+    def input_layer_neuron_count(self) -> int:
+        return self.topology.input_neurons_count
+
+    @property
+    def output_neurons_count(self) -> int:
+        return self.topology.output_neurons_count
+
+    @property
+    def dtype(self) -> type:
+        return cast(type, self.parameters.dtype.type)
+
+    def astype(self, dtype: type) -> "NeuralNetwork":
+        """Returns a copy of this network with weights and biases of the given type."""
+        return NeuralNetwork.from_parameters(
+            self.topology, self.parameters.astype(dtype, copy=True)
         )
 
     def _feed_forward(self, training_data_set: np.ndarray,) -> np.ndarray:
@@ -81,30 +211,120 @@ class NeuralNetwork:
         output = self._feed_forward(input_data_set)
         return output
 
-    @staticmethod
-    def _create_hidden_layers(
-        hidden_layers_info: List[LayerInfo], output_neurons_count: int,
-    ) -> List[Layer]:
-        hidden_layers = []
-        for layer_info, next_layer_info in zip(
-            hidden_layers_info[:-1], hidden_layers_info[1:]
-        ):
-            weights = np.random.uniform(
-                -1, 1, (next_layer_info.neurons_count, layer_info.neurons_count),
-            )
-            biases = np.random.uniform(-1, 1, next_layer_info.neurons_count)
-            hidden_layers.append(Layer(layer_info, weights, biases))
+    def compile(
+        self, batch_size: int = 1, dtype: Optional[type] = None
+    ) -> "InferencePlan":
+        """
+        Creates an inference plan for this network, see InferencePlan.
+
+        Args:
+            batch_size (int): Amount of data samples fed at once.
+            dtype (type, optional): Type of numbers used for computations,
+                e.g. numpy.float32. Defaults to the type of the network's weights.
+        """
+        return InferencePlan(self, batch_size, dtype)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "NeuralNetwork":
+        # the parameters are copied at once and the topology is shared
+        return NeuralNetwork.from_parameters(self.topology, self.parameters.copy())
 
-        last_hidden_layer_info = hidden_layers_info[-1]
-        last_hidden_layer_info_weights = np.random.rand(
-            output_neurons_count, last_hidden_layer_info.neurons_count
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return _unpickle_network, (
+            self.topology.layers,
+            self.topology.output_neurons_count,
+            self.parameters,
         )
-        last_hidden_layer_biases = np.random.rand(output_neurons_count)
-        hidden_layers.append(
-            Layer(
-                last_hidden_layer_info,
-                last_hidden_layer_info_weights,
-                last_hidden_layer_biases,
-            )
+
+    def __setstate__(self, state: Any) -> None:
+        # networks pickled before they had contiguous parameters
+        layers: List[Layer] = state["hidden_layers"]
+        topology = Topology.shared(
+            tuple(state["hidden_layers_info"]), state["output_neurons_count"]
         )
-        return hidden_layers
+        parameters = np.concatenate(
+            [
+                np.concatenate([layer.weights.ravel(), layer.biases.ravel()])
+                for layer in layers
+            ]
+        )
+        self._bind(topology, parameters)
+
+
+def _unpickle_network(
+    layers: Tuple[LayerInfo, ...], output_neurons_count: int, parameters: np.ndarray
+) -> NeuralNetwork:
+    topology = Topology.shared(layers, output_neurons_count)
+    return NeuralNetwork.from_parameters(topology, parameters)
+
+
+class InferencePlan:
+    """
+    Feed-forward of a network prepared for many repeated predictions.
+
+    Weights are copied once into contiguous, pre-transposed matrices and all
+    intermediate results are written into buffers allocated up front, so making
+    a prediction allocates nothing.
+
+    The plan is a snapshot, changes of the network's weights made after
+    it was compiled are not reflected.
+    Results match `NeuralNetwork.predict` up to floating point rounding.
+    """
+
+    __slots__ = ("input", "output", "_steps")
+
+    def __init__(
+        self, network: NeuralNetwork, batch_size: int = 1, dtype: Optional[type] = None
+    ) -> None:
+        if dtype is None:
+            dtype = network.dtype
+        self.input: np.ndarray = np.zeros(
+            (batch_size, network.input_layer_neuron_count), dtype
+        )
+        """
+        Buffer for the input data, it can be filled in place before calling `run`.
+        """
+        self._steps: List[
+            Tuple[
+                np.ndarray,
+                np.ndarray,
+                np.ndarray,
+                np.ndarray,
+                Callable[[np.ndarray], np.ndarray],
+            ]
+        ] = []
+        values = self.input
+        for layer in network.hidden_layers:
+            # always copies, so that the plan doesn't share the network's arrays
+            weights_t: np.ndarray = np.array(layer.weights.T, dtype=dtype, order="C")
+            biases: np.ndarray = np.array(
+                layer.biases.reshape(1, -1), dtype=dtype, order="C"
+            )
+            out: np.ndarray = np.empty((batch_size, weights_t.shape[1]), dtype=dtype)
+            self._steps.append(
+                (values, weights_t, biases, out, layer.activation.value_in_place)
+            )
+            values = out
+        self.output = values
+        """
+        Buffer holding the result of the last `run`, overwritten by the next one.
+        """
+
+    def run(self) -> np.ndarray:
+        """Feeds the network with the current content of `input`."""
+        for values, weights_t, biases, out, activation in self._steps:
+            np.dot(values, weights_t, out=out)
+            np.add(out, biases, out=out)
+            activation(out)
+        return self.output
+
+    def predict(self, input_data_set: np.ndarray) -> np.ndarray:
+        """
+        Same as `NeuralNetwork.predict`, the input must have the batch size of the plan.
+
+        Returns:
+            The `output` buffer, copy it to keep the result past the next prediction.
+        """
+        if input_data_set.shape != self.input.shape:
+            raise ValueError("Dimension mismatch")
+        self.input[...] = input_data_set
+        return self.run()
@@ -1,9 +1,8 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from model.neural_network.neural_network import NeuralNetwork
 from model.car.car_instructions import CarInstruction
-import numpy as np
 
 
 @dataclass
@@ -17,10 +16,18 @@ class NeuralNetworkAdapter:
     Every input number will be multiplied by this before enter to neural network.
     """
 
-    def __init__(self, neural_network: NeuralNetwork):
+    def __init__(self, neural_network: NeuralNetwork, dtype: Optional[type] = None):
+        """
+        Args:
+            neural_network (NeuralNetwork): The network, it's compiled right away,
+                so it mustn't be changed while used by this adapter.
+            dtype (type, optional): Type of numbers used for inference,
+                defaults to the type of the network's weights.
+        """
         if neural_network.output_neurons_count != 2:
             raise ValueError("Neural network need 2 output neurons to be compatible.")
         self.neural_network: NeuralNetwork = neural_network
+        self._plan = neural_network.compile(dtype=dtype)
 
     def get_instructions(self, distances: List[float], speed: float) -> CarInstruction:
         """
@@ -41,9 +48,10 @@ class NeuralNetworkAdapter:
                 f"Sensors count: {len(distances)}."
             )
 
-        valid_input = np.expand_dims(
-            np.array(distances + [speed]) * NeuralNetworkAdapter._PREPROCESSING_RATE, 0
-        )
-        output = self.neural_network.predict(valid_input)
+        valid_input = self._plan.input[0]
+        valid_input[:-1] = distances
+        valid_input[-1] = speed
+        valid_input *= NeuralNetworkAdapter._PREPROCESSING_RATE
+        output = self._plan.run()
 
-        return CarInstruction(*output[0])
+        return CarInstruction(float(output[0, 0]), float(output[0, 1]))
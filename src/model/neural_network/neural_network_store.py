@@ -1,7 +1,7 @@
 import pickle
 from os import makedirs
 from os.path import exists
-from typing import List
+from typing import List, Optional
 
 from model.neural_network.neural_network import NeuralNetwork
 
@@ -18,6 +18,7 @@ class NeuralNetworkStore:
         neural_networks: List[NeuralNetwork],
         file_name: str,
         directory_name: str = _DEFAULT_DIRECTORY,
+        dtype: Optional[type] = None,
     ) -> None:
         """
         Stores neural networks in a binary file with .nn extension.
@@ -28,11 +29,15 @@ class NeuralNetworkStore:
                 will be created if it doesn't exist.
             directory_name (str): Name of the directory where the file is,
                 will be created if it doesn't exist.
+            dtype (type, optional): Type to store weights as, e.g. numpy.float32
+                to halve the file size. Defaults to the networks' own type.
         """
         if not exists(directory_name):
             makedirs(directory_name)
         with open(f"{directory_name}/{file_name}.nn", "wb") as store:
             for neural_network in neural_networks:
+                if dtype is not None and neural_network.dtype is not dtype:
+                    neural_network = neural_network.astype(dtype)
                 pickle.dump(neural_network, store, pickle.HIGHEST_PROTOCOL)
 
     @staticmethod
@@ -40,6 +45,7 @@ class NeuralNetworkStore:
         file_name: str,
         directory_name: str = _DEFAULT_DIRECTORY,
         amount_to_load: int = -1,
+        dtype: Optional[type] = None,
     ) -> List[NeuralNetwork]:
         """
         Loads neural networks from a binary file with .nn extension.
@@ -51,6 +57,8 @@ class NeuralNetworkStore:
                 if there is not enough neural networks in file,
                 everything will be loaded without any exception,
                 same for negative value.
+            dtype (type, optional): Type to convert weights to, e.g. numpy.float32.
+                Networks are loaded with the type they were stored with by default.
 
         Raises:
             FileNotFoundError: If the file or directory don't exist.
@@ -61,8 +69,11 @@ class NeuralNetworkStore:
             counter = 0
             while counter != amount_to_load:
                 try:
-                    neural_networks.append(pickle.load(store))
+                    neural_network: NeuralNetwork = pickle.load(store)
                 except EOFError:
                     break
+                if dtype is not None and neural_network.dtype is not dtype:
+                    neural_network = neural_network.astype(dtype)
+                neural_networks.append(neural_network)
                 counter += 1
         return neural_networks
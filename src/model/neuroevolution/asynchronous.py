@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, Future
+from multiprocessing import get_context, get_all_start_methods
+from types import TracebackType
+from typing import List, Optional, Type
+
+from model.environment.environment import Environment
+from model.neural_network.neural_network import NeuralNetwork
+from model.track.compiled import TrackSource, load_track
+from model.track.track import Track
+from view.silent_environment import SilentEnvironment
+
+_track: Optional[Track] = None
+"""
+Track the networks are evaluated on in a worker process,
+inherited from the parent when workers are forked.
+"""
+
+
+def _init_worker(track: Optional[TrackSource]) -> None:
+    global _track
+    if track is not None:
+        _track = load_track(track)
+        _track.precompute_geometry()
+
+
+def _evaluate(networks: List[NeuralNetwork]) -> List[float]:
+    assert _track is not None, "worker was not initialized with a track"
+    adaptations = Environment.compute_adaptations(
+        SilentEnvironment(_track), {"children": networks}
+    )
+    return list(adaptations["children"])
+
+
+class AsyncEvaluator:
+    """
+    Pool of worker processes evaluating small batches of networks on a track.
+
+    Used by `Neuroevolution.evolve_steady_state`. Cars don't interact, so a network
+    gets the same adaptation no matter which batch it's evaluated in.
+    """
+
+    def __init__(
+        self,
+        track: TrackSource,
+        processes: Optional[int] = None,
+        batch_size: int = 2,
+        batches_per_process: int = 2,
+    ) -> None:
+        """
+        Args:
+            track (List or str): Points of the track, as in resources/tracks.json,
+                or a directory of the compiled track, which workers then share.
+            processes (int, optional): Size of the pool, defaults to the CPU count.
+            batch_size (int): Amount of networks sent to a worker at once.
+            batches_per_process (int): Amount of batches queued for every worker,
+                more than one keeps workers busy while results are being handled.
+
+        Raises:
+            ValueError: If any of the amounts is not positive.
+        """
+        processes = processes or os.cpu_count() or 1
+        if min(processes, batch_size, batches_per_process) < 1:
+            raise ValueError("Processes, batch size and batches count must be positive")
+        self.batch_size = batch_size
+        self.capacity = processes * batches_per_process
+        """
+        Amount of batches which can be evaluated or queued at once.
+        """
+
+        global _track
+        if "fork" in get_all_start_methods():
+            _track = load_track(track)
+            _track.precompute_geometry()
+            start_method, init_track = "fork", None
+        else:
+            start_method, init_track = "spawn", track
+        self._executor = ProcessPoolExecutor(
+            processes,
+            mp_context=get_context(start_method),
+            initializer=_init_worker,
+            initargs=(init_track,),
+        )
+
+    def submit(self, networks: List[NeuralNetwork]) -> "Future[List[float]]":
+        """Starts evaluation of the networks, returns their future adaptations."""
+        return self._executor.submit(_evaluate, networks)
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> "AsyncEvaluator":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
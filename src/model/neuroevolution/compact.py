@@ -0,0 +1,107 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork, Topology
+
+
+class CompactPopulation:
+    """
+    Networks of a population in one contiguous matrix, a row of parameters per individual.
+
+    An individual is just its index, the row of its parameters and its adaptation.
+    Networks handed out by `network` are views of the rows, all of them sharing
+    one `Topology`, so the population costs little more than its weights.
+    """
+
+    __slots__ = ("topology", "parameters", "adaptations")
+
+    def __init__(
+        self,
+        topology: Topology,
+        size: int,
+        dtype: type = np.float64,
+        randomize: bool = True,
+    ) -> None:
+        """
+        Args:
+            topology (Topology): Shape of the networks.
+            size (int): Amount of individuals.
+            dtype (type): Type of weights and biases.
+            randomize (bool): Whether the networks are initialized like new
+                `NeuralNetwork`s, they're left uninitialized otherwise.
+        """
+        self.topology = topology
+        self.parameters: np.ndarray = np.empty((size, topology.size), dtype)
+        self.adaptations = np.full(size, np.nan)
+        """
+        Adaptations of the individuals, NaN until they're evaluated.
+        """
+        if randomize:
+            for row in self.parameters:
+                topology.randomize(row)
+
+    @classmethod
+    def init_with_neural_network_info(
+        cls, layers: List[LayerInfo], output_neurons_count: int, size: int
+    ) -> "CompactPopulation":
+        return cls(Topology.shared(tuple(layers), output_neurons_count), size)
+
+    @classmethod
+    def from_networks(
+        cls,
+        networks: Sequence[NeuralNetwork],
+        adaptations: Optional[Sequence[float]] = None,
+    ) -> "CompactPopulation":
+        """
+        Copies parameters of networks of the same topology into a new population.
+
+        Raises:
+            ValueError: If there are no networks or their topologies differ.
+        """
+        if not networks:
+            raise ValueError("There are no networks")
+        topology = networks[0].topology
+        if any(network.topology != topology for network in networks):
+            raise ValueError("All networks must have the same topology")
+        population = cls(topology, len(networks), networks[0].dtype, randomize=False)
+        for row, network in zip(population.parameters, networks):
+            row[...] = network.parameters
+        if adaptations is not None:
+            population.adaptations[...] = adaptations
+        return population
+
+    def __len__(self) -> int:
+        return len(self.parameters)
+
+    def network(self, index: int) -> NeuralNetwork:
+        """Network of an individual, changing it changes the population."""
+        return NeuralNetwork.from_parameters(self.topology, self.parameters[index])
+
+    def networks(self) -> List[NeuralNetwork]:
+        return [self.network(index) for index in range(len(self))]
+
+    def assign(self, index: int, network: NeuralNetwork) -> None:
+        """Copies parameters of a network to an individual."""
+        if network.topology != self.topology:
+            raise ValueError("The network has a different topology")
+        self.parameters[index] = network.parameters
+
+    def best(self, count: int) -> np.ndarray:
+        """Indexes of the `count` individuals with the highest adaptations, best first."""
+        order = np.argsort(-self.adaptations, kind="stable")
+        return np.asarray(order[:count])
+
+    def take(self, indexes: Sequence[int]) -> "CompactPopulation":
+        """New population of copies of the given individuals, e.g. the selected parents."""
+        population = CompactPopulation(
+            self.topology, len(indexes), self.parameters.dtype.type, randomize=False
+        )
+        np.take(self.parameters, indexes, axis=0, out=population.parameters)
+        population.adaptations[...] = self.adaptations[indexes]
+        return population
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the parameters and adaptations in bytes."""
+        return int(self.parameters.nbytes + self.adaptations.nbytes)
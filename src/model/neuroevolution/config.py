@@ -0,0 +1,161 @@
+from dataclasses import dataclass, fields
+from typing import Tuple, Dict, Any
+
+import numpy as np
+
+from model.neuroevolution.individual import AdultIndividual, ChildIndividual
+from model.neuroevolution.selection import selection_schemes
+
+PRECISIONS: Dict[str, type] = {
+    "float64": np.float64,
+    "float32": np.float32,
+}
+
+
+@dataclass(frozen=True)
+class NeuroevolutionConfig:
+    """
+    Hyperparameters of the genetic algorithm.
+
+    Raises:
+        ValueError: If any of the values is out of its range.
+    """
+
+    individuals: int = 70
+    """
+    Amount of individuals per generation.
+    """
+
+    golden_tickets: int = 1
+    """
+    Amount of individuals allowed to reproduce for sure.
+    """
+
+    max_parents: int = 1
+    """
+    Maximal parents count.
+    """
+
+    selection_exponent: float = 3.0
+    """
+    Probability of reproduction for every individual without golden ticket is
+    (adaptation / best adaptation) raised to this power.
+    """
+
+    selection: str = "proportional"
+    """
+    Scheme choosing parents without golden tickets, one of `selection_schemes`:
+    "proportional" (uses selection_exponent), "truncation", "tournament",
+    "rank" or "sus" (stochastic universal sampling).
+    """
+
+    tournament_size: int = 3
+    """
+    Amount of individuals competing for every parent in the tournament selection.
+    """
+
+    mutation_chance: float = 1.0
+    """
+    Mutation chance for every child.
+    """
+
+    reproduction_rate: Tuple[int, ...] = (1, 1, 1, 0)
+    """
+    Proportional chance for reproduction by respectively:
+    1. swapping single weight,
+    2. swapping single bias,
+    3. swapping single neuron,
+    4. swapping entire layer.
+    """
+
+    mutation_rate: Tuple[int, ...] = (10, 3, 0, 0, 5, 1, 0, 0)
+    """
+    Proportional chance for mutation by respectively (apply only to children with mutation):
+    1. generate random value for single weight, <-- makes diversity
+    2. generate random value for single bias, <-- makes diversity
+    3. shuffle biases in one layer
+    4. change the sign of single weight, <-- very poor, useless
+    5. multiply all weights of single neuron by numbers in range 0.1 to 10,
+    ^^ maintains individuals value, enhance good individuals
+    6. random value for all weights of single neuron,
+    ^^ makes strong diversity, useful in case of stagnancy
+    7. shuffle all weights for single neuron.
+    8. Combination of 5. and 7.
+    """
+
+    precision: str = "float64"
+    """
+    Type of the networks' weights and of the numbers used for inference,
+    "float64" or "float32" (half the memory and bandwidth, see the precision benchmark).
+    """
+
+    def __post_init__(self) -> None:
+        if self.individuals < 2:
+            raise ValueError("There must be at least two individuals")
+        if not 1 <= self.max_parents <= self.individuals:
+            raise ValueError("Parents count must be between 1 and individuals count")
+        if not 1 <= self.golden_tickets <= self.max_parents:
+            raise ValueError("Golden tickets count must be between 1 and parents count")
+        if self.selection_exponent < 0:
+            raise ValueError("Selection exponent must not be negative")
+        if self.selection not in selection_schemes:
+            raise ValueError(
+                f"Selection must be one of: {', '.join(selection_schemes)}, "
+                f"got {self.selection}"
+            )
+        if self.tournament_size < 1:
+            raise ValueError("Tournament size must be positive")
+        if not 0.0 <= self.mutation_chance <= 1.0:
+            raise ValueError("Mutation chance must be between 0 and 1")
+        if self.precision not in PRECISIONS:
+            raise ValueError(
+                f"Precision must be one of: {', '.join(PRECISIONS)}, got {self.precision}"
+            )
+        self._check_rates(
+            "reproduction",
+            self.reproduction_rate,
+            AdultIndividual.available_reproductions,
+        )
+        self._check_rates(
+            "mutation", self.mutation_rate, ChildIndividual.available_mutations
+        )
+
+    @staticmethod
+    def _check_rates(name: str, rates: Tuple[int, ...], operators: Any) -> None:
+        if len(rates) != len(operators):
+            raise ValueError(
+                f"There must be exactly {len(operators)} {name} rates, got {len(rates)}"
+            )
+        if any(rate < 0 for rate in rates) or sum(rates) <= 0:
+            raise ValueError(
+                f"{name.capitalize()} rates must not be negative "
+                "and at least one of them must be positive"
+            )
+
+    @property
+    def dtype(self) -> type:
+        return PRECISIONS[self.precision]
+
+    def reproduction_probabilities(self) -> np.ndarray:
+        return np.array(self.reproduction_rate) / sum(self.reproduction_rate)
+
+    def mutation_probabilities(self) -> np.ndarray:
+        return np.array(self.mutation_rate) / sum(self.mutation_rate)
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "NeuroevolutionConfig":
+        """Creates a config from e.g. parsed JSON, unknown keys are an error."""
+        known = {f.name for f in fields(cls)}
+        if unknown := set(values) - known:
+            raise ValueError(f"Unknown hyperparameters: {', '.join(sorted(unknown))}")
+        values = {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in values.items()
+        }
+        return cls(**values)
+
+
+DEFAULT_CONFIG = NeuroevolutionConfig()
+"""
+Default hyperparameters, shared since configs are immutable.
+"""
@@ -5,11 +5,13 @@ from typing import Tuple, ClassVar, List, Callable, cast
 import numpy as np
 
 from model.neural_network.neural_network import NeuralNetwork, Layer
-from utils import swap_same_index, swap_numpy_same_index, numpy_random_index
+from utils import swap_numpy_same_index, numpy_random_index
 
 
 @dataclass
 class ChildIndividual:
+    __slots__ = ("neural_network",)
+
     neural_network: NeuralNetwork
 
     available_mutations: ClassVar[List[Callable[["ChildIndividual"], None]]]
@@ -124,9 +126,10 @@ class ChildIndividual:
         """
         random_layer = individual.get_random_layer()
         random_neuron_index = np.random.randint(0, random_layer.weights.shape[0])
-        multipliers = np.random.uniform(
-            low=0.1, high=10, size=(random_layer.weights.shape[1])
-        )
+        # cast so that reduced precision weights aren't multiplied in float64
+        multipliers = np.asarray(
+            np.random.uniform(low=0.1, high=10, size=(random_layer.weights.shape[1]))
+        ).astype(random_layer.weights.dtype)
         random_layer.weights[random_neuron_index] *= multipliers
 
     @staticmethod
@@ -184,6 +187,8 @@ ChildIndividual.available_mutations = [
 
 @dataclass
 class AdultIndividual:
+    __slots__ = ("neural_network", "adaptation")
+
     neural_network: NeuralNetwork
     adaptation: float
 
@@ -312,10 +317,15 @@ class AdultIndividual:
         child_2 = ChildIndividual(deepcopy(father.neural_network))
 
         for _ in range(layers_to_swap):
-            layer_index = child_1.get_random_layer_index()
-            child_1_rand_layers = child_1.neural_network.hidden_layers
-            child_2_rand_layers = child_2.neural_network.hidden_layers
-            swap_same_index(child_1_rand_layers, child_2_rand_layers, layer_index)
+            layer_1, layer_2 = AdultIndividual._get_random_layers_from_children(
+                child_1, child_2
+            )
+            # layers are views into the networks' parameters, their contents are swapped
+            for array_1, array_2 in (
+                (layer_1.weights, layer_2.weights),
+                (layer_1.biases, layer_2.biases),
+            ):
+                array_1[...], array_2[...] = array_2, array_1.copy()
 
         return child_1, child_2
 
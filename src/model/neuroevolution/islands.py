@@ -0,0 +1,401 @@
+import io
+import queue
+import time
+import traceback
+from abc import ABC, abstractmethod
+from contextlib import redirect_stdout
+from copy import deepcopy
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import List, Dict, Optional, Any, Tuple, Callable
+
+import numpy as np
+
+from model.environment.environment import Environment
+from model.neural_network.neural_network import LayerInfo
+from model.neural_network.neural_network_store import NeuralNetworkStore
+from model.neuroevolution.config import DEFAULT_CONFIG, NeuroevolutionConfig
+from model.neuroevolution.individual import AdultIndividual
+from model.neuroevolution.neuroevolution import Neuroevolution
+from model.track.compiled import TrackSource, load_track
+from view.silent_environment import SilentEnvironment
+
+EnvironmentFactory = Callable[[TrackSource], Environment[None, Any]]
+"""
+Creates the environment of an island from the track, in the island's process.
+"""
+
+_POLL_INTERVAL = 1.0
+"""
+Seconds the driver waits for results before checking that the islands are alive.
+"""
+
+
+class MigrationTransport(ABC):
+    """Delivers migrating individuals between islands."""
+
+    @abstractmethod
+    def send(self, destination: int, migrants: List[AdultIndividual]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def receive(self, island: int) -> List[AdultIndividual]:
+        """Returns all migrants which arrived at the island so far, without waiting."""
+        raise NotImplementedError
+
+
+class LocalTransport(MigrationTransport):
+    """
+    In-process stand-in for QueueTransport.
+
+    Migrants are copied on sending, just like they would be by pickling.
+    """
+
+    def __init__(self, islands: int) -> None:
+        self._inboxes: List[List[AdultIndividual]] = [[] for _ in range(islands)]
+
+    def send(self, destination: int, migrants: List[AdultIndividual]) -> None:
+        self._inboxes[destination].extend(deepcopy(migrants))
+
+    def receive(self, island: int) -> List[AdultIndividual]:
+        migrants, self._inboxes[island] = self._inboxes[island], []
+        return migrants
+
+
+class QueueTransport(MigrationTransport):
+    """Transport between processes, one multiprocessing queue per island."""
+
+    def __init__(self, queues: List[Any]) -> None:
+        self._queues = queues
+
+    def send(self, destination: int, migrants: List[AdultIndividual]) -> None:
+        self._queues[destination].put(migrants)
+
+    def receive(self, island: int) -> List[AdultIndividual]:
+        migrants: List[AdultIndividual] = []
+        while True:
+            try:
+                migrants.extend(self._queues[island].get_nowait())
+            except queue.Empty:
+                return migrants
+
+    def drain(self) -> None:
+        for island in range(len(self._queues)):
+            self.receive(island)
+
+
+@dataclass
+class IslandStats:
+    island: int
+    epoch: int
+    generation: int
+    best_adaptation: float
+    mean_adaptation: float
+    immigrants: int
+    time: float
+
+
+class Island:
+    """
+    A population evolving on its own, exchanging its best individuals with
+    the next island in a ring every epoch.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        islands_count: int,
+        neuroevolution: Neuroevolution,
+        environment: Environment[None, Any],
+        transport: MigrationTransport,
+        migrants: int,
+    ) -> None:
+        self.index = index
+        self.islands_count = islands_count
+        self.neuroevolution = neuroevolution
+        self.environment = environment
+        self.transport = transport
+        self.migrants = migrants
+        self.generation = 0
+        self.epoch = 0
+
+    def run_epoch(self, generations: int) -> IslandStats:
+        start = time.perf_counter()
+        immigrants = self.transport.receive(self.index)
+        self.neuroevolution.immigrate(immigrants)
+
+        with redirect_stdout(io.StringIO()):
+            for _ in range(generations):
+                self.neuroevolution.evolve(self.environment, False)
+        self.generation += generations
+        self.epoch += 1
+
+        if self.islands_count > 1:
+            self.transport.send(
+                (self.index + 1) % self.islands_count,
+                self.neuroevolution.emigrants(self.migrants),
+            )
+
+        adaptations = [i.adaptation for i in self.neuroevolution.individuals]
+        return IslandStats(
+            self.index,
+            self.epoch,
+            self.generation,
+            max(adaptations),
+            float(np.mean(adaptations)),
+            len(immigrants),
+            time.perf_counter() - start,
+        )
+
+
+@dataclass(frozen=True)
+class IslandModelSettings:
+    islands: int = 4
+    epochs: int = 10
+    generations_per_epoch: int = 5
+    migrants: int = 2
+    """
+    Amount of the best individuals sent to the next island after every epoch.
+    """
+    checkpoint_every: int = 0
+    """
+    Stores all populations every that many epochs, 0 to store only the last ones.
+    """
+    checkpoint_directory: str = "store/islands"
+    seed: Optional[int] = None
+
+
+DEFAULT_SETTINGS = IslandModelSettings()
+
+
+def silent_environment(track: TrackSource) -> Environment[None, Any]:
+    return SilentEnvironment(load_track(track))
+
+
+def _make_island(
+    index: int,
+    settings: IslandModelSettings,
+    track: TrackSource,
+    layers_infos: List[LayerInfo],
+    config: NeuroevolutionConfig,
+    transport: MigrationTransport,
+    make_environment: EnvironmentFactory,
+) -> Island:
+    if settings.seed is not None:
+        np.random.seed(settings.seed + index)
+    environment = make_environment(track)
+    neuroevolution = Neuroevolution.init_with_neural_network_info(
+        layers_infos, 2, config
+    )
+    return Island(
+        index,
+        settings.islands,
+        neuroevolution,
+        environment,
+        transport,
+        settings.migrants,
+    )
+
+
+def _wants_checkpoint(settings: IslandModelSettings, epoch: int) -> bool:
+    if epoch == settings.epochs:
+        return True
+    return settings.checkpoint_every > 0 and epoch % settings.checkpoint_every == 0
+
+
+def _island_process(
+    index: int,
+    settings: IslandModelSettings,
+    track: TrackSource,
+    layers_infos: List[LayerInfo],
+    config: NeuroevolutionConfig,
+    make_environment: EnvironmentFactory,
+    migration_queues: List[Any],
+    results: Any,
+) -> None:
+    """
+    Evolves an island, putting ("stats", stats, population) on the results queue
+    after every epoch, or ("error", index, traceback) if the island failed.
+    """
+    try:
+        transport = QueueTransport(migration_queues)
+        island = _make_island(
+            index, settings, track, layers_infos, config, transport, make_environment
+        )
+        for _ in range(settings.epochs):
+            stats = island.run_epoch(settings.generations_per_epoch)
+            population = None
+            if _wants_checkpoint(settings, island.epoch):
+                population = island.neuroevolution.individuals
+            results.put(("stats", stats, population))
+    except Exception:
+        results.put(("error", index, traceback.format_exc()))
+    finally:
+        # migrants left for islands which already finished are never going to be read
+        for migration_queue in migration_queues:
+            migration_queue.cancel_join_thread()
+
+
+class IslandDriver:
+    """
+    Runs several populations (islands) evolving in the same environment,
+    every island in its own process, aggregating their statistics and checkpoints.
+    """
+
+    def __init__(
+        self,
+        track: TrackSource,
+        layers_infos: List[LayerInfo],
+        config: NeuroevolutionConfig = DEFAULT_CONFIG,
+        settings: IslandModelSettings = DEFAULT_SETTINGS,
+        on_stats: Optional[Callable[[IslandStats], None]] = None,
+        make_environment: EnvironmentFactory = silent_environment,
+    ) -> None:
+        """
+        Args:
+            make_environment (Callable): Creates environments of the islands,
+                it must be picklable (e.g. a module-level function) to be sent
+                to their processes.
+        """
+        self.track = track
+        self.make_environment = make_environment
+        self.layers_infos = layers_infos
+        self.config = config
+        self.settings = settings
+        self.on_stats = on_stats
+        self.stats: List[IslandStats] = []
+        self.populations: Dict[int, List[AdultIndividual]] = {}
+        """
+        Last checkpointed population of every island.
+        """
+
+    def run(self) -> List[AdultIndividual]:
+        """
+        Evolves the islands in separate processes.
+
+        Returns:
+            Best individuals of all islands, sorted by adaptation.
+
+        Raises:
+            RuntimeError: If an island failed or its process died.
+        """
+        context = get_context()
+        migration_queues = [context.Queue() for _ in range(self.settings.islands)]
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=_island_process,
+                args=(
+                    index,
+                    self.settings,
+                    self.track,
+                    self.layers_infos,
+                    self.config,
+                    self.make_environment,
+                    migration_queues,
+                    results,
+                ),
+                daemon=True,
+            )
+            for index in range(self.settings.islands)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            received = 0
+            while received < self.settings.islands * self.settings.epochs:
+                ended = all(process.exitcode is not None for process in processes)
+                try:
+                    kind, *message = results.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    self._check_alive(processes, ended)
+                    continue
+                if kind == "error":
+                    index, error = message
+                    raise RuntimeError(f"Island {index} failed:\n{error}")
+                self._handle(*message)
+                received += 1
+            QueueTransport(migration_queues).drain()
+            for process in processes:
+                process.join()
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+        return self.best()
+
+    @staticmethod
+    def _check_alive(processes: List[Any], ended: bool) -> None:
+        """
+        Called when no results arrived for a while.
+
+        Args:
+            ended (bool): Whether all processes had ended before waiting, so that
+                anything they sent has arrived already.
+
+        Raises:
+            RuntimeError: If an island's process was killed or crashed,
+                or all of them ended without sending all results.
+        """
+        for index, process in enumerate(processes):
+            if process.exitcode:
+                raise RuntimeError(
+                    f"Island {index} died with exit code {process.exitcode}"
+                )
+        if ended:
+            raise RuntimeError("Islands ended without sending all of their results")
+
+    def run_locally(self) -> List[AdultIndividual]:
+        """
+        Evolves the islands one after another in this process with LocalTransport.
+
+        Meant for testing and debugging, migrants always arrive
+        in the same order here.
+        """
+        transport = LocalTransport(self.settings.islands)
+        islands = [
+            _make_island(
+                index,
+                self.settings,
+                self.track,
+                self.layers_infos,
+                self.config,
+                transport,
+                self.make_environment,
+            )
+            for index in range(self.settings.islands)
+        ]
+        for _ in range(self.settings.epochs):
+            for island in islands:
+                stats = island.run_epoch(self.settings.generations_per_epoch)
+                population = None
+                if _wants_checkpoint(self.settings, island.epoch):
+                    population = island.neuroevolution.individuals
+                self._handle(stats, population)
+        return self.best()
+
+    def best(self) -> List[AdultIndividual]:
+        individuals = [i for p in self.populations.values() for i in p]
+        return sorted(individuals, key=lambda i: i.adaptation, reverse=True)
+
+    def _handle(
+        self, stats: IslandStats, population: Optional[List[AdultIndividual]]
+    ) -> None:
+        self.stats.append(stats)
+        if self.on_stats is not None:
+            self.on_stats(stats)
+        if population is not None:
+            self.populations[stats.island] = population
+            NeuralNetworkStore.store(
+                [individual.neural_network for individual in population],
+                f"island{stats.island}_epoch{stats.epoch}",
+                self.settings.checkpoint_directory,
+            )
+
+    def epoch_summary(self, epoch: int) -> Tuple[float, float]:
+        """Returns the best and mean adaptation over all islands in the given epoch."""
+        epoch_stats = [s for s in self.stats if s.epoch == epoch]
+        return (
+            max(s.best_adaptation for s in epoch_stats),
+            float(np.mean([s.mean_adaptation for s in epoch_stats])),
+        )
@@ -1,11 +1,17 @@
-from typing import Tuple, List, Generator, TypeVar, Any
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import List, Generator, TypeVar, Any, Dict, Optional, TYPE_CHECKING
 
 import numpy as np
 
 import utils
 from model.environment.environment import Environment
 from model.neural_network.neural_network import NeuralNetwork, LayerInfo
+from model.neuroevolution.config import DEFAULT_CONFIG, NeuroevolutionConfig
 from model.neuroevolution.individual import AdultIndividual, ChildIndividual
+from model.neuroevolution.selection import selection_schemes
+
+if TYPE_CHECKING:
+    from model.neuroevolution.asynchronous import AsyncEvaluator
 
 T = TypeVar("T")
 
@@ -20,124 +26,107 @@ class Neuroevolution:
     Iteration number.
     """
 
-    _INDIVIDUALS: int = 70
-    """
-    Amount of individuals per generation.
-    """
-
-    _GOLDEN_TICKETS: int = 1
-    """
-    Amount of individuals allowed to reproduce for sure.
-    """
-
-    _MAX_PARENTS: int = 1
-    """
-    Maximal parents count.
-    """
-
-    @staticmethod
-    def _reproduction_probability(
-        individual: AdultIndividual, bound_adaptation: float
-    ) -> float:
-        """
-        Probability of reproduction for every given individual
-        without golden ticket according to bound adaptation.
-        """
-        return (individual.adaptation / bound_adaptation) ** 3
-
-    _MUTATION_CHANCE: float = 1.0
-    """
-    Mutation chance for every child.
-    """
-
-    _REPRODUCTION_RATE: Tuple[int, ...] = (1, 1, 1, 0)
-    """
-    Proportional chance for reproduction by respectively:
-    1. swapping single weight,
-    2. swapping single bias,
-    3. swapping single neuron,
-    4. swapping entire layer.
-    """
-
-    _MUTATION_RATE: Tuple[int, ...] = (10, 3, 0, 0, 5, 1, 0, 0)
-    """
-    Proportional chance for mutation by respectively (apply only to children with mutation):
-    1. generate random value for single weight, <-- makes diversity
-    2. generate random value for single bias, <-- makes diversity
-    3. shuffle biases in one layer
-    4. change the sign of single weight, <-- very poor, useless
-    5. multiply all weights of single neuron by numbers in range 0.1 to 10,
-    ^^ maintains individuals value, enhance good individuals
-    6. random value for all weights of single neuron,
-    ^^ makes strong diversity, useful in case of stagnancy
-    7. shuffle all weights for single neuron.
-    8. Combination of 5. and 7.
-    """
-
-    _REPRODUCTION_PROBABILITIES = np.array(_REPRODUCTION_RATE) / sum(_REPRODUCTION_RATE)
-    _MUTATION_PROBABILITIES = np.array(_MUTATION_RATE) / sum(_MUTATION_RATE)
-
-    def __init__(self, networks: List[NeuralNetwork]) -> None:
+    def __init__(
+        self,
+        networks: List[NeuralNetwork],
+        config: NeuroevolutionConfig = DEFAULT_CONFIG,
+    ) -> None:
+        self.config = config
+        self._reproduction_probabilities = config.reproduction_probabilities()
+        self._mutation_probabilities = config.mutation_probabilities()
         self._new_generation: List[ChildIndividual] = [
             ChildIndividual(nn) for nn in networks
         ]
         self.individuals: List[AdultIndividual] = []
         self._parents: List[AdultIndividual] = []
+        self._evaluating: Dict["Future[List[float]]", List[ChildIndividual]] = {}
+        """
+        Children being evaluated by steady state evolution.
+        """
 
     @classmethod
     def init_with_neural_network_info(
-        cls, layers_infos: List[LayerInfo], output_neurons: int,
+        cls,
+        layers_infos: List[LayerInfo],
+        output_neurons: int,
+        config: NeuroevolutionConfig = DEFAULT_CONFIG,
     ) -> "Neuroevolution":
         return cls(
             [
-                NeuralNetwork(layers_infos, output_neurons)
-                for _ in range(cls._INDIVIDUALS)
+                NeuralNetwork(layers_infos, output_neurons, config.dtype)
+                for _ in range(config.individuals)
             ],
+            config,
         )
 
-    def _sort_individuals_and_kill_unnecessary(self) -> None:
-        self.individuals.sort(
-            key=lambda individual: individual.adaptation, reverse=True
+    def _adaptations(self) -> np.ndarray:
+        return np.fromiter(
+            (individual.adaptation for individual in self.individuals),
+            dtype=float,
+            count=len(self.individuals),
         )
-        self.individuals = self.individuals[: self._INDIVIDUALS]
-
-    def _selection(self) -> List[AdultIndividual]:
-        bound_adaptation = self.individuals[0].adaptation
-        parents = self.individuals[: self._GOLDEN_TICKETS]
-
-        for individual in self.individuals[self._GOLDEN_TICKETS :]:
-            if np.random.rand() < self._reproduction_probability(
-                individual, bound_adaptation
-            ):
-                parents.append(individual)
-                if len(parents) >= self._MAX_PARENTS:
-                    break
 
-        return parents
+    def _sort_individuals_and_kill_unnecessary(self) -> None:
+        """
+        Keeps the best individuals sorted from the best one, individuals with equal
+        adaptations stay in their order.
+        """
+        adaptations = self._adaptations()
+        kept = self.config.individuals
+        if len(adaptations) > kept:
+            # the worst adaptation kept, found without sorting all of them
+            threshold = np.partition(adaptations, len(adaptations) - kept)[
+                len(adaptations) - kept
+            ]
+            better = np.flatnonzero(adaptations > threshold)
+            equal = np.flatnonzero(adaptations == threshold)[: kept - len(better)]
+            top = np.sort(np.concatenate([better, equal]))
+        else:
+            top = np.arange(len(adaptations))
+        order = top[np.argsort(-adaptations[top], kind="stable")]
+        self.individuals = [self.individuals[i] for i in order]
 
-    def _reproduction(self, parents: List[AdultIndividual]) -> List[ChildIndividual]:
-        children_to_make = self._INDIVIDUALS - len(parents)
+    def _selection(self) -> List[AdultIndividual]:
+        golden_tickets = min(self.config.golden_tickets, len(self.individuals))
+        chosen = selection_schemes[self.config.selection].select(
+            self._adaptations(),
+            golden_tickets,
+            self.config.max_parents - golden_tickets,
+            self.config,
+        )
+        return self.individuals[:golden_tickets] + [self.individuals[i] for i in chosen]
+
+    def _reproduction(
+        self, parents: List[AdultIndividual], children_to_make: Optional[int] = None
+    ) -> List[ChildIndividual]:
+        if children_to_make is None:
+            children_to_make = self.config.individuals - len(parents)
+        pairs = (children_to_make + 1) // 2
+        # all couples and the ways they reproduce are drawn at once
+        couples = np.random.randint(len(parents), size=(pairs, 2))
+        reproductions = np.random.choice(
+            len(AdultIndividual.available_reproductions),
+            size=pairs,
+            p=self._reproduction_probabilities,
+        )
         children: List[ChildIndividual] = []
-
-        while len(children) < children_to_make:
-            mother, father = np.random.choice(parents, size=2)
-            daughter, son = np.random.choice(
-                AdultIndividual.available_reproductions,
-                p=self._REPRODUCTION_PROBABILITIES,
-            )(mother, father)
-
-            children.append(daughter)
-            if len(children) < children_to_make:
-                children.append(son)
-
-        return children
+        for (mother, father), reproduction in zip(couples, reproductions):
+            children.extend(
+                AdultIndividual.available_reproductions[reproduction](
+                    parents[mother], parents[father]
+                )
+            )
+        return children[:children_to_make]
 
     def _mutation(self, individuals: List[ChildIndividual]) -> List[ChildIndividual]:
-        for individual in individuals:
-            if np.random.rand() < self._MUTATION_CHANCE:
-                np.random.choice(
-                    ChildIndividual.available_mutations, p=self._MUTATION_PROBABILITIES
-                )(individual)
+        mutated = np.random.rand(len(individuals)) < self.config.mutation_chance
+        mutations = np.random.choice(
+            len(ChildIndividual.available_mutations),
+            size=len(individuals),
+            p=self._mutation_probabilities,
+        )
+        for index in np.flatnonzero(mutated):
+            ChildIndividual.available_mutations[mutations[index]](individuals[index])
         return individuals
 
     def generate_evolution(
@@ -182,3 +171,78 @@ class Neuroevolution:
 
     def evolve(self, environment: Environment[None, Any], with_parents: bool) -> None:
         return utils.generator_value(self.generate_evolution(environment, with_parents))
+
+    def evolve_steady_state(
+        self, evaluator: "AsyncEvaluator", evaluations: Optional[int] = None
+    ) -> None:
+        """
+        Asynchronous alternative to `evolve`, evaluates given amount of children
+        (by default the amount of individuals, so that it's worth one generation).
+
+        Children are evaluated in batches by the evaluator's workers. Every evaluated
+        batch joins the individuals right away, which are then sorted and trimmed
+        just like in `evolve`, and a new batch is bred out of the current individuals
+        and dispatched, so workers never wait for a whole generation to finish.
+        Batches which are still being evaluated on return are collected by the next call.
+
+        The first children evaluated are the ones of the current generation.
+
+        Args:
+            evaluator (AsyncEvaluator): Pool evaluating children in the environment.
+            evaluations (int, optional): Amount of children to evaluate.
+        """
+        print(f"Iteration: {self._iteration_counter}")
+        self._iteration_counter += 1
+        if evaluations is None:
+            evaluations = self.config.individuals
+
+        self._dispatch(evaluator)
+        while evaluations > 0 and self._evaluating:
+            done, _ = wait(self._evaluating, return_when=FIRST_COMPLETED)
+            for future in done:
+                children = self._evaluating.pop(future)
+                self.individuals.extend(
+                    AdultIndividual(child.neural_network, adaptation)
+                    for child, adaptation in zip(children, future.result())
+                )
+                evaluations -= len(children)
+            self._sort_individuals_and_kill_unnecessary()
+            self._dispatch(evaluator)
+
+        self._parents = self._selection()
+        print(f"Best adaptation: {self._parents[0].adaptation}")
+
+    def _dispatch(self, evaluator: "AsyncEvaluator") -> None:
+        """Sends batches of children to the evaluator until it's fully loaded."""
+        while len(self._evaluating) < evaluator.capacity:
+            if self._new_generation:
+                batch = self._new_generation[: evaluator.batch_size]
+                del self._new_generation[: evaluator.batch_size]
+            elif self.individuals:
+                parents = self._selection()
+                batch = self._mutation(
+                    self._reproduction(parents, evaluator.batch_size)
+                )
+            else:
+                # nothing to breed from until the first results arrive
+                return
+            future = evaluator.submit([child.neural_network for child in batch])
+            self._evaluating[future] = batch
+
+    def emigrants(self, count: int) -> List[AdultIndividual]:
+        """Returns the best `count` individuals of the last evaluated generation."""
+        return self.individuals[:count]
+
+    def immigrate(self, migrants: List[AdultIndividual]) -> None:
+        """
+        Adds already evaluated individuals from another population.
+
+        Their adaptation is trusted, so they must have been evaluated in the same
+        environment. The next generation is bred again so they can become parents.
+        """
+        if not migrants:
+            return
+        self.individuals.extend(migrants)
+        self._sort_individuals_and_kill_unnecessary()
+        self._parents = self._selection()
+        self._new_generation = self._mutation(self._reproduction(self._parents))
@@ -0,0 +1,153 @@
+from abc import ABC, abstractmethod
+from typing import Dict, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from model.neuroevolution.config import NeuroevolutionConfig
+
+
+class SelectionScheme(ABC):
+    """
+    Chooses parents out of individuals given their adaptations, all at once.
+
+    Individuals with golden tickets (the first ones) always become parents,
+    schemes choose the rest out of the others.
+    """
+
+    @abstractmethod
+    def select(
+        self,
+        adaptations: np.ndarray,
+        golden_tickets: int,
+        count: int,
+        config: "NeuroevolutionConfig",
+    ) -> np.ndarray:
+        """
+        Args:
+            adaptations (numpy.ndarray): Adaptations of all individuals,
+                sorted from the best one.
+            golden_tickets (int): Amount of the best individuals which are already parents.
+            count (int): Amount of other parents to choose, at most.
+            config (NeuroevolutionConfig): Parameters of the schemes.
+
+        Returns:
+            Indexes of the chosen individuals, all at least `golden_tickets`,
+            in the order of adaptations.
+        """
+        raise NotImplementedError
+
+
+class Proportional(SelectionScheme):
+    """
+    Every individual in turn becomes a parent with probability
+    (adaptation / best adaptation) ** selection_exponent, until there are enough.
+    """
+
+    def select(
+        self,
+        adaptations: np.ndarray,
+        golden_tickets: int,
+        count: int,
+        config: "NeuroevolutionConfig",
+    ) -> np.ndarray:
+        candidates = adaptations[golden_tickets:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            probabilities = (candidates / adaptations[0]) ** config.selection_exponent
+        chosen = np.flatnonzero(np.random.rand(len(candidates)) < probabilities)
+        return np.asarray(chosen[:count] + golden_tickets)
+
+
+class Truncation(SelectionScheme):
+    """The best individuals become parents."""
+
+    def select(
+        self,
+        adaptations: np.ndarray,
+        golden_tickets: int,
+        count: int,
+        config: "NeuroevolutionConfig",
+    ) -> np.ndarray:
+        return np.arange(golden_tickets, min(golden_tickets + count, len(adaptations)))
+
+
+class Tournament(SelectionScheme):
+    """
+    Every parent is the best of `tournament_size` individuals drawn at random,
+    so the same individual may be chosen more than once.
+    """
+
+    def select(
+        self,
+        adaptations: np.ndarray,
+        golden_tickets: int,
+        count: int,
+        config: "NeuroevolutionConfig",
+    ) -> np.ndarray:
+        candidates = len(adaptations) - golden_tickets
+        if candidates <= 0:
+            return np.empty(0, dtype=int)
+        contestants = np.random.randint(
+            candidates, size=(count, config.tournament_size)
+        )
+        # adaptations are sorted, so the lowest index wins
+        return np.sort(contestants.min(axis=1)) + golden_tickets
+
+
+class Rank(SelectionScheme):
+    """
+    Parents are drawn without replacement with probabilities falling linearly with rank.
+    """
+
+    def select(
+        self,
+        adaptations: np.ndarray,
+        golden_tickets: int,
+        count: int,
+        config: "NeuroevolutionConfig",
+    ) -> np.ndarray:
+        candidates = len(adaptations) - golden_tickets
+        if count >= candidates:
+            return np.arange(golden_tickets, len(adaptations))
+        if count <= 0:
+            return np.empty(0, dtype=int)
+        weights = np.arange(candidates, 0, -1)
+        # weighted sampling without replacement, the largest keys u ** (1 / weight)
+        keys = np.log(np.random.rand(candidates)) / weights
+        chosen = np.argpartition(-keys, count - 1)[:count]
+        return np.sort(chosen) + golden_tickets
+
+
+class StochasticUniversal(SelectionScheme):
+    """
+    Fitness proportional sampling with evenly spaced pointers, so that every
+    individual is chosen close to its expected number of times.
+    """
+
+    def select(
+        self,
+        adaptations: np.ndarray,
+        golden_tickets: int,
+        count: int,
+        config: "NeuroevolutionConfig",
+    ) -> np.ndarray:
+        candidates = adaptations[golden_tickets:]
+        if count <= 0 or len(candidates) == 0:
+            return np.empty(0, dtype=int)
+        weights = np.cumsum(np.maximum(candidates, 0.0))
+        if weights[-1] <= 0:
+            weights = np.arange(1.0, len(candidates) + 1)
+        step = weights[-1] / count
+        pointers = (np.random.rand() + np.arange(count)) * step
+        chosen = np.searchsorted(weights, pointers, side="right")
+        selected: np.ndarray = np.minimum(chosen, len(candidates) - 1) + golden_tickets
+        return selected
+
+
+selection_schemes: Dict[str, SelectionScheme] = {
+    "proportional": Proportional(),
+    "truncation": Truncation(),
+    "tournament": Tournament(),
+    "rank": Rank(),
+    "sus": StochasticUniversal(),
+}
@@ -0,0 +1,140 @@
+import io
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, asdict
+from multiprocessing import get_context, get_all_start_methods
+from typing import List, Optional, Any, Tuple, Dict, Iterable
+
+import numpy as np
+
+from model.neural_network.neural_network import LayerInfo
+from model.neuroevolution.config import NeuroevolutionConfig
+from model.neuroevolution.neuroevolution import Neuroevolution
+from model.track.compiled import TrackSource, load_track
+from model.track.track import Track
+from view.silent_environment import SilentEnvironment
+
+_track: Optional[Track] = None
+"""
+Track shared by all configs evaluated in a worker process.
+
+When workers are forked it's compiled once by the parent and inherited,
+otherwise every worker compiles it once in its initializer.
+"""
+
+
+@dataclass
+class SweepResult:
+    config: NeuroevolutionConfig
+    best_adaptations: List[float]
+    """
+    Best adaptation in every generation.
+    """
+    time: float
+
+    @property
+    def best_adaptation(self) -> float:
+        return max(self.best_adaptations)
+
+
+def grid(**values: Iterable[Any]) -> List[NeuroevolutionConfig]:
+    """
+    Creates configs for every combination of given values.
+
+    Example:
+        grid(individuals=[70, 140], max_parents=[1, 4]) -> 4 configs
+    """
+    names = list(values)
+    return [
+        NeuroevolutionConfig.from_dict(dict(zip(names, combination)))
+        for combination in itertools.product(*values.values())
+    ]
+
+
+def _init_worker(track: Optional[TrackSource]) -> None:
+    global _track
+    if track is not None:
+        _track = load_track(track)
+        _track.precompute_geometry()
+
+
+def _evaluate_config(
+    job: Tuple[NeuroevolutionConfig, List[LayerInfo], int, Optional[int]],
+) -> SweepResult:
+    config, layers_infos, generations, seed = job
+    assert _track is not None, "worker was not initialized with a track"
+    if seed is not None:
+        np.random.seed(seed)
+
+    environment = SilentEnvironment(_track)
+    neuroevolution = Neuroevolution.init_with_neural_network_info(
+        layers_infos, 2, config
+    )
+    best_adaptations = []
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(generations):
+            neuroevolution.evolve(environment, False)
+            best_adaptations.append(neuroevolution.individuals[0].adaptation)
+    return SweepResult(config, best_adaptations, time.perf_counter() - start)
+
+
+def run_sweep(
+    configs: List[NeuroevolutionConfig],
+    track: TrackSource,
+    layers_infos: List[LayerInfo],
+    generations: int,
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> List[SweepResult]:
+    """
+    Evolves a population for every config concurrently in a process pool.
+
+    Args:
+        configs (List[NeuroevolutionConfig]): Configs to evaluate.
+        track (List or str): Points of the track, as in resources/tracks.json,
+            or a directory of the compiled track, which workers then share.
+        layers_infos (List[LayerInfo]): Layers of the evolved networks.
+        generations (int): Amount of generations evolved with every config.
+        processes (int, optional): Size of the pool, defaults to the CPU count.
+        seed (int, optional): Makes the results reproducible when given,
+            every config gets its own seed derived from it.
+
+    Returns:
+        Results in the order of the configs.
+    """
+    global _track
+    if "fork" in get_all_start_methods():
+        # compiled geometry is inherited by the workers instead of being rebuilt
+        _track = load_track(track)
+        _track.precompute_geometry()
+        start_method, init_track = "fork", None
+    else:
+        start_method, init_track = "spawn", track
+
+    jobs = [
+        (config, layers_infos, generations, None if seed is None else seed + i)
+        for i, config in enumerate(configs)
+    ]
+    with ProcessPoolExecutor(
+        processes,
+        mp_context=get_context(start_method),
+        initializer=_init_worker,
+        initargs=(init_track,),
+    ) as executor:
+        return list(executor.map(_evaluate_config, jobs))
+
+
+def report(results: List[SweepResult]) -> str:
+    """Formats results as a markdown table, the best configs first."""
+    results = sorted(results, key=lambda r: r.best_adaptation, reverse=True)
+    lines = ["| best | last | time [s] | config |", "|---|---|---|---|"]
+    for result in results:
+        config: Dict[str, Any] = asdict(result.config)
+        lines.append(
+            f"| {result.best_adaptation} | {result.best_adaptations[-1]} "
+            f"| {result.time:.1f} | {config} |"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,235 @@
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork, Topology
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    track TEXT NOT NULL,
+    started REAL NOT NULL,
+    topology TEXT NOT NULL,
+    dtype TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS networks (
+    run INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    track TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    fitness REAL NOT NULL,
+    parameters BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_track ON runs (track);
+CREATE INDEX IF NOT EXISTS networks_run_generation ON networks (run, generation);
+CREATE INDEX IF NOT EXISTS networks_fitness ON networks (fitness DESC);
+CREATE INDEX IF NOT EXISTS networks_track_fitness ON networks (track, fitness DESC);
+"""
+
+
+@dataclass
+class Run:
+    id: int
+    name: str
+    track: str
+    started: float
+    """
+    Time the run started at, in seconds since the epoch.
+    """
+    topology: Topology
+    dtype: type
+    """
+    Type of the stored weights.
+    """
+
+
+@dataclass
+class StoredNetwork:
+    run: Run
+    generation: int
+    fitness: float
+    parameters: bytes
+
+    @property
+    def network(self) -> NeuralNetwork:
+        parameters = np.frombuffer(self.parameters, self.run.dtype).copy()
+        return NeuralNetwork.from_parameters(self.run.topology, parameters)
+
+
+def _topology_json(topology: Topology) -> str:
+    layers = [[i.neurons_count, i.activation_function_name] for i in topology.layers]
+    return json.dumps({"layers": layers, "outputs": topology.output_neurons_count})
+
+
+def _topology(text: str) -> Topology:
+    value = json.loads(text)
+    layers = tuple(
+        LayerInfo(count, activation) for count, activation in value["layers"]
+    )
+    return Topology.shared(layers, value["outputs"])
+
+
+class RunHistory:
+    """
+    Networks and their fitness from evolution runs in an SQLite database.
+
+    Networks are stored per generation in a single transaction, their weights
+    as a blob of the contiguous parameters (float32 by default). Networks are
+    indexed by their run and generation, by their fitness and by their run's track
+    and fitness, so e.g. the best networks ever evolved on a track are found
+    without reading any other.
+    """
+
+    DEFAULT_FILE = "store/history.sqlite"
+
+    def __init__(self, file: str = DEFAULT_FILE) -> None:
+        """
+        Args:
+            file (str): Path of the database, it's created if it doesn't exist.
+        """
+        directory = os.path.dirname(file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = file
+        self._connection = sqlite3.connect(file)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(_SCHEMA)
+        self._runs: Dict[int, Run] = {}
+
+    def start_run(
+        self, name: str, track: str, topology: Topology, dtype: type = np.float32
+    ) -> Run:
+        """
+        Args:
+            name (str): Description of the run.
+            track (str): Name of the track the networks are evaluated on.
+            topology (Topology): Shape of the networks of the run.
+            dtype (type): Type to store weights as.
+        """
+        dtype_name = np.dtype(dtype).name
+        with self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (name, track, started, topology, dtype)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (name, track, time.time(), _topology_json(topology), dtype_name),
+            )
+        assert cursor.lastrowid is not None
+        return self.run(cursor.lastrowid)
+
+    def add_generation(
+        self,
+        run: Run,
+        generation: int,
+        networks: Sequence[NeuralNetwork],
+        adaptations: Sequence[float],
+    ) -> None:
+        """
+        Stores evaluated networks of a generation at once.
+
+        Raises:
+            ValueError: If the amounts of networks and adaptations differ
+                or a network has a topology different from the run's one.
+        """
+        if len(networks) != len(adaptations):
+            raise ValueError("Every network must have its adaptation")
+        rows = []
+        for network, adaptation in zip(networks, adaptations):
+            if network.topology != run.topology:
+                raise ValueError("The network's topology differs from the run's one")
+            blob = network.parameters.astype(run.dtype, copy=False).tobytes()
+            rows.append((run.id, run.track, generation, float(adaptation), blob))
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO networks (run, track, generation, fitness, parameters)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def run(self, run_id: int) -> Run:
+        """
+        Raises:
+            KeyError: If there is no such run.
+        """
+        if run_id not in self._runs:
+            row = self._connection.execute(
+                "SELECT id, name, track, started, topology, dtype FROM runs WHERE id = ?",
+                (run_id,),
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"There is no run {run_id}")
+            self._runs[run_id] = self._run(row)
+        return self._runs[run_id]
+
+    def runs(self, track: Optional[str] = None) -> List[Run]:
+        """Runs, on the given track only if it's given, oldest first."""
+        query = "SELECT id, name, track, started, topology, dtype FROM runs"
+        parameters: Tuple[str, ...] = ()
+        if track is not None:
+            query += " WHERE track = ?"
+            parameters = (track,)
+        return [self._run(row) for row in self._connection.execute(query, parameters)]
+
+    def top(
+        self,
+        count: int = 10,
+        track: Optional[str] = None,
+        run: Optional[Run] = None,
+        generation: Optional[int] = None,
+    ) -> List[StoredNetwork]:
+        """Networks with the highest fitness, all of them or of a track, run or generation."""
+        conditions: List[str] = []
+        parameters: List[object] = []
+        if track is not None:
+            conditions.append("track = ?")
+            parameters.append(track)
+        if run is not None:
+            conditions.append("run = ?")
+            parameters.append(run.id)
+        if generation is not None:
+            conditions.append("generation = ?")
+            parameters.append(generation)
+        query = "SELECT run, generation, fitness, parameters FROM networks"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY fitness DESC LIMIT ?"
+        rows = self._connection.execute(query, (*parameters, count)).fetchall()
+        return [
+            StoredNetwork(self.run(run_id), generation, fitness, blob)
+            for run_id, generation, fitness, blob in rows
+        ]
+
+    def progress(self, run: Run) -> List[Tuple[int, float, float]]:
+        """Best and mean fitness of every generation of a run."""
+        rows = self._connection.execute(
+            "SELECT generation, MAX(fitness), AVG(fitness) FROM networks"
+            " WHERE run = ? GROUP BY generation ORDER BY generation",
+            (run.id,),
+        ).fetchall()
+        return [(generation, best, mean) for generation, best, mean in rows]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @staticmethod
+    def _run(row: Tuple[int, str, str, float, str, str]) -> Run:
+        run_id, name, track, started, topology, dtype = row
+        return Run(
+            run_id, name, track, started, _topology(topology), np.dtype(dtype).type
+        )
@@ -1,13 +1,21 @@
 from dataclasses import dataclass
-from typing import List, Mapping, Tuple
+from typing import List, Mapping, Tuple, Optional, Dict
+
+import numpy as np
 
 from model.car.car import Car, Collision
+from model.car.directed_rect import SURROUNDING_RAYS_COUNT
+from model.car.sensing import IncrementalSensing
+from model.fitness import Progress
 from model.neural_network.neural_network import NeuralNetwork
 from model.track.track import Track
+from model.trajectory import TrajectoryRecorder
 
 from planar.transform import Affine
 
 FIXED_DELTA_TIME = 1.0 / 10.0
+MAX_DELTA_TIME = 1.0
+CAR_SIZE = (10.0, 20.0)
 
 
 @dataclass
@@ -23,34 +31,91 @@ SimState = Mapping[str, List[CarState]]
 class Simulation:
     track: Track
     cars: SimState
+    recorder: Optional[TrajectoryRecorder]
+    delta_time: float
+    swept_collisions: bool
+    sensing: Optional[IncrementalSensing]
+    progress: Progress
+    active_cars: int
+
+    def __init__(
+        self,
+        track: Track,
+        cars: Mapping[str, List[NeuralNetwork]],
+        recorder: Optional[TrajectoryRecorder] = None,
+        delta_time: float = FIXED_DELTA_TIME,
+        swept_collisions: Optional[bool] = None,
+        incremental_sensing: bool = False,
+    ):
+        """
+        Args:
+            delta_time (float): Duration of a fixed step, longer steps mean fewer
+                ticks per evaluation but also fewer decisions of the cars.
+            swept_collisions (bool, optional): Whether collisions are checked along
+                the whole motion of a step instead of at its end only. Defaults to
+                checking them for steps longer than FIXED_DELTA_TIME, through which
+                fast cars could otherwise skip over walls.
+            incremental_sensing (bool): Whether all cars sense their surroundings
+                at once with `IncrementalSensing`, which finds the closest walls
+                for sure and counts how often walls from the previous tick were reused.
 
-    def __init__(self, track: Track, cars: Mapping[str, List[NeuralNetwork]]):
+        Raises:
+            ValueError: If delta_time is not in range (0, MAX_DELTA_TIME].
+        """
+        if not 0.0 < delta_time <= MAX_DELTA_TIME:
+            raise ValueError(
+                f"Delta time must be in range (0, {MAX_DELTA_TIME}], got {delta_time}"
+            )
+        if swept_collisions is None:
+            swept_collisions = delta_time > FIXED_DELTA_TIME
+        self.delta_time = delta_time
+        self.swept_collisions = swept_collisions
         self.track = track
         self.cars = {
             name: [self._make_car(nn, track) for nn in group]
             for name, group in cars.items()
         }
+        self._all_cars = [state.car for group in self.cars.values() for state in group]
+        self.active_cars = len(self._all_cars)
+        self.sensing = None
+        if incremental_sensing:
+            self.sensing = IncrementalSensing(
+                track, len(self._all_cars), SURROUNDING_RAYS_COUNT
+            )
+        self.progress = Progress(track, len(self._all_cars))
+        """
+        Progress of all cars, in the order of groups and cars in them.
+        """
+        self._update_progress(list(range(len(self._all_cars))), 0.0)
+        self.recorder = recorder
+        if recorder is not None:
+            recorder.start(
+                {name: len(group) for name, group in self.cars.items()},
+                delta_time,
+                track.points_array(),
+                CAR_SIZE,
+            )
+            self._record()
 
     @staticmethod
     def _make_car(nn: NeuralNetwork, track: Track) -> CarState:
-        car = Car.with_standard_sensors((10.0, 20.0), nn)
+        car = Car.with_standard_sensors(CAR_SIZE, nn)
         car.transform(Affine.translation(track.segments[2].region.centroid))
         return CarState(car, True, 0)
 
-    def update(self, delta_time: float) -> Tuple[float, SimState]:
+    def run(self, max_ticks: Optional[int] = None) -> int:
         """
-        Updates simulation state with however many fixed steps fit in the given time.
+        Runs fixed steps until no car is active, or until max_ticks steps are done,
+        all in this call.
 
         Returns:
-            Tuple with remaining time and current state of the simulation.
+            Amount of steps done.
         """
-        state = self.cars
-        adjusted = 1 * FIXED_DELTA_TIME
-        while delta_time >= adjusted:
-            state = self.fixed_update(FIXED_DELTA_TIME)
-            delta_time -= adjusted
-        # print(self.cars[0])
-        return delta_time, state
+        ticks = 0
+        while self.active_cars and (max_ticks is None or ticks < max_ticks):
+            self.fixed_update(self.delta_time)
+            ticks += 1
+        return ticks
 
     def fixed_update(self, delta_time: float) -> SimState:
         """
@@ -59,12 +124,64 @@ class Simulation:
         delta_time should be the same for each call to get deterministic results.
         """
         state = self.cars
-        for car_group in state.values():
-            for car_state in car_group:
+        recorder = self.recorder
+        distances = self._sense() if self.sensing is not None else {}
+        moved = []
+        index = -1
+        for name, car_group in state.items():
+            for i, car_state in enumerate(car_group):
+                index += 1
                 if car_state.active:
+                    moved.append(index)
                     car_state.active_ticks += 1
                     try:
-                        car_state.car.tick(self.track, delta_time)
+                        car_state.car.tick(
+                            self.track,
+                            delta_time,
+                            self.swept_collisions,
+                            distances.get((name, i)),
+                        )
                     except Collision:
                         car_state.active = False
+                        self.active_cars -= 1
+                        if recorder is not None:
+                            recorder.crash(name, i)
+                    if recorder is not None:
+                        recorder.record(name, i, car_state.car)
+        if moved:
+            self._update_progress(moved, delta_time)
         return state
+
+    def _update_progress(self, indexes: List[int], delta_time: float) -> None:
+        """Updates progress of the given cars (indexes in all cars) at once."""
+        moved = [self._all_cars[i] for i in indexes]
+        self.progress.update(
+            np.array(indexes),
+            np.fromiter((car.active_segment for car in moved), int, len(moved)),
+            np.array([tuple(car.rect.center) for car in moved], dtype=float),
+            np.fromiter((car.speed for car in moved), float, len(moved)),
+            delta_time,
+        )
+
+    def _sense(self) -> Dict[Tuple[str, int], List[float]]:
+        """Senses surroundings of all active cars at once."""
+        assert self.sensing is not None
+        keys, indexes, sensors = [], [], []
+        index = 0
+        for name, car_group in self.cars.items():
+            for i, car_state in enumerate(car_group):
+                if car_state.active:
+                    keys.append((name, i))
+                    indexes.append(index)
+                    sensors.append(car_state.car.sensors)
+                index += 1
+        if not keys:
+            return {}
+        distances = self.sensing.sense(indexes, sensors).tolist()
+        return dict(zip(keys, distances))
+
+    def _record(self) -> None:
+        assert self.recorder is not None
+        for name, car_group in self.cars.items():
+            for i, car_state in enumerate(car_group):
+                self.recorder.record(name, i, car_state.car)
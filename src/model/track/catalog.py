@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+from glob import glob, escape
+from typing import Dict, List, Optional, Union, Any
+
+import numpy as np
+
+from model.track.compiled import CompiledTrack, source_hash
+from model.track.track import Track
+from model.track.validation import TrackReport, InvalidTrack, validate_points
+
+TrackKey = Union[str, int]
+
+
+def track_key(value: str) -> TrackKey:
+    """Parses a track given on the command line, by its name or its position."""
+    return int(value) if value.isdigit() else value
+
+
+class TrackCatalog:
+    """
+    Tracks from a JSON file (like resources/tracks.json), indexed by name.
+
+    Nothing is read until it's needed and every track is compiled
+    only when it's requested for the first time.
+
+    With `cache` enabled, parsed points are also stored in a binary sidecar file
+    next to the JSON file, keyed by its hash, so later runs don't parse the JSON at all
+    and read only points of the tracks they use. Tracks are then also created
+    from their compiled files, see `compiled`.
+
+    With `validate` enabled, tracks are validated before they're created
+    and invalid ones are not loaded, see `validation`.
+    """
+
+    DEFAULT_FILE = "resources/tracks.json"
+    DEFAULT_TRACK = "First"
+    """
+    A valid track of the default file.
+    """
+
+    def __init__(
+        self, file: str = DEFAULT_FILE, cache: bool = False, validate: bool = False
+    ) -> None:
+        self.file = file
+        self.cache = cache
+        self.validate = validate
+        self._names: Optional[List[str]] = None
+        self._points: Dict[str, np.ndarray] = {}
+        self._archive: Any = None
+        self._tracks: Dict[str, Track] = {}
+
+    def names(self) -> List[str]:
+        """
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        if self._names is None:
+            self._load_index()
+            assert self._names is not None
+        return self._names
+
+    def name(self, key: TrackKey) -> str:
+        """
+        Returns name of a track given either its name or its position in the file.
+
+        Raises:
+            KeyError: If there is no such track.
+        """
+        names = self.names()
+        if isinstance(key, int):
+            try:
+                return names[key]
+            except IndexError:
+                raise KeyError(key)
+        if key not in names:
+            raise KeyError(key)
+        return key
+
+    def points(self, key: TrackKey) -> np.ndarray:
+        """Returns points of a track as an array of shape (n, 2, 2)."""
+        name = self.name(key)
+        if name not in self._points:
+            index = self.names().index(name)
+            self._points[name] = self._archive[f"points{index}"]
+        return self._points[name]
+
+    def report(self, key: TrackKey) -> TrackReport:
+        """Returns problems found in a track, see `validation.validate_points`."""
+        return validate_points(self.points(key))
+
+    def check(self, key: TrackKey) -> str:
+        """
+        Returns name of a track, making sure it's valid whether validation is enabled
+        or not, e.g. before its compiled geometry is handed over to other processes.
+
+        Raises:
+            KeyError: If there is no such track.
+            InvalidTrack: If the track is invalid.
+        """
+        name = self.name(key)
+        if not (report := self.report(name)).valid:
+            raise InvalidTrack(report)
+        return name
+
+    def get(self, key: TrackKey) -> Track:
+        """
+        Returns a track given either its name or its position in the file.
+
+        Raises:
+            InvalidTrack: If validation is enabled and the track is invalid.
+        """
+        name = self.name(key)
+        if (track := self._tracks.get(name)) is None:
+            if self.validate and not (report := self.report(name)).valid:
+                raise InvalidTrack(report)
+            if self.cache:
+                track = self.compiled(name).track()
+            else:
+                track = Track.from_points(self.points(name).tolist())
+            self._tracks[name] = track
+        return track
+
+    def compiled(self, key: TrackKey) -> CompiledTrack:
+        """
+        Returns compiled geometry of a track, compiling it first if needed.
+
+        Compiled tracks are stored in a directory next to the JSON file,
+        one subdirectory per track named after the hash of its points.
+        """
+        points = self.points(key)
+        directory = os.path.join(f"{self.file}.compiled", source_hash(points)[:16])
+        return CompiledTrack.get(points, directory)
+
+    __getitem__ = get
+
+    def release(self, key: TrackKey) -> None:
+        """Forgets a compiled track, it will be compiled again when requested."""
+        self._tracks.pop(self.name(key), None)
+
+    def _sidecar_file(self, digest: str) -> str:
+        return f"{self.file}.{digest[:16]}.npz"
+
+    def _load_index(self) -> None:
+        with open(self.file, "rb") as file:
+            content = file.read()
+
+        if self.cache:
+            sidecar = self._sidecar_file(hashlib.sha256(content).hexdigest())
+            if os.path.exists(sidecar):
+                # loading an .npz is lazy, points are read when accessed
+                self._archive = np.load(sidecar)
+                self._names = self._archive["names"].tolist()
+                return
+
+        tracks = json.loads(content)["tracks"]
+        self._names = [track["name"] for track in tracks]
+        self._points = {
+            track["name"]: np.array(track["points"], dtype=float) for track in tracks
+        }
+        if self.cache:
+            self._write_sidecar(sidecar)
+
+    def _write_sidecar(self, sidecar: str) -> None:
+        assert self._names is not None
+        for stale in glob(f"{escape(self.file)}.*.npz"):
+            os.remove(stale)
+        arrays: Dict[str, Any] = {"names": np.array(self._names)}
+        arrays.update(
+            (f"points{index}", self._points[name])
+            for index, name in enumerate(self._names)
+        )
+        # written under a temporary name first, so it's never seen half written
+        temporary = f"{sidecar}.tmp.npz"
+        np.savez(temporary, **arrays)
+        os.replace(temporary, sidecar)
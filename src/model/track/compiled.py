@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import List, Tuple, Any, Union, Dict
+
+import numpy as np
+
+from model.track.grid import WallGrid
+from model.track.track import Track
+
+TrackPoints = List[Tuple[Any, Any]]
+TrackSource = Union[TrackPoints, str]
+"""
+Points of a track or a directory of a compiled track.
+"""
+
+VERSION = 2
+"""
+Version of the compiled files, bumped whenever their content changes.
+"""
+
+_META_FILE = "meta.json"
+
+
+def source_hash(points: Union[TrackPoints, np.ndarray]) -> str:
+    """Hash of the points a track is made of, which identifies its compiled files."""
+    data = np.ascontiguousarray(points, dtype=np.float64)
+    digest = hashlib.sha256(f"v{VERSION}:{data.shape}".encode())
+    digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+def wall_array(points: np.ndarray) -> np.ndarray:
+    """
+    Start and end points of walls of a track made of the given points (n, 2, 2),
+    in the order of `Track.walls`.
+    """
+    left, right = points[:, 0], points[:, 1]
+    walls = np.empty((2 * (len(points) - 1) + 2, 2, 2))
+    walls[0:-2:2] = np.stack([left[:-1], left[1:]], axis=1)
+    walls[1:-2:2] = np.stack([right[:-1], right[1:]], axis=1)
+    walls[-2] = (left[0], right[0])
+    walls[-1] = (left[-1], right[-1])
+    return walls
+
+
+def compile_track(points: Union[TrackPoints, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Computes derived geometry of a track which tracks read as arrays.
+
+    Walls are in the order of `Track.walls`.
+    """
+    array = np.asarray(points, dtype=np.float64)
+    walls = wall_array(array)
+    return {"points": array, "walls": walls, **WallGrid.build(walls).arrays()}
+
+
+class CompiledTrack:
+    """
+    Derived geometry of a track stored as arrays in a directory, one .npy file each.
+
+    Loaded arrays are memory mapped read-only, so processes loading the same track
+    share their pages through the OS page cache instead of building their own copies.
+    Tracks created from them use the mapped walls (`Track.wall_array`, read by
+    `IncrementalSensing`) and grid (`Track.wall_grid`, read by collision checks
+    and sensing).
+
+    Arrays (walls in the order of `Track.walls`):
+        points: (n, 2, 2) points the track was made of
+        walls: (m, 2, 2) start and end of every wall
+        grid_origin, grid_cell_size, grid_shape, grid_offsets, grid_indexes:
+            the walls' `WallGrid`
+    """
+
+    def __init__(self, directory: str, source: str, arrays: Dict[str, np.ndarray]):
+        self.directory = directory
+        self.source_hash = source
+        self.arrays = arrays
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            array: np.ndarray = self.__dict__["arrays"][name]
+            return array
+        except KeyError:
+            raise AttributeError(name)
+
+    @classmethod
+    def build(
+        cls, points: Union[TrackPoints, np.ndarray], directory: str
+    ) -> "CompiledTrack":
+        """
+        Compiles a track and saves it to the directory, replacing its content.
+
+        The directory is written under a temporary name first and renamed after,
+        so other processes never see it half written.
+        """
+        arrays = compile_track(points)
+        source = source_hash(arrays["points"])
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        temporary = tempfile.mkdtemp(dir=parent, prefix=".compiling-")
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(temporary, f"{name}.npy"), array)
+            with open(os.path.join(temporary, _META_FILE), "w") as meta:
+                json.dump(
+                    {"version": VERSION, "source_hash": source, "arrays": list(arrays)},
+                    meta,
+                )
+            shutil.rmtree(directory, ignore_errors=True)
+            os.replace(temporary, directory)
+        except BaseException:
+            shutil.rmtree(temporary, ignore_errors=True)
+            raise
+        return cls.load(directory, source)
+
+    @classmethod
+    def load(cls, directory: str, expected_hash: str = "") -> "CompiledTrack":
+        """
+        Raises:
+            FileNotFoundError: If the directory doesn't contain a compiled track.
+            ValueError: If it was compiled by another version
+                or from other points than expected.
+        """
+        with open(os.path.join(directory, _META_FILE)) as file:
+            meta = json.load(file)
+        if meta["version"] != VERSION:
+            raise ValueError(
+                f"Track compiled by version {meta['version']} in {directory}"
+            )
+        if expected_hash and meta["source_hash"] != expected_hash:
+            raise ValueError(f"Track in {directory} was compiled from other points")
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in meta["arrays"]
+        }
+        return cls(directory, meta["source_hash"], arrays)
+
+    @classmethod
+    def get(
+        cls, points: Union[TrackPoints, np.ndarray], directory: str
+    ) -> "CompiledTrack":
+        """Loads a compiled track from the directory, compiling it first if it's stale."""
+        expected_hash = source_hash(points)
+        try:
+            return cls.load(directory, expected_hash)
+        except (FileNotFoundError, ValueError, KeyError):
+            return cls.build(points, directory)
+
+    def track(self) -> Track:
+        """
+        Creates a track with its walls and their grid taken from this compiled track.
+
+        Planar geometry of segments and walls can't be mapped, so it's still
+        made in every process from the points.
+        """
+        track = Track.from_points(np.asarray(self.points).tolist())
+        # prefilled cached properties
+        track.__dict__["wall_array"] = self.walls
+        track.__dict__["wall_grid"] = WallGrid.from_arrays(self.walls, self.arrays)
+        return track
+
+
+def load_track(source: TrackSource) -> Track:
+    """Creates a track from its points or a directory of a compiled track."""
+    if isinstance(source, str):
+        return CompiledTrack.load(source).track()
+    return Track.from_points(source)
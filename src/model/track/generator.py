@@ -0,0 +1,177 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from model.track.track import Track
+
+
+@dataclass(frozen=True)
+class TrackShape:
+    """
+    Parameters of a generated track.
+
+    The track is a serpentine: straight lanes going back and forth, joined by
+    half circle turns, which keeps it from ever crossing itself no matter how long
+    it is. Lanes wiggle sideways and the track's width varies smoothly along it.
+
+    Raises:
+        ValueError: If any of the values is out of its range.
+    """
+
+    segments: int = 10_000
+    """
+    Amount of segments, the track has one point more.
+    """
+
+    segment_length: float = 20.0
+    """
+    Length of the track's centerline in a single segment.
+    """
+
+    width: float = 60.0
+    """
+    Mean width of the track.
+    """
+
+    width_variation: float = 0.2
+    """
+    Largest relative deviation of the width from the mean one, below 1.
+    """
+
+    lane_length: float = 4000.0
+    """
+    Length of a straight lane between two turns.
+    """
+
+    curvature: float = 0.005
+    """
+    Largest curvature of the lanes' wiggles (1 / radius), 0 for straight lanes.
+    """
+
+    wavelength: float = 400.0
+    """
+    Approximate length of a single wiggle, rounded so that lanes
+    have a whole number of them.
+    """
+
+    gap: float = 20.0
+    """
+    Smallest distance between walls of neighbouring lanes, small gaps
+    make the track approach itself closely.
+    """
+
+    def __post_init__(self) -> None:
+        if self.segments < 3:
+            raise ValueError("There must be at least three segments")
+        if min(self.segment_length, self.width, self.lane_length) <= 0:
+            raise ValueError("Segment length, width and lane length must be positive")
+        if not 0.0 <= self.width_variation < 1.0:
+            raise ValueError("Width variation must be in range [0, 1)")
+        if self.curvature < 0 or self.wavelength <= 0:
+            raise ValueError(
+                "Curvature must not be negative and wavelength must be positive"
+            )
+        if self.gap <= 0:
+            raise ValueError("Gap must be positive")
+        if self.curvature * self.width * (1 + self.width_variation) >= 2:
+            raise ValueError("Curvature is too large for the width, walls would fold")
+
+    @property
+    def wiggles_per_lane(self) -> int:
+        return max(1, round(self.lane_length / self.wavelength))
+
+    @property
+    def wiggle_amplitude(self) -> float:
+        """Sideways extent of the wiggles."""
+        wavenumber = 2 * np.pi * self.wiggles_per_lane / self.lane_length
+        # the offset amplitude * (1 - cos(k s)) / 2 has curvature up to amplitude k² / 2
+        return float(2 * self.curvature / wavenumber**2)
+
+    @property
+    def lane_spacing(self) -> float:
+        """Distance between centerlines of neighbouring lanes."""
+        widest = self.width * (1 + self.width_variation)
+        return widest + self.wiggle_amplitude + self.gap
+
+
+DEFAULT_SHAPE = TrackShape()
+"""
+Shape of generated tracks by default, shared since shapes are immutable.
+"""
+
+
+def _centerline(
+    shape: TrackShape, distances: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Points of the centerline at the given distances along it and unit tangents there.
+    """
+    length, radius = shape.lane_length, shape.lane_spacing / 2
+    period = length + np.pi * radius
+    lane, along = np.divmod(distances, period)
+    direction = np.where(lane % 2 == 0, 1.0, -1.0)
+    base = lane * shape.lane_spacing
+
+    wavenumber = 2 * np.pi * shape.wiggles_per_lane / length
+    amplitude = shape.wiggle_amplitude
+    straight = along < length
+    on_lane = np.minimum(along, length)
+    # lanes of odd index are driven backwards, x decreasing from the lane's length
+    lane_x = np.where(direction > 0, on_lane, length - on_lane)
+    lane_y = base + amplitude * (1 - np.cos(wavenumber * on_lane)) / 2
+    lane_tangent = np.stack(
+        [direction, amplitude * wavenumber * np.sin(wavenumber * on_lane) / 2], axis=1
+    )
+
+    angle = np.maximum(along - length, 0.0) / radius
+    turn_x = np.where(direction > 0, length, 0.0) + direction * radius * np.sin(angle)
+    turn_y = base + radius * (1 - np.cos(angle))
+    turn_tangent = np.stack([direction * np.cos(angle), np.sin(angle)], axis=1)
+
+    points = np.where(
+        straight[:, np.newaxis],
+        np.stack([lane_x, lane_y], axis=1),
+        np.stack([turn_x, turn_y], axis=1),
+    )
+    tangents = np.where(straight[:, np.newaxis], lane_tangent, turn_tangent)
+    tangents /= np.hypot(tangents[:, 0], tangents[:, 1])[:, np.newaxis]
+    return points, tangents
+
+
+def _widths(
+    shape: TrackShape, distances: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """Widths varying smoothly along the track, a sum of a few random waves."""
+    waves = 4
+    wavelengths = rng.uniform(0.5, 2.0, waves) * shape.wavelength
+    phases = rng.uniform(0, 2 * np.pi, waves)
+    weights = rng.uniform(0.5, 1.0, waves)
+    waves_values = np.sin(2 * np.pi * distances[:, np.newaxis] / wavelengths + phases)
+    noise = waves_values @ (weights / weights.sum())
+    return np.asarray(shape.width * (1 + shape.width_variation * noise))
+
+
+def generate_points(
+    shape: TrackShape = DEFAULT_SHAPE, seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Generates points of a track, the same for the same shape and seed.
+
+    Returns:
+        Left and right point of every cross-section as an array of shape
+        (segments + 1, 2, 2), like `TrackCatalog.points`.
+    """
+    rng = np.random.default_rng(seed)
+    distances = np.arange(shape.segments + 1) * shape.segment_length
+    centers, tangents = _centerline(shape, distances)
+    normals = np.stack([-tangents[:, 1], tangents[:, 0]], axis=1)
+    offsets = normals * (_widths(shape, distances, rng) / 2)[:, np.newaxis]
+    return np.stack([centers + offsets, centers - offsets], axis=1)
+
+
+def generate_track(
+    shape: TrackShape = DEFAULT_SHAPE, seed: Optional[int] = None
+) -> Track:
+    """Generates a track, see `generate_points`."""
+    return Track.from_points(generate_points(shape, seed).tolist())
@@ -0,0 +1,156 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+Corner = Union[Tuple[float, float], np.ndarray]
+
+
+class WallGrid:
+    """
+    Uniform grid over walls of a track, every cell listing walls whose bounding boxes
+    overlap it, so walls near a point or a shape are found without testing all of them.
+
+    The grid is made of arrays only, so it's stored with compiled tracks
+    and memory mapped, see `compiled`.
+    """
+
+    __slots__ = ("origin", "cell_size", "shape", "offsets", "indexes", "_low", "_high")
+
+    def __init__(
+        self,
+        walls: np.ndarray,
+        origin: np.ndarray,
+        cell_size: float,
+        shape: np.ndarray,
+        offsets: np.ndarray,
+        indexes: np.ndarray,
+    ) -> None:
+        """
+        Args:
+            walls (numpy.ndarray): Start and end points of the walls, of shape (m, 2, 2).
+            origin (numpy.ndarray): Minimal corner of the grid.
+            cell_size (float): Width and height of a cell.
+            shape (numpy.ndarray): Amount of cells along X and Y.
+            offsets (numpy.ndarray): Offsets of every cell's walls in `indexes`,
+                in a row-major order of cells, plus the end of the last cell.
+            indexes (numpy.ndarray): Walls of all cells.
+        """
+        self.origin = origin
+        self.cell_size = cell_size
+        self.shape = shape
+        self.offsets = offsets
+        self.indexes = indexes
+        self._low = walls.min(axis=1)
+        self._high = walls.max(axis=1)
+
+    @classmethod
+    def build(cls, walls: np.ndarray, cell_size: Optional[float] = None) -> "WallGrid":
+        """
+        Args:
+            walls (numpy.ndarray): Start and end points of the walls, of shape (m, 2, 2).
+            cell_size (float, optional): Defaults to twice the median wall length.
+        """
+        if cell_size is None:
+            lengths = np.hypot(*(walls[:, 1] - walls[:, 0]).T)
+            cell_size = max(2.0 * float(np.median(lengths)), 1.0)
+        points = walls.reshape(-1, 2)
+        origin = points.min(axis=0)
+        shape = np.maximum(
+            np.ceil((points.max(axis=0) - origin) / cell_size), 1
+        ).astype(np.int64)
+        lows = np.floor((walls.min(axis=1) - origin) / cell_size).astype(np.int64)
+        highs = np.floor((walls.max(axis=1) - origin) / cell_size).astype(np.int64)
+        lows, highs = np.clip(lows, 0, shape - 1), np.clip(highs, 0, shape - 1)
+
+        cells: List[List[int]] = [[] for _ in range(int(np.prod(shape)))]
+        for wall, ((x0, y0), (x1, y1)) in enumerate(zip(lows, highs)):
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    cells[x * shape[1] + y].append(wall)
+        offsets = np.cumsum([0] + [len(cell) for cell in cells]).astype(np.int64)
+        indexes = np.array([wall for cell in cells for wall in cell], dtype=np.int64)
+        return cls(walls, origin, cell_size, shape, offsets, indexes)
+
+    @classmethod
+    def from_arrays(
+        cls, walls: np.ndarray, arrays: Dict[str, np.ndarray]
+    ) -> "WallGrid":
+        """Grid stored with `arrays`."""
+        return cls(
+            walls,
+            arrays["grid_origin"],
+            float(arrays["grid_cell_size"]),
+            arrays["grid_shape"],
+            arrays["grid_offsets"],
+            arrays["grid_indexes"],
+        )
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "grid_origin": np.asarray(self.origin),
+            "grid_cell_size": np.array(self.cell_size),
+            "grid_shape": np.asarray(self.shape),
+            "grid_offsets": np.asarray(self.offsets),
+            "grid_indexes": np.asarray(self.indexes),
+        }
+
+    def near(self, low: Corner, high: Corner) -> np.ndarray:
+        """
+        Returns indexes of walls in cells overlapping a box given by its minimal
+        and maximal corner, a superset of walls which intersect the box.
+        """
+        shape, size = self.shape, self.cell_size
+        x0, y0 = np.clip(
+            np.floor((np.asarray(low) - self.origin) / size), 0, shape - 1
+        ).astype(np.int64)
+        x1, y1 = np.clip(
+            np.floor((np.asarray(high) - self.origin) / size), 0, shape - 1
+        ).astype(np.int64)
+        offsets, indexes = self.offsets, self.indexes
+        if x0 == x1:
+            start = x0 * shape[1]
+            return np.unique(indexes[offsets[start + y0] : offsets[start + y1 + 1]])
+        found = [
+            indexes[offsets[x * shape[1] + y0] : offsets[x * shape[1] + y1 + 1]]
+            for x in range(x0, x1 + 1)
+        ]
+        return np.unique(np.concatenate(found))
+
+    def near_boxes(
+        self, lows: np.ndarray, highs: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds walls in cells overlapping many boxes at once, like `near`.
+
+        Args:
+            lows (numpy.ndarray): Minimal corners of the boxes, of shape (boxes, 2).
+            highs (numpy.ndarray): Maximal corners of the boxes.
+
+        Returns:
+            Pairs of indexes of a box and a wall near it, as two arrays.
+            A wall may be paired with the same box more than once.
+        """
+        shape, size = self.shape, self.cell_size
+        low = np.clip(np.floor((lows - self.origin) / size), 0, shape - 1)
+        high = np.clip(np.floor((highs - self.origin) / size), 0, shape - 1)
+        low, spans = low.astype(np.int64), (high - low).astype(np.int64) + 1
+        # every box's cells, then every cell's walls, are enumerated with
+        # positions within the box (cell) made from a global counter
+        counts = spans[:, 0] * spans[:, 1]
+        boxes = np.repeat(np.arange(len(lows)), counts)
+        within = np.arange(len(boxes)) - np.repeat(np.cumsum(counts) - counts, counts)
+        columns = spans[boxes, 1]
+        cells = (low[boxes, 0] + within // columns) * shape[1]
+        cells += low[boxes, 1] + within % columns
+        starts = self.offsets[cells]
+        sizes = self.offsets[cells + 1] - starts
+        positions = np.arange(int(sizes.sum())) - np.repeat(
+            np.cumsum(sizes) - sizes - starts, sizes
+        )
+        return np.repeat(boxes, sizes), self.indexes[positions]
+
+    def overlapping(self, low: Corner, high: Corner) -> np.ndarray:
+        """Returns indexes of walls whose bounding boxes overlap the given box."""
+        walls = self.near(low, high)
+        inside = np.all((self._low[walls] <= high) & (self._high[walls] >= low), axis=1)
+        return walls[inside]
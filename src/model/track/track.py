@@ -2,11 +2,13 @@ from dataclasses import dataclass
 from functools import cached_property
 from typing import List, Tuple, Iterable, Optional, cast
 
+import numpy as np
 from planar import BoundingBox, Point
 from planar.line import LineSegment
 from planar.polygon import Polygon
 
 import utils
+from model.track.grid import WallGrid
 from model.track.segment import TrackSegment
 from model.car.sensor import Sensor
 from model.track.wall import Wall
@@ -73,21 +75,23 @@ class Track:
 
         return cast(List[float], distances)
 
-    def intersects(self, shape: Polygon, active_segment: SegmentId) -> bool:
-        """Checks whether a given shape intersects any of the track's walls."""
-        found_limit = [False, False]
-        for i, segment_id in enumerate(self._spread_segment_ids(active_segment)):
-            if found_limit[i % 2]:
-                continue
-            for wall in self.segment_walls(segment_id):
-                if wall.intersects(shape):
-                    return True
-            current_bbx = self.segments[segment_id].bounding_box
-            if not any(current_bbx.contains_point(p) for p in shape):
-                found_limit[i % 2] = True
-                if all(found_limit):
-                    return False
-        return False
+    def intersects(self, shape: Polygon, enclosed: bool = False) -> bool:
+        """
+        Checks whether a given shape intersects any of the track's walls.
+
+        Every wall whose bounding box overlaps the shape's one is tested,
+        so long shapes (e.g. covering a fast motion) can't skip any.
+
+        Args:
+            enclosed (bool): Whether walls entirely inside the shape count,
+                see `Wall.intersects`.
+        """
+        points = np.array([tuple(p) for p in shape], dtype=float)
+        walls = self.walls
+        return any(
+            walls[i].intersects(shape, enclosed)
+            for i in self.wall_grid.overlapping(points.min(axis=0), points.max(axis=0))
+        )
 
     def update_active(self, active_segment: SegmentId, center: Point) -> SegmentId:
         """
@@ -101,6 +105,56 @@ class Track:
         # raise RuntimeError("none of the track's segments contain the given point")
         return active_segment
 
+    def precompute_geometry(self) -> None:
+        """
+        Computes all lazily cached geometry of the track up front,
+        e.g. before forking worker processes which can then share it.
+        """
+        for segment in self.segments:
+            for name in ("region", "bounding_box", "back_wall", "front_wall"):
+                getattr(segment, name)
+        for name in ("bounding_box", "walls", "wall_array", "wall_grid"):
+            getattr(self, name)
+
+    def points_array(self) -> np.ndarray:
+        """Returns points the track was made of, as an array of shape (n, 2, 2)."""
+        pairs = [
+            (
+                segment.left_wall.line_segment.start,
+                segment.right_wall.line_segment.start,
+            )
+            for segment in self.segments
+        ]
+        last = self.segments[-1]
+        pairs.append(
+            (last.left_wall.line_segment.end, last.right_wall.line_segment.end)
+        )
+        return np.array(pairs, dtype=float)
+
     @cached_property
     def bounding_box(self) -> BoundingBox:
         return BoundingBox.from_shapes(segment.region for segment in self.segments)
+
+    @cached_property
+    def walls(self) -> List[Wall]:
+        """
+        All walls of the track: the left and the right wall of every segment in turn,
+        then the back wall of the first segment and the front wall of the last one.
+        """
+        walls = [
+            wall
+            for segment in self.segments
+            for wall in (segment.left_wall, segment.right_wall)
+        ]
+        walls += [self.segments[0].back_wall, self.segments[-1].front_wall]
+        return walls
+
+    @cached_property
+    def wall_array(self) -> np.ndarray:
+        """Start and end points of `walls` as an array of shape (n, 2, 2)."""
+        return np.array([wall.line_segment.points for wall in self.walls], dtype=float)
+
+    @cached_property
+    def wall_grid(self) -> WallGrid:
+        """Spatial index of `walls`."""
+        return WallGrid.build(self.wall_array)
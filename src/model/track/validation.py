@@ -0,0 +1,255 @@
+from dataclasses import dataclass
+from typing import Tuple, Union, List
+
+import numpy as np
+
+from model.track.compiled import TrackPoints, wall_array
+from model.track.track import Track
+
+
+@dataclass
+class TrackReport:
+    """Problems found in a track, walls and segments given by their indexes."""
+
+    segments: int
+    short_walls: np.ndarray
+    """
+    Walls not longer than the tolerance.
+    """
+    degenerate_segments: np.ndarray
+    """
+    Segments with a cross-section not wider than the tolerance or without area.
+    """
+    non_simple_segments: np.ndarray
+    """
+    Segments whose regions cross themselves, their walls or cross-sections cross.
+    """
+    intersections: np.ndarray
+    """
+    Pairs of walls which cross or touch each other, of shape (k, 2),
+    walls sharing an end as neighbours on the track are not included.
+    """
+    intersection_points: np.ndarray
+    """
+    A common point of every pair of intersecting walls, of shape (k, 2).
+    """
+
+    @property
+    def valid(self) -> bool:
+        return not (
+            len(self.short_walls)
+            or len(self.degenerate_segments)
+            or len(self.non_simple_segments)
+            or len(self.intersections)
+        )
+
+    def wall_segment(self, wall: int) -> int:
+        """Segment a wall belongs to, see `Track.walls`."""
+        if wall < 2 * self.segments:
+            return wall // 2
+        return 0 if wall == 2 * self.segments else self.segments - 1
+
+    def summary(self, limit: int = 5) -> str:
+        """Describes the problems, at most `limit` of every kind."""
+        if self.valid:
+            return f"Track of {self.segments} segments is valid"
+        lines: List[str] = [f"Track of {self.segments} segments is invalid:"]
+        for name, indexes in (
+            ("short walls", self.short_walls),
+            ("degenerate segments", self.degenerate_segments),
+            ("non-simple segments", self.non_simple_segments),
+        ):
+            if len(indexes):
+                shown = ", ".join(map(str, indexes[:limit]))
+                lines.append(f"  {len(indexes)} {name}: {shown}")
+        if len(self.intersections):
+            lines.append(f"  {len(self.intersections)} wall intersections:")
+            for (a, b), (x, y) in zip(
+                self.intersections[:limit], self.intersection_points[:limit]
+            ):
+                lines.append(
+                    f"    walls {a} and {b} (segments {self.wall_segment(a)}"
+                    f" and {self.wall_segment(b)}) at ({x:.6g}, {y:.6g})"
+                )
+        return "\n".join(lines)
+
+
+class InvalidTrack(ValueError):
+    def __init__(self, report: TrackReport) -> None:
+        super().__init__(report.summary())
+        self.report = report
+
+
+def _orientation(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Twice the signed area of triangles abc, positive if they turn left."""
+    return np.asarray(
+        (b[..., 0] - a[..., 0]) * (c[..., 1] - a[..., 1])
+        - (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0])
+    )
+
+
+def _crossing(
+    walls1: np.ndarray, walls2: np.ndarray, tolerance: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Checks which pairs of segments (k, 2, 2) cross or touch.
+
+    Returns:
+        Mask of the intersecting pairs and a common point of every pair
+        (meaningless for pairs which don't intersect).
+    """
+    a, b, c, d = walls1[:, 0], walls1[:, 1], walls2[:, 0], walls2[:, 1]
+    scale1 = np.hypot(*(b - a).T)
+    scale2 = np.hypot(*(d - c).T)
+    # orientations divided by lengths are distances of points from lines
+    o1 = _orientation(a, b, c) / np.maximum(scale1, tolerance)
+    o2 = _orientation(a, b, d) / np.maximum(scale1, tolerance)
+    o3 = _orientation(c, d, a) / np.maximum(scale2, tolerance)
+    o4 = _orientation(c, d, b) / np.maximum(scale2, tolerance)
+    sides = [
+        np.where(np.abs(o) <= tolerance, 0.0, np.sign(o)) for o in (o1, o2, o3, o4)
+    ]
+    crossing = (sides[0] * sides[1] <= 0) & (sides[2] * sides[3] <= 0)
+    # collinear segments must overlap as well
+    low1, high1 = np.minimum(a, b), np.maximum(a, b)
+    low2, high2 = np.minimum(c, d), np.maximum(c, d)
+    overlapping = np.all(
+        (low1 <= high2 + tolerance) & (low2 <= high1 + tolerance), axis=1
+    )
+    crossing &= overlapping
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        along = o1 / (o1 - o2)
+    along = np.where(np.isfinite(along), np.clip(along, 0.0, 1.0), 0.0)
+    points = c + along[:, np.newaxis] * (d - c)
+    return crossing, points
+
+
+def _candidate_pairs(walls: np.ndarray) -> np.ndarray:
+    """
+    Pairs of walls whose bounding boxes overlap, each pair once, of shape (k, 2).
+
+    The plane is cut into vertical strips about as wide as walls are long.
+    Within every strip, walls sorted by their lowest y are swept upwards and every
+    wall is paired with the following ones starting below its highest y,
+    found with a binary search. Every wall is then paired only with walls
+    in its strips whose heights overlap with its own. That's O(n log n) for walls
+    spread over the plane like in tracks, but quadratic in the worst case,
+    e.g. when long walls span many strips or many walls overlap in the same strip.
+    """
+    low, high = walls.min(axis=1), walls.max(axis=1)
+    lengths = np.hypot(*(walls[:, 1] - walls[:, 0]).T)
+    strip_width = max(float(np.median(lengths)), 1e-9)
+    origin = low.min(axis=0)
+    first = np.floor((low[:, 0] - origin[0]) / strip_width).astype(np.int64)
+    last = np.floor((high[:, 0] - origin[0]) / strip_width).astype(np.int64)
+
+    # every wall is entered into all strips it spans
+    spans = last - first + 1
+    entries = np.repeat(np.arange(len(walls)), spans)
+    strips = np.repeat(first, spans) + (
+        np.arange(len(entries)) - np.repeat(np.cumsum(spans) - spans, spans)
+    )
+
+    # strips stacked on top of each other, so that one sorted key sweeps all of them
+    height = float(high[:, 1].max() - origin[1]) + 1.0
+    keys = strips * height + (low[entries, 1] - origin[1])
+    order = np.argsort(keys, kind="stable")
+    keys, entries, strips = keys[order], entries[order], strips[order]
+    ends = np.searchsorted(
+        keys, strips * height + (high[entries, 1] - origin[1]), side="right"
+    )
+
+    counts = np.maximum(ends - np.arange(len(entries)) - 1, 0)
+    firsts = np.repeat(np.arange(len(entries)), counts)
+    seconds = (
+        firsts
+        + 1
+        + (np.arange(len(firsts)) - np.repeat(np.cumsum(counts) - counts, counts))
+    )
+    smaller = np.minimum(entries[firsts], entries[seconds])
+    larger = np.maximum(entries[firsts], entries[seconds])
+    # walls spanning more strips may be paired more than once
+    codes = np.unique(
+        smaller[smaller != larger] * len(walls) + larger[smaller != larger]
+    )
+    pairs = np.stack([codes // len(walls), codes % len(walls)], axis=1)
+    overlapping = np.all(
+        (low[pairs[:, 0]] <= high[pairs[:, 1]])
+        & (low[pairs[:, 1]] <= high[pairs[:, 0]]),
+        axis=1,
+    )
+    return np.asarray(pairs[overlapping])
+
+
+def _neighbours(pairs: np.ndarray, segments: int, closed: bool) -> np.ndarray:
+    """
+    Mask of pairs of walls which share an end as neighbours on the track.
+
+    In closed tracks, whose last cross-section is the first one, the last walls
+    are neighbours of the first ones too, and the back and the front wall are
+    the same wall.
+    """
+    a, b = pairs[:, 0], pairs[:, 1]
+    sides = 2 * segments
+    # the next wall on the same side
+    neighbours = (b < sides) & (b - a == 2)
+    # the back wall with the first walls, the front wall with the last ones
+    neighbours |= (b == sides) & (a < 2)
+    neighbours |= (b == sides + 1) & (a >= sides - 2) & (a < sides)
+    if closed:
+        neighbours |= (b < sides) & (a < 2) & (b - a == sides - 2)
+        ends = (a < 2) | ((a >= sides - 2) & (a < sides)) | (a == sides)
+        neighbours |= (b >= sides) & ends
+    return np.asarray(neighbours)
+
+
+def validate_points(
+    points: Union[TrackPoints, np.ndarray], tolerance: float = 1e-9
+) -> TrackReport:
+    """
+    Finds problems of a track made of the given points without creating it.
+
+    Args:
+        points: Points of the track, as in resources/tracks.json.
+        tolerance (float): Distances this small are treated as zero.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    segments = len(points) - 1
+    walls = wall_array(points)
+    lengths = np.hypot(*(walls[:, 1] - walls[:, 0]).T)
+    short_walls = np.flatnonzero(lengths <= tolerance)
+
+    left, right = points[:, 0], points[:, 1]
+    widths = np.hypot(*(left - right).T)
+    area = _orientation(left[:-1], left[1:], right[1:]) + _orientation(
+        left[:-1], right[1:], right[:-1]
+    )
+    thin = (widths[:-1] <= tolerance) | (widths[1:] <= tolerance)
+    flat = np.abs(area) <= tolerance * (lengths[0:-2:2] + lengths[1:-2:2])
+    degenerate_segments = np.flatnonzero(thin | flat)
+
+    walls_crossing, _ = _crossing(walls[0:-2:2], walls[1:-2:2], tolerance)
+    sections = np.stack([left, right], axis=1)
+    sections_crossing, _ = _crossing(sections[:-1], sections[1:], tolerance)
+    non_simple_segments = np.flatnonzero(walls_crossing | sections_crossing)
+
+    pairs = _candidate_pairs(walls)
+    closed = bool(np.all(np.abs(points[0] - points[-1]) <= tolerance))
+    pairs = pairs[~_neighbours(pairs, segments, closed)]
+    crossing, crossing_points = _crossing(
+        walls[pairs[:, 0]], walls[pairs[:, 1]], tolerance
+    )
+    return TrackReport(
+        segments,
+        short_walls,
+        degenerate_segments,
+        non_simple_segments,
+        pairs[crossing],
+        crossing_points[crossing],
+    )
+
+
+def validate(track: Track, tolerance: float = 1e-9) -> TrackReport:
+    """Finds problems of a track, see `validate_points`."""
+    return validate_points(track.points_array(), tolerance)
@@ -12,8 +12,13 @@ class Wall:
     __slots__ = ("line_segment",)
     line_segment: LineSegment
 
-    def intersects(self, shape: Polygon) -> bool:
-        """Check whether this wall intersects a Polygon."""
+    def intersects(self, shape: Polygon, enclosed: bool = False) -> bool:
+        """
+        Check whether this wall intersects a Polygon.
+
+        With `enclosed` a wall lying entirely inside the polygon counts too,
+        which only happens for polygons larger than the shortest walls.
+        """
         segment_line = self.line_segment.line
         vertex1, vertex2 = self.line_segment.points
         relative_sides = ((p, segment_line.point_left(p)) for p in shape)
@@ -23,4 +28,4 @@ class Wall:
                 edge = Line.from_points([p1, p2])
                 if edge.point_left(vertex1) is not edge.point_left(vertex2):
                     return True
-        return False
+        return enclosed and shape.contains_point(vertex1)
@@ -0,0 +1,211 @@
+from dataclasses import dataclass
+from math import atan2, nan
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from model.car.car import Car
+from model.car.directed_rect import SURROUNDING_RAYS_COUNT
+
+X, Y, HEADING, SPEED, SEGMENT = range(5)
+SENSORS = slice(5, 5 + SURROUNDING_RAYS_COUNT)
+COLUMNS = 5 + SURROUNDING_RAYS_COUNT
+"""
+Layout of a single trajectory row: position, heading (radians),
+speed, active segment and one column per sensor distance.
+"""
+
+
+@dataclass
+class Trajectory:
+    """
+    Recorded run of a single car, one row per tick (see COLUMNS).
+    """
+
+    data: np.ndarray
+    car_size: Tuple[float, float]
+    delta_time: float
+    track_points: np.ndarray
+    crashed: bool = True
+    """
+    Whether the run ended with a crash, not with the limit of ticks.
+    """
+
+    def __len__(self) -> int:
+        return int(self.data.shape[0])
+
+    def crashed_at(self, tick: int) -> bool:
+        """Whether the car is crashed at the given tick (it stays at its last pose)."""
+        return self.crashed and tick >= len(self) - 1
+
+    def car_polygon(self, tick: int) -> np.ndarray:
+        """Returns corners of the car at the given tick as an array of shape (4, 2)."""
+        row = self.data[tick]
+        width, length = self.car_size
+        corners = np.array(
+            [
+                [length / 2, width / 2],
+                [length / 2, -width / 2],
+                [-length / 2, -width / 2],
+                [-length / 2, width / 2],
+            ]
+        )
+        cos, sin = np.cos(row[HEADING]), np.sin(row[HEADING])
+        rotation = np.array([[cos, sin], [-sin, cos]])
+        return np.asarray(corners @ rotation + row[[X, Y]])
+
+
+class TrajectoryRecorder:
+    """
+    Records trajectories of cars into preallocated buffers during a simulation.
+
+    Only groups given at construction are recorded (all of them by default).
+    Every car of a recorded group is kept until the end of the run,
+    so the interesting ones (e.g. the best) can be picked afterwards.
+    """
+
+    def __init__(
+        self,
+        max_ticks: int = 5000,
+        groups: Optional[Iterable[str]] = None,
+        dtype: type = np.float32,
+    ) -> None:
+        self.max_ticks = max_ticks
+        self.groups = None if groups is None else set(groups)
+        self.dtype = dtype
+        self.delta_time = 0.0
+        self.track_points = np.empty((0, 2, 2))
+        self.car_size = (0.0, 0.0)
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._lengths: Dict[str, np.ndarray] = {}
+        self._crashed: Dict[str, np.ndarray] = {}
+
+    def start(
+        self,
+        groups: Dict[str, int],
+        delta_time: float,
+        track_points: np.ndarray,
+        car_size: Tuple[float, float],
+    ) -> None:
+        """
+        Prepares buffers for a new run.
+
+        Args:
+            groups (Dict[str, int]): Amount of cars in every group of the simulation.
+            delta_time (float): Time step of the simulation.
+            track_points (numpy.ndarray): Points of the track, stored for replay.
+            car_size (Tuple[float, float]): Width and length of the cars.
+        """
+        self.delta_time = delta_time
+        self.track_points = track_points
+        self.car_size = car_size
+        buffers, self._buffers = self._buffers, {}
+        self._lengths.clear()
+        self._crashed.clear()
+        for name, count in groups.items():
+            if self.groups is not None and name not in self.groups:
+                continue
+            buffer = buffers.get(name)
+            if buffer is None or buffer.shape[0] != count:
+                buffer = np.empty((count, self.max_ticks, COLUMNS), dtype=self.dtype)
+            buffer.fill(nan)
+            self._buffers[name] = buffer
+            self._lengths[name] = np.zeros(count, dtype=np.int64)
+            self._crashed[name] = np.zeros(count, dtype=bool)
+
+    def record(self, group: str, index: int, car: Car) -> None:
+        """Appends the current state of a car to its trajectory."""
+        buffer = self._buffers.get(group)
+        if buffer is None:
+            return
+        lengths = self._lengths[group]
+        tick = lengths[index]
+        if tick >= self.max_ticks:
+            return
+        row = buffer[index, tick]
+        center, direction = car.rect.center, car.rect.direction
+        row[X] = center.x
+        row[Y] = center.y
+        row[HEADING] = atan2(direction.y, direction.x)
+        row[SPEED] = car.speed
+        row[SEGMENT] = car.active_segment
+        if car.distances:
+            row[SENSORS] = car.distances
+        lengths[index] = tick + 1
+
+    def crash(self, group: str, index: int) -> None:
+        """
+        Marks the trajectory of a car as ended with a crash, called before the car's
+        last state is recorded. Crashes after the last recorded tick are ignored.
+        """
+        crashed = self._crashed.get(group)
+        if crashed is not None and self._lengths[group][index] < self.max_ticks:
+            crashed[index] = True
+
+    def best(self, group: str) -> int:
+        """Index of the car which got the furthest, ties resolved by longer runs."""
+        buffer, lengths = self._buffers[group], self._lengths[group]
+        last_segments = buffer[np.arange(len(lengths)), lengths - 1, SEGMENT]
+        return int(np.lexsort((lengths, last_segments))[-1])
+
+    def trajectory(self, group: str, index: int) -> Trajectory:
+        length = self._lengths[group][index]
+        return Trajectory(
+            self._buffers[group][index, :length].copy(),
+            self.car_size,
+            self.delta_time,
+            self.track_points,
+            bool(self._crashed[group][index]),
+        )
+
+    def save(self, file: str, group: str, indexes: Optional[List[int]] = None) -> None:
+        """
+        Writes trajectories of chosen cars to a compressed .npz file.
+
+        Args:
+            file (str): Path of the file to write.
+            group (str): Name of the recorded group.
+            indexes (List[int], optional): Cars to save. Defaults to the best car only.
+        """
+        if indexes is None:
+            indexes = [self.best(group)]
+        save_trajectories(file, [self.trajectory(group, i) for i in indexes])
+
+
+def save_trajectories(file: str, trajectories: List[Trajectory]) -> None:
+    if not trajectories:
+        raise ValueError("There are no trajectories to save")
+    first = trajectories[0]
+    lengths = np.array([len(t) for t in trajectories])
+    data = np.full(
+        (len(trajectories), lengths.max(), COLUMNS), nan, dtype=first.data.dtype
+    )
+    for i, trajectory in enumerate(trajectories):
+        data[i, : len(trajectory)] = trajectory.data
+    np.savez_compressed(
+        file,
+        data=data,
+        lengths=lengths,
+        car_size=np.array(first.car_size),
+        delta_time=np.array(first.delta_time),
+        track_points=first.track_points,
+        crashed=np.array([t.crashed for t in trajectories]),
+    )
+
+
+def load_trajectories(file: str) -> List[Trajectory]:
+    with np.load(file) as archive:
+        data, lengths = archive["data"], archive["lengths"]
+        car_size = tuple(archive["car_size"].tolist())
+        delta_time = float(archive["delta_time"])
+        track_points = archive["track_points"]
+        # files saved before crashes were recorded
+        crashed = (
+            archive["crashed"]
+            if "crashed" in archive.files
+            else np.ones(len(lengths), bool)
+        )
+    return [
+        Trajectory(data[i, :length], car_size, delta_time, track_points, bool(crash))
+        for i, (length, crash) in enumerate(zip(lengths, crashed))
+    ]
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import pygame
+from pygame.event import EventType
+from pygame.surface import Surface
+
+
+class AssetCache:
+    """
+    Images loaded once and their variants scaled to different sizes.
+
+    Images are converted to the display's pixel format, so blitting them doesn't
+    convert every pixel again. Scaled variants are kept until they're the least
+    recently used ones over the limit, or until the window is resized, when
+    the sizes they were scaled to are most likely not needed anymore.
+    """
+
+    def __init__(self, max_scaled: int = 16) -> None:
+        """
+        Args:
+            max_scaled (int): Maximal amount of scaled variants kept.
+
+        Raises:
+            ValueError: If the amount is not positive.
+        """
+        if max_scaled < 1:
+            raise ValueError("Maximal amount of scaled variants must be positive")
+        self.max_scaled = max_scaled
+        self._images: Dict[str, Surface] = {}
+        self._scaled: "OrderedDict[Tuple[Surface, Tuple[int, int]], Surface]"
+        self._scaled = OrderedDict()
+
+    def load(self, path: str, alpha: bool = False) -> Surface:
+        """
+        Loads an image, or returns the one loaded before.
+
+        Args:
+            path (str): Path of the image.
+            alpha (bool): Whether the image's transparency is kept.
+        """
+        image = self._images.get(path)
+        if image is None:
+            image = self._images[path] = self._convert(pygame.image.load(path), alpha)
+        return image
+
+    def scaled(self, image: Surface, size: Tuple[int, int]) -> Surface:
+        """Returns the image scaled to the given size, scaled only once per size."""
+        size = (int(size[0]), int(size[1]))
+        if image.get_size() == size:
+            return image
+        key = (image, size)
+        scaled = self._scaled.get(key)
+        if scaled is not None:
+            self._scaled.move_to_end(key)
+            return scaled
+        scaled = self._scaled[key] = pygame.transform.scale(image, size)
+        if len(self._scaled) > self.max_scaled:
+            self._scaled.popitem(last=False)
+        return scaled
+
+    def invalidate(self) -> None:
+        """Drops all scaled variants."""
+        self._scaled.clear()
+
+    def handle_event(self, event: EventType) -> None:
+        if event.type == pygame.VIDEORESIZE:
+            self.invalidate()
+
+    @staticmethod
+    def _convert(image: Surface, alpha: bool) -> Surface:
+        # the display's format is only known once its mode has been set
+        if pygame.display.get_surface() is None:
+            return image
+        return image.convert_alpha() if alpha else image.convert()
+
+
+assets = AssetCache()
+"""
+Cache shared by the window and its views.
+"""
@@ -0,0 +1,79 @@
+from typing import Iterable, Tuple
+
+import pygame
+from planar import Vec2
+from pygame.surface import Surface
+
+from model.track.track import Track
+from view import colors
+
+
+def render_board(
+    track: Track,
+    scale: float,
+    foreground_color: Tuple[int, int, int] = colors.BLACK,
+) -> Tuple[Surface, Vec2]:
+    """
+    Draws the track on a new surface.
+
+    Returns:
+        The surface and the track's coordinates matching the surface's origin.
+    """
+    board_size = (
+        track.bounding_box.width * scale,
+        track.bounding_box.height * scale,
+    )
+    coord_start = track.bounding_box.min_point
+    board_surf = Surface(board_size)
+    board_surf.fill(colors.BIZARRE_MASKING_PURPLE)
+    board_surf.set_colorkey(colors.BIZARRE_MASKING_PURPLE, pygame.RLEACCEL)
+
+    for segment in track.segments:
+        points: Iterable[Vec2] = segment.region
+        points = [(point - coord_start) * scale for point in points]
+        pygame.draw.polygon(board_surf, foreground_color, points)
+        pygame.draw.polygon(board_surf, colors.LIGHTGRAY, points, 2)
+        segment_center = segment.region.centroid
+        if segment_center is not None:
+            segment_center = tuple(map(int, (segment_center - coord_start) * scale))
+            pygame.draw.circle(board_surf, colors.WHITE, segment_center, 1)
+
+    return board_surf, coord_start
+
+
+def view_rect(
+    board: Surface, destination: Surface, point_of_interest: Vec2
+) -> pygame.Rect:
+    """
+    Returns the part of the board to be shown on the destination,
+    centered on the point of interest (in board's pixels) as far as possible.
+    """
+    rect: pygame.Rect = destination.get_rect()
+    limit_x = destination.get_width() // 2
+    limit_y = destination.get_height() // 2
+    center_x = min(max(limit_x, point_of_interest.x), board.get_width() - limit_x)
+    center_y = min(max(limit_y, point_of_interest.y), board.get_height() - limit_y)
+    rect.center = (int(center_x), int(center_y))
+    return rect
+
+
+def fit_board(
+    board: Surface, destination: Surface, background_color: Tuple[int, int, int]
+) -> Tuple[Surface, Vec2]:
+    """
+    Pads the board with background so it's at least as big as the destination.
+
+    Returns:
+        The padded board and the offset at which the original board was placed.
+    """
+    new_size = (
+        max(board.get_width(), destination.get_width()),
+        max(board.get_height(), destination.get_height()),
+    )
+    anchor = Vec2(*new_size)
+    anchor -= board.get_size()
+    anchor /= 2
+    new_board = Surface(new_size)
+    new_board.fill(background_color)
+    new_board.blit(board, pygame.Rect(anchor, board.get_size()))
+    return new_board, anchor
@@ -0,0 +1,249 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from types import TracebackType
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Type
+
+import numpy as np
+
+from model.trajectory import Trajectory
+from view import colors
+
+FORMATS = ("png", "y4m")
+"""
+Image sequences in a directory per episode or uncompressed YUV4MPEG2 videos.
+"""
+
+_boards: Dict[Tuple[bytes, float], Tuple[np.ndarray, np.ndarray]] = {}
+"""
+Pixels of rendered boards in a worker and their origins,
+by the track's points and the scale.
+"""
+
+
+def _init_worker() -> None:
+    # set before pygame creates any surface, rendering never opens a window
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+
+    pygame.display.init()
+
+
+def _board(
+    track_points: np.ndarray, scale: float, background: Tuple[int, int, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Pixels of the board of width × height × 3 and the board's origin."""
+    key = (track_points.tobytes(), scale)
+    if key not in _boards:
+        import pygame
+
+        from model.track.track import Track
+        from view.board import render_board
+
+        track = Track.from_points(track_points.tolist())
+        board, coord_start = render_board(track, scale)
+        pixels = pygame.surfarray.array3d(board)
+        masked = np.all(pixels == colors.BIZARRE_MASKING_PURPLE, axis=2)
+        pixels[masked] = background
+        _boards[key] = pixels, np.array(tuple(coord_start))
+    return _boards[key]
+
+
+def draw_polygons(
+    pixels: np.ndarray, polygons: np.ndarray, color: Tuple[int, int, int]
+) -> None:
+    """
+    Fills convex polygons, given in pixels as an array of shape (k, corners, 2),
+    in a width × height × 3 array, as returned by `pygame.surfarray.pixels3d`.
+    """
+    width, height = pixels.shape[:2]
+    for polygon in polygons:
+        low = np.clip(np.floor(polygon.min(axis=0)).astype(int), 0, (width, height))
+        high = np.clip(np.ceil(polygon.max(axis=0)).astype(int), 0, (width, height))
+        if np.any(high <= low):
+            continue
+        xs = np.arange(low[0], high[0]) + 0.5
+        ys = np.arange(low[1], high[1]) + 0.5
+        starts = polygon[:, np.newaxis, np.newaxis, :]
+        edges = (np.roll(polygon, -1, axis=0) - polygon)[:, np.newaxis, np.newaxis, :]
+        # side of every pixel's center relative to every edge, (corners, w, h)
+        sides = edges[..., 0] * (ys[np.newaxis, :] - starts[..., 1]) - edges[..., 1] * (
+            xs[:, np.newaxis] - starts[..., 0]
+        )
+        inside = np.all(sides >= 0, axis=0) | np.all(sides <= 0, axis=0)
+        pixels[low[0] : high[0], low[1] : high[1]][inside] = color
+
+
+def render_frames(
+    trajectories: List[Trajectory],
+    scale: float = 1.0,
+    frame_step: int = 1,
+    background: Tuple[int, int, int] = colors.GRAY,
+    car_color: Tuple[int, int, int] = colors.LIME,
+    crashed_car_color: Tuple[int, int, int] = colors.RED,
+) -> Iterator[np.ndarray]:
+    """
+    Renders every `frame_step`-th tick of trajectories of cars on the same track.
+
+    The board is rendered once per track and scale, cars are drawn into a copy
+    of its pixels, like in `ReplayView`.
+
+    Yields:
+        Frames of shape width × height × 3, like `pygame.surfarray.array3d`.
+    """
+    first = trajectories[0]
+    board, origin = _board(first.track_points, scale, background)
+    length = max(len(t) for t in trajectories)
+    for tick in range(0, length, frame_step):
+        frame = board.copy()
+        for trajectory in trajectories:
+            polygon = trajectory.car_polygon(min(tick, len(trajectory) - 1))
+            color = crashed_car_color if trajectory.crashed_at(tick) else car_color
+            draw_polygons(frame, ((polygon - origin) * scale)[np.newaxis], color)
+        yield frame
+
+
+def _write_y4m(file: BinaryIO, frame: np.ndarray) -> None:
+    """Writes an RGB frame as full resolution (4:4:4) Y'CbCr planes, BT.601."""
+    rgb = frame.transpose(1, 0, 2).astype(np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    luma = 16 + (65.481 * r + 128.553 * g + 24.966 * b) / 255
+    cb = 128 + (-37.797 * r - 74.203 * g + 112.0 * b) / 255
+    cr = 128 + (112.0 * r - 93.786 * g - 18.214 * b) / 255
+    planes = np.stack([luma, cb, cr]).round().clip(0, 255).astype(np.uint8)
+    file.write(b"FRAME\n")
+    file.write(planes.tobytes())
+
+
+def _export(
+    trajectories: List[Trajectory],
+    path: str,
+    file_format: str,
+    scale: float,
+    fps: float,
+) -> str:
+    delta_time = trajectories[0].delta_time
+    frame_step = max(1, round(1 / (fps * delta_time)))
+    frames = render_frames(trajectories, scale, frame_step)
+    if file_format == "png":
+        import pygame
+
+        os.makedirs(path, exist_ok=True)
+        for i, frame in enumerate(frames):
+            surface = pygame.surfarray.make_surface(frame)
+            pygame.image.save(surface, os.path.join(path, f"{i:06}.png"))
+        return path
+
+    path += ".y4m"
+    with open(path, "wb") as file:
+        for i, frame in enumerate(frames):
+            if i == 0:
+                width, height = frame.shape[:2]
+                rate = round(fps * 1000)
+                header = f"YUV4MPEG2 W{width} H{height} F{rate}:1000 Ip A1:1 C444\n"
+                file.write(header.encode())
+            _write_y4m(file, frame)
+    return path
+
+
+class EpisodeExporter:
+    """
+    Renders recorded episodes to files in background worker processes.
+
+    Training only hands trajectories over (see `TrajectoryRecorder.trajectory`),
+    rendering runs off-screen with pygame's dummy video driver. When workers
+    fall behind, new episodes are dropped instead of making training wait.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        file_format: str = "y4m",
+        scale: float = 0.5,
+        fps: float = 30.0,
+        processes: int = 1,
+        max_pending: int = 2,
+    ) -> None:
+        """
+        Args:
+            directory (str): Directory the episodes are written to.
+            file_format (str): One of `FORMATS`.
+            scale (float): Pixels per unit of the track.
+            fps (float): Frames per second of simulated time, every tick is
+                rendered if the simulation runs at a lower rate.
+            processes (int): Amount of worker processes.
+            max_pending (int): Amount of episodes rendered or waiting at once.
+
+        Raises:
+            ValueError: If any of the values is out of its range.
+        """
+        if file_format not in FORMATS:
+            raise ValueError(f"Format must be one of: {', '.join(FORMATS)}")
+        if scale <= 0 or fps <= 0:
+            raise ValueError("Scale and FPS must be positive")
+        if processes < 1 or max_pending < 1:
+            raise ValueError("Processes and pending episodes count must be positive")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.file_format = file_format
+        self.scale = scale
+        self.fps = fps
+        self.max_pending = max_pending
+        self.dropped = 0
+        """
+        Amount of episodes which weren't exported since workers were busy.
+        """
+        self._pending: List["Future[str]"] = []
+        # spawned, so that workers don't inherit the window of the parent's pygame
+        self._executor = ProcessPoolExecutor(
+            processes, mp_context=get_context("spawn"), initializer=_init_worker
+        )
+
+    def export(
+        self, trajectories: List[Trajectory], name: str
+    ) -> "Optional[Future[str]]":
+        """
+        Schedules rendering of cars' trajectories on the same track.
+
+        Args:
+            trajectories (List[Trajectory]): Cars to draw together.
+            name (str): Name of the file (or the directory of images)
+                in the exporter's directory, without an extension.
+
+        Returns:
+            Future of the written path, None if the episode was dropped.
+        """
+        if not trajectories:
+            raise ValueError("There is nothing to export")
+        self._pending = [f for f in self._pending if not f.done()]
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return None
+        future = self._executor.submit(
+            _export,
+            trajectories,
+            os.path.join(self.directory, name),
+            self.file_format,
+            self.scale,
+            self.fps,
+        )
+        self._pending.append(future)
+        return future
+
+    def close(self, wait: bool = True) -> None:
+        """Stops the workers, finishing pending episodes if `wait` is set."""
+        if not wait:
+            for future in self._pending:
+                future.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "EpisodeExporter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,122 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+import pygame
+from pygame.font import Font
+from pygame.surface import Surface
+
+from view import colors
+
+Color = Tuple[int, int, int]
+
+
+class TextCache:
+    """
+    Rendered texts, so that a text is rendered again only when it changes.
+
+    The least recently used texts are dropped when there are more than the limit.
+    """
+
+    def __init__(self, font: Font, max_entries: int = 256) -> None:
+        if max_entries < 1:
+            raise ValueError("Maximal amount of entries must be positive")
+        self.font = font
+        self.max_entries = max_entries
+        self._surfaces: "OrderedDict[Tuple[str, Color, bool], Surface]" = OrderedDict()
+
+    def render(self, text: str, color: Color, antialias: bool = True) -> Surface:
+        key = (text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        surface = self._surfaces[key] = self.font.render(text, antialias, color)
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+
+class Hud:
+    """
+    Labelled values drawn over a view, e.g. statistics of the training.
+
+    Values can be set every tick, they're only formatted and drawn anew
+    every `update_interval` seconds, between updates the same surfaces are drawn.
+    """
+
+    def __init__(
+        self,
+        font: Font,
+        update_interval: float = 0.25,
+        color: Color = colors.WHITE,
+        background: Tuple[int, int, int, int] = (0, 0, 0, 128),
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Args:
+            font (Font): Font of the texts.
+            update_interval (float): Seconds between updates of the drawn values.
+            color (Tuple): Color of the texts.
+            background (Tuple): Color of the panel behind the texts, with alpha.
+            clock (Callable): Current time in seconds.
+
+        Raises:
+            ValueError: If the interval is negative.
+        """
+        if update_interval < 0:
+            raise ValueError("Update interval must not be negative")
+        self.update_interval = update_interval
+        self.color = color
+        self.background = background
+        self.padding = 4
+        self._texts = TextCache(font)
+        self._clock = clock
+        self._values: Dict[str, object] = {}
+        self._lines: List[Surface] = []
+        self._panel = Surface((0, 0))
+        self._updated = -float("inf")
+
+    def set(self, name: str, value: object) -> None:
+        """Sets a value shown after its name, floats are shown with one decimal."""
+        self._values[name] = value
+
+    def remove(self, name: str) -> None:
+        self._values.pop(name, None)
+
+    def draw(self, destination: Surface, position: Tuple[int, int] = (0, 0)) -> None:
+        now = self._clock()
+        if now - self._updated >= self.update_interval:
+            self._updated = now
+            self._update()
+        if not self._lines:
+            return
+        destination.blit(self._panel, position)
+        x, y = position[0] + self.padding, position[1] + self.padding
+        for line in self._lines:
+            destination.blit(line, (x, y))
+            y += line.get_height()
+
+    def _update(self) -> None:
+        lines = [
+            self._texts.render(f"{name}: {_format(value)}", self.color)
+            for name, value in self._values.items()
+        ]
+        if not lines:
+            self._lines = lines
+            return
+        size = (
+            max(line.get_width() for line in lines) + 2 * self.padding,
+            sum(line.get_height() for line in lines) + 2 * self.padding,
+        )
+        if self._panel.get_size() != size:
+            self._panel = Surface(size, pygame.SRCALPHA)
+            self._panel.fill(self.background)
+        self._lines = lines
+
+
+def _format(value: object) -> str:
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
@@ -0,0 +1,54 @@
+from typing import List, Optional
+
+import pygame
+from pygame.event import EventType
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+from view import colors
+from view.action import Action
+from view.view import View
+
+
+class LoadingView(View):
+    """Shown while another view is being prepared."""
+
+    _BAR_SIZE = (360, 16)
+    _SWEEP_SECONDS = 1.5
+
+    def __init__(self, text: str = "Loading") -> None:
+        super().__init__()
+        pygame.font.init()
+        self.font = pygame.font.SysFont("Verdana", 24)
+        self.text = text
+        self.elapsed = 0.0
+        self._label = self.font.render(text, True, colors.WHITE)
+
+    def activate(self) -> None:
+        super().activate()
+        self.elapsed = 0.0
+
+    def draw(
+        self, destination: Surface, events: List[EventType], delta_time: float
+    ) -> Optional[Action]:
+        # delta_time is given in milliseconds
+        self.elapsed += delta_time / 1000
+        destination.fill(colors.BLACK)
+
+        center_x, center_y = destination.get_rect().center
+        label_position = (
+            center_x - self._label.get_width() // 2,
+            center_y - self._label.get_height(),
+        )
+        destination.blit(self._label, label_position)
+
+        bar = Rect((0, 0), self._BAR_SIZE)
+        bar.midtop = (center_x, center_y + 8)
+        pygame.draw.rect(destination, colors.GRAY, bar, 1)
+        # the time needed is unknown, so a block just sweeps the bar
+        phase = (self.elapsed / self._SWEEP_SECONDS) % 1.0
+        block_width = bar.width // 4
+        block_x = bar.x + int(phase * (bar.width - block_width))
+        block = Rect(block_x, bar.y, block_width, bar.height)
+        pygame.draw.rect(destination, colors.LIGHTBLUE, block)
+        return None
@@ -8,6 +8,8 @@ from pygame.surface import Surface
 
 from view import colors
 from view.action import Action
+from view.assets import assets
+from view.hud import TextCache
 from view.view import View
 
 
@@ -16,6 +18,7 @@ class Menu(View):
         super().__init__()
         pygame.font.init()
         self.font = pygame.font.SysFont("Verdana", 24)
+        self._texts = TextCache(self.font)
         self.selected_item = 0
         self._options = OrderedDict(menu_options)
         self.font_color = colors.WHITE
@@ -27,13 +30,15 @@ class Menu(View):
         self.logo_image: Optional[Surface] = None
         self.button_dims = (360, 80)
         self.divider = 0.4
+        self._geometry_size: Optional[Tuple[int, int]] = None
 
     def draw(
         self, destination: Surface, events: List[EventType], delta_time: float
     ) -> Optional[Action]:
         # TODO add activation check for consistency
         size = destination.get_size()
-        self._update_geometry(size)
+        if size != self._geometry_size:
+            self._update_geometry(size)
 
         if self._process_events(events):
             return list(self._options.values())[self.selected_item]
@@ -52,7 +57,7 @@ class Menu(View):
                 else self.button_color
             )
             pygame.draw.rect(destination, color, shifted_button_rect)
-            label = self.font.render(button, True, self.font_color)
+            label = self._texts.render(button, self.font_color)
             destination.blit(
                 label,
                 (
@@ -62,12 +67,18 @@ class Menu(View):
             )
         return None
 
+    def activate(self) -> None:
+        super().activate()
+        # images might have been replaced while the menu wasn't shown
+        self._geometry_size = None
+
     def _update_geometry(self, size: Tuple[int, int]) -> None:
+        self._geometry_size = size
         ofset_y = int(self.divider * size[1])
         ofset_x = (size[0] - self.button_dims[0]) // 2
 
         background_shape = Rect((0, 0), size)
-        background_image = pygame.transform.scale(self.background_image, size)
+        background_image = assets.scaled(self.background_image, size)
         self._background = (background_image, background_shape)
         self._button_rect = Rect((ofset_x, ofset_y), self.button_dims)
 
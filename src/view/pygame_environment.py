@@ -17,20 +17,34 @@ class EnvironmentContext:
     offset: Vec2
     scale: float
     point_of_interest: Point = Point(0, 0)
+    ticks: int = 1
+    """
+    Amount of simulation ticks to run before the cars are drawn.
+    """
 
 
 @dataclass
 class EnvironmentState:
     best_car_segment: SegmentId
     cars_count: int = 0
+    active_cars: int = 0
 
 
 @dataclass
 class PyGameEnvironment(Environment[EnvironmentContext, EnvironmentState]):
     def __init__(self, track: Track):
         super().__init__(track)
-        pygame.font.init()
-        self.font = pygame.font.SysFont("Verdana", 24)
+        self.active_cars = 0
+        """
+        Amount of cars still driving, as of the last step.
+        """
+        self.best_segment: SegmentId = 0
+        """
+        Segment of the car which got the furthest, as of the last step.
+        """
+
+    def _ticks_per_step(self, context: EnvironmentContext) -> int:
+        return context.ticks
 
     def _initialize(self) -> EnvironmentState:
         return EnvironmentState(0)
@@ -38,10 +52,9 @@ class PyGameEnvironment(Environment[EnvironmentContext, EnvironmentState]):
     def _finalize_iteration(
         self, state: EnvironmentState, context: EnvironmentContext
     ) -> EnvironmentState:
-        # TODO display in the corners more interesting data for user
-        # txt_surface = self.font.render(f"Cars: {state.cars_count}", False, colors.WHITE)
-        txt_surface = self.font.render("", False, colors.WHITE)
-        context.surface.blit(txt_surface, dest=(0, 0))
+        # drawn by the view's HUD, which renders texts only when they change
+        self.active_cars = state.active_cars
+        self.best_segment = state.best_car_segment
         return EnvironmentState(0)
 
     def _process_car_step(
@@ -53,6 +66,7 @@ class PyGameEnvironment(Environment[EnvironmentContext, EnvironmentState]):
     ) -> None:
         if car_state.active:
             color = colors.LIME
+            state.active_cars += 1
             if car_state.car.active_segment > state.best_car_segment:
                 context.point_of_interest = car_state.car.rect.shape.centroid
                 state.best_car_segment = car_state.car.active_segment
@@ -0,0 +1,141 @@
+from typing import List, Optional, Dict, Callable
+
+import numpy as np
+import pygame
+from planar import Vec2
+from pygame.event import EventType
+from pygame.surface import Surface
+
+from model.track.track import Track
+from model.trajectory import Trajectory, SEGMENT, SPEED
+from view import colors
+from view.action import Action, ActionType
+from view.board import render_board, fit_board, view_rect
+from view.view import View
+
+
+class ReplayView(View):
+    """
+    Plays back recorded trajectories.
+
+    Nothing is simulated, the cars are drawn straight from the recorded poses.
+
+    Controls:
+        ENTER - pause/resume, LEFT/RIGHT - seek by a second,
+        PAGE UP/PAGE DOWN - seek by a tenth of the run, HOME/END - jump to start/end,
+        UP/DOWN - play faster/slower, ESCAPE - go back to the menu.
+    """
+
+    _MIN_SPEED = 1 / 16
+    _MAX_SPEED = 64.0
+    _SEEK_SECONDS = 1.0
+
+    trajectories: List[Trajectory]
+    track: Track
+    board: Surface
+
+    scale = 1.0
+    speed = 1.0
+    background_color = colors.GRAY
+    foreground_color = colors.BLACK
+    car_color = colors.LIME
+    crashed_car_color = colors.RED
+
+    def __init__(self, trajectories: List[Trajectory]):
+        super().__init__()
+        if not trajectories:
+            raise ValueError("There is nothing to replay")
+        self.trajectories = trajectories
+        # track is only drawn, it's never queried for geometry
+        self.track = Track.from_points(trajectories[0].track_points.tolist())
+        self._cursor = 0.0
+        self._paused = False
+        self.font: Optional[pygame.font.Font] = None
+
+    @property
+    def length(self) -> int:
+        return max(len(t) for t in self.trajectories)
+
+    @property
+    def tick(self) -> int:
+        return int(self._cursor)
+
+    def seek(self, tick: float) -> None:
+        self._cursor = float(np.clip(tick, 0, self.length - 1))
+
+    def draw(
+        self, destination: Surface, events: List[EventType], delta_time: float
+    ) -> Optional[Action]:
+        if (x := self._process_events(events)) is not None:
+            return x
+
+        if not self._paused:
+            # delta_time is given in milliseconds
+            delta_time_s = delta_time / 1000
+            ticks = delta_time_s / self.trajectories[0].delta_time
+            self.seek(self._cursor + ticks * self.speed)
+
+        board = self.board.copy()
+        tick = self.tick
+        point_of_interest = Vec2(0, 0)
+        best_segment = -1.0
+        for trajectory in self.trajectories:
+            row_index = min(tick, len(trajectory) - 1)
+            polygon = trajectory.car_polygon(row_index)
+            polygon = (polygon - self._origin) * self.scale
+            crashed = trajectory.crashed_at(tick)
+            color = self.crashed_car_color if crashed else self.car_color
+            pygame.draw.polygon(board, color, polygon.tolist())
+            if (segment := trajectory.data[row_index, SEGMENT]) > best_segment:
+                best_segment = float(segment)
+                point_of_interest = Vec2(*polygon.mean(axis=0))
+
+        board, _ = fit_board(board, destination, self.background_color)
+        rect = view_rect(board, destination, point_of_interest)
+        destination.blit(board.subsurface(rect), (0, 0))
+
+        first = self.trajectories[0]
+        car_speed = first.data[min(tick, len(first) - 1), SPEED]
+        status = (
+            f"Tick {tick}/{self.length - 1}  x{self.speed:g}"
+            f"{'  paused' if self._paused else ''}  car speed: {car_speed:.1f}"
+        )
+        assert self.font is not None
+        destination.blit(self.font.render(status, True, colors.WHITE), (0, 0))
+        return None
+
+    def activate(self) -> None:
+        super().activate()
+        if self.font is None:
+            # not done in the constructor, which may run in a background thread
+            pygame.font.init()
+            self.font = pygame.font.SysFont("Verdana", 16)
+        self.board, coord_start = render_board(
+            self.track, self.scale, self.foreground_color
+        )
+        self._origin = np.array(tuple(coord_start))
+
+    def _process_events(self, events: List[EventType]) -> Optional[Action]:
+        seek_ticks = self._SEEK_SECONDS / self.trajectories[0].delta_time
+        seek_targets: Dict[int, Callable[[float], float]] = {
+            pygame.K_RIGHT: lambda cursor: cursor + seek_ticks,
+            pygame.K_LEFT: lambda cursor: cursor - seek_ticks,
+            pygame.K_PAGEUP: lambda cursor: cursor + self.length / 10,
+            pygame.K_PAGEDOWN: lambda cursor: cursor - self.length / 10,
+            pygame.K_HOME: lambda cursor: 0,
+            pygame.K_END: lambda cursor: self.length - 1,
+        }
+        for event in events:
+            if event.type != pygame.KEYUP:
+                continue
+            if event.key == pygame.K_ESCAPE:
+                return Action(ActionType.CHANGE_VIEW, 0)
+            elif event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
+                self._paused = not self._paused
+            elif event.key in seek_targets:
+                self.seek(seek_targets[event.key](self._cursor))
+            elif event.key == pygame.K_UP:
+                self.speed = min(self.speed * 2, self._MAX_SPEED)
+            elif event.key == pygame.K_DOWN:
+                self.speed = max(self.speed / 2, self._MIN_SPEED)
+        return None
@@ -0,0 +1,121 @@
+import time
+from typing import Callable
+
+
+class FrameScheduler:
+    """
+    Paces frames of the window and decides how many simulation ticks fit in a frame.
+
+    Every frame gets 1 / target_fps seconds, a share of which is the simulation's
+    budget. The amount of ticks run in a frame is estimated from the measured
+    duration of past ticks, so slow frames make the simulation run slower
+    instead of catching up with more and more ticks. What's left of a frame
+    after drawing is slept through instead of busy looping.
+    """
+
+    _SMOOTHING = 0.2
+    """
+    Weight of the last measurement in the estimated duration of a tick.
+    """
+
+    _RATES_PERIOD = 1.0
+    """
+    Period in seconds over which the rates are measured.
+    """
+
+    def __init__(
+        self,
+        target_fps: float = 60.0,
+        simulation_share: float = 0.6,
+        max_ticks_per_frame: int = 10,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            target_fps (float): Frames per second to render.
+            simulation_share (float): Part of a frame's time given to the simulation.
+            max_ticks_per_frame (int): Maximal amount of ticks run in a frame.
+            clock (Callable): Current time in seconds.
+            sleep (Callable): Sleeps for given seconds.
+
+        Raises:
+            ValueError: If any of the values is out of its range.
+        """
+        if target_fps <= 0:
+            raise ValueError("Target FPS must be positive")
+        if not 0.0 < simulation_share <= 1.0:
+            raise ValueError("Simulation share must be in range (0, 1]")
+        if max_ticks_per_frame < 1:
+            raise ValueError("Maximal ticks per frame must be positive")
+        self.target_fps = target_fps
+        self.simulation_share = simulation_share
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self._clock = clock
+        self._sleep = sleep
+
+        self.fps = 0.0
+        """
+        Frames per second measured over the last period.
+        """
+        self.ticks_per_second = 0.0
+        """
+        Simulation ticks per second measured over the last period.
+        """
+        self._tick_duration = 0.0
+        self._frame_start = clock()
+        self._period_start = self._frame_start
+        self._period_frames = 0
+        self._period_ticks = 0
+
+    @property
+    def frame_duration(self) -> float:
+        return 1.0 / self.target_fps
+
+    def begin_frame(self) -> float:
+        """
+        Starts a frame.
+
+        Returns:
+            Milliseconds since the previous frame started, like `pygame.time.Clock.tick`.
+        """
+        now = self._clock()
+        delta_time = now - self._frame_start
+        self._frame_start = now
+        return 1000 * delta_time
+
+    def simulation_ticks(self) -> int:
+        """Amount of ticks to run in the current frame."""
+        if self._tick_duration <= 0.0:
+            return 1
+        budget = self.simulation_share * self.frame_duration
+        ticks = int(budget / self._tick_duration)
+        return max(1, min(ticks, self.max_ticks_per_frame))
+
+    def simulated(self, ticks: int, duration: float) -> None:
+        """Records that the given amount of ticks was run in the given seconds."""
+        self._period_ticks += ticks
+        if ticks > 0:
+            measured = duration / ticks
+            if self._tick_duration <= 0.0:
+                self._tick_duration = measured
+            else:
+                self._tick_duration += self._SMOOTHING * (
+                    measured - self._tick_duration
+                )
+
+    def end_frame(self) -> None:
+        """Sleeps through the rest of the frame and updates the measured rates."""
+        remaining = self._frame_start + self.frame_duration - self._clock()
+        if remaining > 0:
+            self._sleep(remaining)
+
+        self._period_frames += 1
+        now = self._clock()
+        elapsed = now - self._period_start
+        if elapsed >= self._RATES_PERIOD:
+            self.fps = self._period_frames / elapsed
+            self.ticks_per_second = self._period_ticks / elapsed
+            self._period_start = now
+            self._period_frames = 0
+            self._period_ticks = 0
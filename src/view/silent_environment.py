@@ -7,6 +7,8 @@ from model.track.track import Track
 
 @dataclass
 class SilentEnvironment(Environment[None, None]):
+    renders = False
+
     def __init__(self, track: Track):
         super().__init__(track)
 
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Optional, Iterable, Generator
+import time
+from typing import List, Optional, Generator, Union, Callable
 
 import pygame
 from planar import Vec2
 from pygame.event import EventType
-from pygame.rect import Rect
 from pygame.surface import Surface
 
 from model.car.directed_rect import SURROUNDING_RAYS_COUNT
@@ -14,16 +14,17 @@ from model.neural_network.neural_network import LayerInfo
 from model.neuroevolution.neuroevolution import Neuroevolution
 from view import colors
 from view.action import Action, ActionType
+from view.assets import assets
+from view.board import render_board, fit_board, view_rect as board_view_rect
+from view.hud import Hud
 from view.pygame_environment import PyGameEnvironment, EnvironmentContext
+from view.scheduler import FrameScheduler
 from view.view import View
 
 
 class TrackView(View):
     generator: Generator[None, EnvironmentContext, None]
     track: Track
-    environment: PyGameEnvironment
-
-    neuroevolution: Neuroevolution
 
     _paused = False
     scale = 1.0
@@ -34,17 +35,64 @@ class TrackView(View):
     foreground_color = colors.BLACK
     car_color = colors.RED
 
-    def __init__(self, track: Track):
+    def __init__(
+        self,
+        track: Union[Track, Callable[[], Track]],
+        scheduler: Optional[FrameScheduler] = None,
+    ):
+        """
+        Args:
+            track (Union[Track, Callable[[], Track]]): The track or a function
+                returning it, which is called when the view is prepared.
+            scheduler (FrameScheduler, optional): Scheduler of the window deciding
+                how many ticks are simulated in a frame, one per frame without it.
+        """
         super().__init__()
-        self.track = track
+        self._track_source = track
+        self.scheduler = scheduler
+        self._population: Optional[Neuroevolution] = None
+        self._environment: Optional[PyGameEnvironment] = None
+        self.generation = 0
+        """
+        Number of the generation being simulated, counted from 1.
+        """
+        self.hud: Optional[Hud] = None
+
+    @property
+    def needs_preparation(self) -> bool:
+        return self._population is None
+
+    def prepare(self) -> None:
+        """Creates the track and population."""
+        track = self._track_source
+        self.track = track if isinstance(track, Track) else track()
         layers_infos: List[LayerInfo] = [
             LayerInfo(SURROUNDING_RAYS_COUNT + 1, "tanh"),
             LayerInfo(4, "tanh"),
         ]
-        self.environment = PyGameEnvironment(track)
-        self.neuroevolution = Neuroevolution.init_with_neural_network_info(
-            layers_infos, 2
-        )
+        self._population = Neuroevolution.init_with_neural_network_info(layers_infos, 2)
+
+    def release(self) -> None:
+        """Drops the population, evolution starts over once the view is prepared again."""
+        self._population = None
+        self._environment = None
+        self.generation = 0
+        generator = self.__dict__.pop("generator", None)
+        if generator is not None:
+            generator.close()
+
+    @property
+    def neuroevolution(self) -> Neuroevolution:
+        if self._population is None:
+            self.prepare()
+            assert self._population is not None
+        return self._population
+
+    @property
+    def environment(self) -> PyGameEnvironment:
+        if self._environment is None:
+            self._environment = PyGameEnvironment(self.track)
+        return self._environment
 
     def draw(
         self, destination: Surface, events: List[EventType], delta_time: float
@@ -56,80 +104,63 @@ class TrackView(View):
             width, height = destination.get_size()
             frame_size = (int(width * 0.9), int(height * 0.9))
             frame_start = (int(width * 0.05), int(height * 0.05))
-            last_frame = pygame.transform.scale(self.last_frame, frame_size)
+            last_frame = assets.scaled(self.last_frame, frame_size)
             # TODO: Paused label
             destination.fill(colors.BLACK)
             destination.blit(last_frame, frame_start)
             return None
 
         board = self.board.copy()
-        context = EnvironmentContext(board, delta_time, self.coord_start, self.scale)
+        ticks = self.scheduler.simulation_ticks() if self.scheduler else 1
+        context = EnvironmentContext(
+            board, delta_time, self.coord_start, self.scale, ticks=ticks
+        )
+        start = time.perf_counter()
         try:
             self.generator.send(context)
         except StopIteration:
             self.generator = self._get_generator()
+        if self.scheduler is not None:
+            self.scheduler.simulated(ticks, time.perf_counter() - start)
+        self._update_hud()
 
-        new_size = (
-            max(board.get_width(), destination.get_width()),
-            max(board.get_height(), destination.get_height()),
-        )
-        anchor = Vec2(*new_size)
-        anchor -= board.get_size()
-        anchor /= 2
-        new_board = Surface(new_size)
-        new_board.fill(self.background_color)
-        new_board.blit(board, Rect(anchor, self.board.get_size()))
-        board = new_board
-
-        view_rect: Rect = destination.get_rect()
-        limit_x = destination.get_width() // 2
-        limit_y = destination.get_height() // 2
-        center_x = min(
-            max(
-                limit_x, (context.point_of_interest.x - self.coord_start.x) * self.scale
-            ),
-            board.get_width() - limit_x,
-        )
-        center_y = min(
-            max(
-                limit_y, (context.point_of_interest.y - self.coord_start.y) * self.scale
-            ),
-            board.get_height() - limit_y,
-        )
-        view_rect.center = (int(center_x), int(center_y))
+        board, _ = fit_board(board, destination, self.background_color)
+        point_of_interest = (context.point_of_interest - self.coord_start) * self.scale
+        view_rect = board_view_rect(board, destination, point_of_interest)
 
         self.last_frame = board.subsurface(view_rect)
         destination.blit(self.last_frame, (0, 0))
+        assert self.hud is not None
+        self.hud.draw(destination)
         return None
 
     def activate(self) -> None:
         super().activate()
+        if self.needs_preparation:
+            self.prepare()
         self._prepare_board()
+        if self.hud is None:
+            # not done in `prepare`, fonts mustn't be touched in another thread
+            pygame.font.init()
+            self.hud = Hud(pygame.font.SysFont("Verdana", 18))
         self.generator = self._get_generator()
 
     def _prepare_board(self) -> None:
-        board_size = (
-            self.track.bounding_box.width * self.scale,
-            self.track.bounding_box.height * self.scale,
+        self.board, self.coord_start = render_board(
+            self.track, self.scale, self.foreground_color
         )
-        self.coord_start = self.track.bounding_box.min_point
-        board_surf = Surface(board_size)
-        board_surf.fill(colors.BIZARRE_MASKING_PURPLE)
-        board_surf.set_colorkey(colors.BIZARRE_MASKING_PURPLE, pygame.RLEACCEL)
-
-        for segment in self.track.segments:
-            points: Iterable[Vec2] = segment.region
-            points = [(point - self.coord_start) * self.scale for point in points]
-            pygame.draw.polygon(board_surf, self.foreground_color, points)
-            pygame.draw.polygon(board_surf, colors.LIGHTGRAY, points, 2)
-            segment_center = segment.region.centroid
-            if segment_center is not None:
-                segment_center = tuple(
-                    map(int, (segment_center - self.coord_start) * self.scale)
-                )
-                pygame.draw.circle(board_surf, colors.WHITE, segment_center, 1)
-
-        self.board = board_surf
+
+    def _update_hud(self) -> None:
+        assert self.hud is not None
+        environment = self.environment
+        self.hud.set("Generation", self.generation)
+        self.hud.set("Alive cars", environment.active_cars)
+        self.hud.set("Best segment", environment.best_segment)
+        if self.scheduler is not None:
+            # simulated seconds per second of real time
+            speed = self.scheduler.ticks_per_second * environment.delta_time
+            self.hud.set("Simulation speed", f"x{speed:.2f}")
+            self.hud.set("FPS", self.scheduler.fps)
 
     def _process_events(self, events: List[EventType]) -> Optional[Action]:
         for event in events:
@@ -150,4 +181,5 @@ class TrackView(View):
     def _get_generator(self) -> Generator[None, EnvironmentContext, None]:
         generator = self.neuroevolution.generate_evolution(self.environment, True)
         next(generator)
+        self.generation += 1
         return generator
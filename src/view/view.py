@@ -23,6 +23,25 @@ class View(ABC):
     def deactivate(self) -> None:
         self._active = False
 
+    @property
+    def needs_preparation(self) -> bool:
+        """Whether `prepare` has to be called before the view is activated."""
+        return False
+
+    def prepare(self) -> None:
+        """
+        Does the heavy part of the view's setup.
+
+        It's run in a background thread while a loading screen is shown,
+        so it mustn't touch the display nor fonts. Views without any heavy setup
+        don't override it.
+        """
+        return None
+
+    def release(self) -> None:
+        """Frees whatever `prepare` created, the view is prepared again when needed."""
+        return None
+
     @property
     def active(self) -> bool:
         return self._active
@@ -1,9 +1,13 @@
-from typing import Tuple, Optional, Union, Dict
+from threading import Thread
+from typing import Tuple, Optional, Union, Dict, Callable
 
 import pygame
 from pygame.surface import Surface
 
 from view.action import ActionType
+from view.assets import assets
+from view.loading_view import LoadingView
+from view.scheduler import FrameScheduler
 from view.view import View
 
 
@@ -17,7 +21,16 @@ class Window:
         fullscreen: bool = False,
         resizable: bool = False,
         min_size: Optional[Tuple[int, int]] = None,
+        release_inactive_views: bool = False,
+        scheduler: Optional[FrameScheduler] = None,
     ):
+        """
+        Args:
+            release_inactive_views (bool): Whether views should release their
+                resources (e.g. populations) when another view is activated.
+            scheduler (FrameScheduler, optional): Paces the frames,
+                defaults to one with its default target FPS.
+        """
         pygame.init()
         pygame.display.set_caption(name)
         self._mode = pygame.HWSURFACE | pygame.DOUBLEBUF
@@ -27,14 +40,13 @@ class Window:
             self._mode |= pygame.RESIZABLE
         self._screen: pygame.Surface = pygame.display.set_mode(size, self._mode)
         self._closing = False
-        self._view_manager = self.ViewManager()
+        self._view_manager = self.ViewManager(release_inactive_views)
         self._min_size = min_size
+        self.scheduler = scheduler or FrameScheduler()
 
     def run(self) -> None:
-        clock = pygame.time.Clock()
-
         while not self._closing:
-            delta_time: float = clock.tick()
+            delta_time = self.scheduler.begin_frame()
             event_passthrough = []
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -43,6 +55,7 @@ class Window:
                     print(self._screen.get_size())
                     self._mode ^= pygame.FULLSCREEN
                     self._screen = pygame.display.set_mode((0, 0), self._mode)
+                    assets.invalidate()
                 elif event.type == pygame.VIDEORESIZE:
                     size = list(event.size)
                     if self._min_size and size[0] < self._min_size[0]:
@@ -50,11 +63,15 @@ class Window:
                     if self._min_size and size[1] < self._min_size[1]:
                         size[1] = self._min_size[1]
                     self._screen = pygame.display.set_mode(size, self._mode)
+                    assets.handle_event(event)
                     print(self._screen.get_size())
                 else:
                     event_passthrough.append(event)
 
-            if (
+            self._view_manager.poll()
+            if self._view_manager.loading:
+                self._draw_loading_screen(delta_time)
+            elif (
                 x := self._view_manager.active_view.draw(
                     self._screen, event_passthrough, delta_time
                 )
@@ -69,27 +86,107 @@ class Window:
                     raise NotImplementedError
 
             pygame.display.update()
+            self.scheduler.end_frame()
         pygame.quit()
 
+    def _draw_loading_screen(self, delta_time: float) -> None:
+        if self.loading_screen is None:
+            self.loading_screen = LoadingView()
+        if isinstance(self.loading_screen, View):
+            self.loading_screen.draw(self._screen, [], delta_time)
+        else:
+            image = assets.scaled(self.loading_screen, self._screen.get_size())
+            self._screen.blit(image, (0, 0))
+
     class ViewManager:
-        def __init__(self) -> None:
+        def __init__(self, release_inactive: bool = False) -> None:
             self._active: Optional[Union[int, str]] = None
             self._views: Dict[Union[int, str], View] = {}
+            self._factories: Dict[Union[int, str], Callable[[], View]] = {}
+            self._release_inactive = release_inactive
+            self._loading: Optional[Tuple[Union[int, str], Thread]] = None
+            self._loading_error: Optional[Exception] = None
 
-        def remove(self, id: Union[int, str]) -> View:
-            return self._views.pop(id)
+        def remove(self, id: Union[int, str]) -> Optional[View]:
+            self._factories.pop(id, None)
+            return self._views.pop(id, None)
 
         def add(self, view: View, id: Union[int, str], active: bool) -> None:
             self._views[id] = view
             if active:
                 self.change_view(id)
 
+        def add_factory(
+            self, factory: Callable[[], View], id: Union[int, str], active: bool
+        ) -> None:
+            """Adds a view which is going to be created when changed to for the first time."""
+            self._factories[id] = factory
+            if active:
+                self.change_view(id)
+
         def change_view(self, id: Union[int, str]) -> None:
+            """
+            Changes the active view.
+
+            If the view has to be created or prepared first, that's done
+            in a background thread and the change is completed by `poll`.
+            """
+            if self._loading is not None:
+                return
             if self._active is not None:
-                self._views[self._active].deactivate()
+                previous = self._views[self._active]
+                previous.deactivate()
+                if self._release_inactive and id != self._active:
+                    previous.release()
+                    if self._active in self._factories:
+                        del self._views[self._active]
+                self._active = None
+
+            view = self._views.get(id)
+            if view is not None and not view.needs_preparation:
+                self._activate(id)
+                return
+            loader = Thread(target=self._prepare, args=(id,), daemon=True)
+            self._loading = (id, loader)
+            loader.start()
+
+        def _prepare(self, id: Union[int, str]) -> None:
+            try:
+                view = self._views.get(id)
+                if view is None:
+                    view = self._factories[id]()
+                if view.needs_preparation:
+                    view.prepare()
+                self._views[id] = view
+            except Exception as e:
+                self._loading_error = e
+
+        def _activate(self, id: Union[int, str]) -> None:
             self._active = id
             self._views[id].activate()
 
+        def poll(self) -> None:
+            """
+            Completes a pending change of the view if it's been prepared.
+
+            Raises:
+                Any exception raised while the view was being prepared.
+            """
+            if self._loading is None:
+                return
+            id, loader = self._loading
+            if loader.is_alive():
+                return
+            self._loading = None
+            if (error := self._loading_error) is not None:
+                self._loading_error = None
+                raise error
+            self._activate(id)
+
+        @property
+        def loading(self) -> bool:
+            return self._loading is not None
+
         @property
         def active_view(self) -> View:
             if self._active is None:
@@ -99,5 +196,10 @@ class Window:
     def add_view(self, view: View, id: Union[int, str], active: bool = False) -> None:
         self._view_manager.add(view, id, active)
 
-    def remove_view(self, id: Union[int, str]) -> View:
+    def add_view_factory(
+        self, factory: Callable[[], View], id: Union[int, str], active: bool = False
+    ) -> None:
+        self._view_manager.add_factory(factory, id, active)
+
+    def remove_view(self, id: Union[int, str]) -> Optional[View]:
         return self._view_manager.remove(id)
@@ -0,0 +1,54 @@
+import argparse
+
+import numpy as np
+import pytest
+
+from conftest import ROOT, TRACKS_FILE
+
+pytest.importorskip("planar")
+
+import main_benchmark  # noqa: E402
+from benchmark.parity import compare, engines, run_engine  # noqa: E402
+from benchmark.scaling import ScalingCase, run_case  # noqa: E402
+from model.car.directed_rect import SURROUNDING_RAYS_COUNT  # noqa: E402
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork  # noqa: E402
+from model.track.catalog import TrackCatalog  # noqa: E402
+
+
+def test_precision_benchmark_runs(monkeypatch, capsys) -> None:
+    monkeypatch.chdir(ROOT)
+    args = argparse.Namespace(
+        population=4, layers="4", evolve=0, track=["Straight"], top=2, seed=0
+    )
+
+    main_benchmark.main_precision(args)
+
+    report = capsys.readouterr().out
+    assert "| Straight |" in report
+
+
+def test_steady_state_scaling_case_runs() -> None:
+    points = TrackCatalog(TRACKS_FILE).points("Straight").tolist()
+    case = ScalingCase(6, [LayerInfo(4, "tanh")], 10, steady_state=True)
+
+    result = run_case(case, points, 1)
+
+    assert result.case.key.endswith("/steady")
+    assert result.generations_per_minute > 0
+
+
+def test_reference_engine_matches_itself() -> None:
+    np.random.seed(0)
+    track = TrackCatalog(TRACKS_FILE).get("Straight")
+    layers = [LayerInfo(SURROUNDING_RAYS_COUNT + 1, "tanh"), LayerInfo(4, "tanh")]
+    networks = [NeuralNetwork(layers, 2) for _ in range(5)]
+    reference = engines["reference"]
+
+    runs = [run_engine(reference, track, networks, max_ticks=50, repeats=1)]
+    runs.append(run_engine(reference, track, networks, max_ticks=50, repeats=1))
+    parity = compare("Straight", "reference", *runs)
+
+    assert parity.cars == len(networks)
+    assert parity.divergences == []
+    assert parity.adaptations_match and parity.adaptation_difference == 0.0
+    assert parity.equivalent
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+planar = pytest.importorskip("planar")
+
+from planar.line import LineSegment  # noqa: E402
+from planar.polygon import Polygon  # noqa: E402
+from planar.transform import Affine  # noqa: E402
+
+from model.car.car import Car  # noqa: E402
+from model.car.directed_rect import DirectedRectangle  # noqa: E402
+from model.simulation import CAR_SIZE, MAX_DELTA_TIME  # noqa: E402
+from model.track.track import Track  # noqa: E402
+from model.track.wall import Wall  # noqa: E402
+
+Vec2 = planar.Vec2
+
+
+def _straight_track(length: float = 200.0, width: float = 20.0) -> Track:
+    return Track.from_points(
+        [((x, 0.0), (x, width)) for x in np.arange(0.0, length + 1.0, 10.0)]
+    )
+
+
+def _inside_any(shapes, point) -> bool:
+    return any(shape.contains_point(point) for shape in shapes)
+
+
+@pytest.mark.parametrize("turning_rate", [1.0, -1.0, 0.3, 0.0])
+def test_swept_shapes_cover_the_motion_at_maximal_speed(turning_rate: float) -> None:
+    rect = DirectedRectangle.new_origin_x(*CAR_SIZE)
+    speed = Car._MAX_FORWARD_SPEED
+    shapes = rect.swept_shapes(speed, Car._TRACTION, turning_rate, MAX_DELTA_TIME)
+
+    # points slightly inside the car, sampled along the whole motion
+    inner = [rect.center + (p - rect.center) * 0.99 for p in rect.shape]
+    for fraction in np.linspace(0.0, 1.0, 101):
+        transform = rect.turn_curve_transform(
+            speed, Car._TRACTION, turning_rate, MAX_DELTA_TIME * fraction
+        )
+        for point in inner:
+            assert _inside_any(shapes, point * transform)
+
+
+def test_swept_shapes_catch_a_thin_wall_in_the_bulge_of_an_arc() -> None:
+    rect = DirectedRectangle.new_origin_x(*CAR_SIZE)
+    speed, turning_rate = Car._MAX_FORWARD_SPEED, 1.0
+    radius, _ = DirectedRectangle._turn(
+        speed, Car._TRACTION, turning_rate, MAX_DELTA_TIME
+    )
+    pivot = rect.center + rect.right_direction * radius
+    halfway = rect.turn_curve_transform(
+        speed, Car._TRACTION, turning_rate, MAX_DELTA_TIME / 2
+    )
+    # the corner farthest from the pivot halfway through the motion,
+    # a short wall across its arc just inside it, far from any chord
+    corner = max((p * halfway for p in rect.shape), key=pivot.distance_to)
+    outward = (corner - pivot).normalized()
+    tangent = outward.perpendicular()
+    middle = corner - outward * 0.05
+    wall = Wall(LineSegment.from_points([middle - tangent, middle + tangent]))
+
+    shapes = rect.swept_shapes(speed, Car._TRACTION, turning_rate, MAX_DELTA_TIME)
+
+    assert any(wall.intersects(shape, enclosed=True) for shape in shapes)
+
+
+def test_long_shape_crossing_a_far_wall_intersects_the_track() -> None:
+    track = _straight_track()
+    # starts in the first segment, leaves the track through the left wall
+    # far from both of its ends
+    crossing = Polygon.convex_hull([(5, 9), (5, 11), (195, 25), (195, 27)])
+    inside = Polygon.convex_hull([(5, 9), (5, 11), (195, 15), (195, 17)])
+
+    assert track.intersects(crossing)
+    assert not track.intersects(inside)
+
+
+def test_car_inside_the_track_does_not_collide() -> None:
+    track = _straight_track()
+    rect = DirectedRectangle.new_origin_x(*CAR_SIZE)
+    rect.transform(Affine.translation(Vec2(100.0, 10.0)))
+
+    assert not track.intersects(rect.shape)
+    rect.transform(Affine.translation(Vec2(0.0, 8.0)))
+    assert track.intersects(rect.shape)
@@ -0,0 +1,70 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from conftest import TRACKS_FILE
+
+pytest.importorskip("planar")
+
+from model.track.catalog import TrackCatalog  # noqa: E402
+from model.track.compiled import CompiledTrack, source_hash  # noqa: E402
+from model.track.track import Track  # noqa: E402
+
+
+@pytest.fixture
+def points() -> np.ndarray:
+    return TrackCatalog(TRACKS_FILE).points("First")
+
+
+def test_load_matches_build(points, tmp_path):
+    directory = str(tmp_path / "track")
+    built = CompiledTrack.build(points, directory)
+    loaded = CompiledTrack.load(directory, source_hash(points))
+
+    assert set(loaded.arrays) == set(built.arrays)
+    for name, array in built.arrays.items():
+        assert isinstance(loaded.arrays[name], np.memmap)
+        np.testing.assert_array_equal(loaded.arrays[name], array)
+
+
+def test_track_uses_mapped_arrays(points, tmp_path):
+    compiled = CompiledTrack.build(points, str(tmp_path / "track"))
+    track = compiled.track()
+    expected = Track.from_points(points.tolist())
+
+    assert track.wall_array is compiled.walls
+    np.testing.assert_array_equal(track.wall_array, expected.wall_array)
+    assert track.wall_grid.indexes is compiled.grid_indexes
+    np.testing.assert_array_equal(track.wall_grid.offsets, expected.wall_grid.offsets)
+    np.testing.assert_array_equal(track.wall_grid.indexes, expected.wall_grid.indexes)
+    for low, high in [((0, 0), (50, 50)), ((-1e3, -1e3), (1e3, 1e3))]:
+        np.testing.assert_array_equal(
+            track.wall_grid.overlapping(low, high),
+            expected.wall_grid.overlapping(low, high),
+        )
+
+
+def test_get_rebuilds_stale_track(points, tmp_path):
+    directory = str(tmp_path / "track")
+    CompiledTrack.build(points[:-1], directory)
+
+    compiled = CompiledTrack.get(points, directory)
+
+    assert compiled.source_hash == source_hash(points)
+    np.testing.assert_array_equal(compiled.points, points)
+
+
+def test_load_rejects_other_version(points, tmp_path):
+    directory = str(tmp_path / "track")
+    CompiledTrack.build(points, directory)
+    meta_file = os.path.join(directory, "meta.json")
+    with open(meta_file) as file:
+        meta = json.load(file)
+    meta["version"] -= 1
+    with open(meta_file, "w") as file:
+        json.dump(meta, file)
+
+    with pytest.raises(ValueError):
+        CompiledTrack.load(directory)
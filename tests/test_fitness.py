@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("planar")
+
+from model.car.car import Car  # noqa: E402
+from model.fitness import Progress, SpeedFitness  # noqa: E402
+from model.track.track import Track  # noqa: E402
+
+# three segments 100 long along X, centerline at y = 5
+TRACK = Track.from_points([[(x, 0), (x, 10)] for x in range(0, 400, 100)])
+
+
+def _drive(progress: Progress, positions: list, delta_time: float = 1.0) -> None:
+    """Moves car 0 through positions along the centerline, the first one at rest."""
+    cars = np.array([0])
+    for tick, x in enumerate(positions):
+        segment = np.array([min(int(x // 100), 2)])
+        centers = np.array([[x, 5.0]])
+        progress.update(cars, segment, centers, np.zeros(1), delta_time * (tick > 0))
+
+
+def test_max_speed_is_cars():
+    assert SpeedFitness.MAX_SPEED == Car._MAX_FORWARD_SPEED
+
+
+def test_pace_counts_distance_gained_since_start():
+    progress = Progress(TRACK, 1)
+    _drive(progress, [50.0, 70.0, 90.0, 110.0])
+
+    assert progress.time[0] == 3.0
+    assert progress.pace[0] == pytest.approx(20.0)
+
+
+def test_going_back_and_forth_is_slower():
+    straight, wiggling = Progress(TRACK, 1), Progress(TRACK, 1)
+    _drive(straight, [50.0, 70.0, 90.0])
+    _drive(wiggling, [50.0, 90.0, 50.0, 90.0, 70.0, 90.0])
+
+    assert wiggling.pace[0] < straight.pace[0]
+    assert SpeedFitness.value(wiggling)[0] < SpeedFitness.value(straight)[0]
+
+
+def test_cars_which_never_drove_have_no_pace():
+    progress = Progress(TRACK, 2)
+    _drive(progress, [50.0])
+
+    np.testing.assert_array_equal(progress.pace, [0.0, 0.0])
@@ -0,0 +1,95 @@
+import os
+import signal
+
+import numpy as np
+import pytest
+
+pytest.importorskip("planar")
+
+from model.neural_network.neural_network import LayerInfo  # noqa: E402
+from model.neuroevolution.config import NeuroevolutionConfig  # noqa: E402
+from model.neuroevolution.islands import (  # noqa: E402
+    IslandDriver,
+    IslandModelSettings,
+)
+
+LAYERS = [LayerInfo(3, "tanh"), LayerInfo(4, "tanh")]
+CONFIG = NeuroevolutionConfig(individuals=6, max_parents=3)
+
+
+class _ScoringEnvironment:
+    """Scores networks by their parameters instead of simulating cars."""
+
+    def generate_adaptations(self, networks_groups):
+        return {
+            name: [float(np.tanh(network.parameters).sum()) for network in group]
+            for name, group in networks_groups.items()
+        }
+        yield
+
+
+class _FailingEnvironment:
+    def generate_adaptations(self, networks_groups):
+        raise ValueError("broken environment")
+        yield
+
+
+def _scoring(track):
+    return _ScoringEnvironment()
+
+
+def _failing(track):
+    return _FailingEnvironment()
+
+
+def _killed(track):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _driver(tmp_path, make_environment, islands=2):
+    settings = IslandModelSettings(
+        islands=islands,
+        epochs=2,
+        generations_per_epoch=2,
+        migrants=1,
+        checkpoint_directory=str(tmp_path),
+        seed=0,
+    )
+    return IslandDriver(
+        "unused", LAYERS, CONFIG, settings, make_environment=make_environment
+    )
+
+
+def test_run_locally(tmp_path):
+    driver = _driver(tmp_path, _scoring)
+
+    best = driver.run_locally()
+
+    epochs = [(s.island, s.epoch) for s in driver.stats]
+    assert epochs == [(0, 1), (1, 1), (0, 2), (1, 2)]
+    # islands run one after another, so island 1 gets island 0's migrant right away
+    assert [s.immigrants for s in driver.stats] == [0, 1, 1, 1]
+    assert len(best) == 2 * CONFIG.individuals
+    adaptations = [individual.adaptation for individual in best]
+    assert adaptations == sorted(adaptations, reverse=True)
+    assert driver.epoch_summary(2)[0] == adaptations[0]
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_run_in_processes(tmp_path):
+    driver = _driver(tmp_path, _scoring)
+
+    best = driver.run()
+
+    assert len(driver.stats) == 4
+    assert len(best) == 2 * CONFIG.individuals
+
+
+def test_failed_island_is_reported(tmp_path):
+    with pytest.raises(RuntimeError, match="broken environment"):
+        _driver(tmp_path, _failing).run()
+
+
+def test_killed_island_is_reported(tmp_path):
+    with pytest.raises(RuntimeError, match="exit code"):
+        _driver(tmp_path, _killed, islands=1).run()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from model.neural_network.activation_functions import activation_functions_utils
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork
+
+TOLERANCES = {np.float64: 1e-12, np.float32: 1e-5}
+
+
+def _network(activation: str, dtype: type) -> NeuralNetwork:
+    layers = [LayerInfo(6, activation), LayerInfo(8, activation), LayerInfo(5, "tanh")]
+    return NeuralNetwork(layers, 2).astype(dtype)
+
+
+@pytest.mark.parametrize("activation", sorted(activation_functions_utils))
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("batch_size", [1, 7])
+def test_plan_matches_predict(activation: str, dtype: type, batch_size: int) -> None:
+    np.random.seed(0)
+    network = _network(activation, dtype)
+    plan = network.compile(batch_size)
+    for _ in range(3):
+        data = np.random.uniform(-5, 5, (batch_size, 6)).astype(dtype)
+        expected = network.predict(data)
+        result = plan.predict(data)
+        assert result.dtype == dtype
+        np.testing.assert_allclose(result, expected, rtol=TOLERANCES[dtype], atol=0)
+
+
+@pytest.mark.parametrize("activation", sorted(activation_functions_utils))
+def test_plan_of_another_type_matches_predict(activation: str) -> None:
+    np.random.seed(1)
+    network = _network(activation, np.float64)
+    plan = network.compile(4, np.float32)
+    data = np.random.uniform(-5, 5, (4, 6))
+
+    result = plan.predict(data.astype(np.float32))
+
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, network.predict(data), rtol=1e-5, atol=1e-6)
+
+
+def test_plan_is_a_snapshot() -> None:
+    np.random.seed(2)
+    network = _network("tanh", np.float64)
+    plan = network.compile()
+    data = np.random.uniform(-1, 1, (1, 6))
+    expected = network.predict(data)
+
+    network.parameters[...] = 0.0
+
+    np.testing.assert_allclose(plan.predict(data), expected, rtol=1e-12)
+
+
+def test_plan_rejects_other_batch_sizes() -> None:
+    plan = _network("tanh", np.float64).compile(2)
+    with pytest.raises(ValueError):
+        plan.predict(np.zeros((3, 6)))
@@ -0,0 +1,50 @@
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+pytest.importorskip("planar")
+
+from model.neural_network.neural_network import LayerInfo  # noqa: E402
+from model.neuroevolution.config import NeuroevolutionConfig  # noqa: E402
+from model.neuroevolution.neuroevolution import Neuroevolution  # noqa: E402
+
+LAYERS = [LayerInfo(3, "tanh"), LayerInfo(4, "tanh")]
+
+
+class _InlineEvaluator:
+    """Evaluates batches right away in this process, in place of `AsyncEvaluator`."""
+
+    batch_size = 3
+    capacity = 2
+
+    def __init__(self) -> None:
+        self.evaluated = 0
+
+    def submit(self, networks):
+        self.evaluated += len(networks)
+        future: Future = Future()
+        future.set_result([float(np.tanh(n.parameters).sum()) for n in networks])
+        return future
+
+
+def test_steady_state_keeps_a_sorted_population():
+    np.random.seed(0)
+    config = NeuroevolutionConfig(individuals=10, max_parents=4, golden_tickets=2)
+    neuroevolution = Neuroevolution.init_with_neural_network_info(LAYERS, 2, config)
+    evaluator = _InlineEvaluator()
+
+    best = []
+    for _ in range(5):
+        neuroevolution.evolve_steady_state(evaluator)
+        adaptations = [i.adaptation for i in neuroevolution.individuals]
+        assert len(adaptations) == config.individuals
+        assert adaptations == sorted(adaptations, reverse=True)
+        best.append(adaptations[0])
+
+    # the best individual is never lost and every call evaluates a generation
+    assert best == sorted(best)
+    assert evaluator.evaluated >= 5 * config.individuals
+    assert len(neuroevolution._evaluating) <= evaluator.capacity
+    parents = neuroevolution._parents
+    assert parents[:2] == neuroevolution.individuals[:2]
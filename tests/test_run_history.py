@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork, Topology
+from model.run_history import RunHistory
+
+LAYERS = (LayerInfo(6, "tanh"), LayerInfo(4, "relu"))
+
+
+@pytest.fixture
+def history(tmp_path):
+    with RunHistory(str(tmp_path / "store" / "history.sqlite")) as history:
+        yield history
+
+
+def test_round_trip(history):
+    topology = Topology.shared(LAYERS, 2)
+    run = history.start_run("test", "First", topology, np.float64)
+    generations = [[NeuralNetwork(list(LAYERS), 2) for _ in range(3)] for _ in range(2)]
+    history.add_generation(run, 0, generations[0], [1.0, 3.0, 2.0])
+    history.add_generation(run, 1, generations[1], [5.0, 0.0, 4.0])
+    other = history.start_run("other", "DNA", topology)
+    history.add_generation(other, 0, generations[0][:1], [10.0])
+
+    top = history.top(2, run=run)
+    assert [(n.generation, n.fitness) for n in top] == [(1, 5.0), (1, 4.0)]
+    network = top[0].network
+    assert network.topology == topology
+    np.testing.assert_array_equal(network.parameters, generations[1][0].parameters)
+    inputs = np.random.default_rng(0).standard_normal((5, 6))
+    np.testing.assert_allclose(
+        network.predict(inputs), generations[1][0].predict(inputs)
+    )
+
+    progress = [(0, 3.0, 2.0), (1, 5.0, 3.0)]
+    assert history.progress(run) == progress
+    first_generation = history.top(track="First", generation=0)
+    assert [n.fitness for n in first_generation] == [3.0, 2.0, 1.0]
+    assert history.top(1)[0].run == other
+    assert [r.name for r in history.runs("DNA")] == ["other"]
+
+    # float32 weights are stored by default
+    stored = history.top(1, run=other)[0]
+    assert stored.run.dtype is np.float32
+    np.testing.assert_allclose(
+        stored.network.parameters, generations[0][0].parameters, rtol=1e-6
+    )
+
+    history.close()
+    with RunHistory(history.file) as reopened:
+        assert reopened.run(run.id).topology == topology
+        assert reopened.progress(reopened.run(run.id)) == progress
+
+
+def test_rejects_mismatched_generations(history):
+    run = history.start_run("test", "First", Topology.shared(LAYERS, 2))
+
+    with pytest.raises(ValueError):
+        history.add_generation(run, 0, [NeuralNetwork(list(LAYERS), 2)], [])
+    with pytest.raises(ValueError):
+        history.add_generation(run, 0, [NeuralNetwork(list(LAYERS), 3)], [1.0])
+    with pytest.raises(KeyError):
+        history.run(run.id + 1)
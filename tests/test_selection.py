@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from model.neuroevolution.config import NeuroevolutionConfig
+from model.neuroevolution.selection import selection_schemes
+
+CONFIG = NeuroevolutionConfig()
+ADAPTATIONS = np.arange(10.0, 0.0, -1.0)
+
+
+def _select(name, adaptations, golden_tickets, count, config=CONFIG, seed=0):
+    np.random.seed(seed)
+    return selection_schemes[name].select(adaptations, golden_tickets, count, config)
+
+
+@pytest.mark.parametrize("name", list(selection_schemes))
+@pytest.mark.parametrize(
+    "adaptations", [ADAPTATIONS, np.zeros(10)], ids=["sorted", "all_zero"]
+)
+def test_selection_is_seeded_and_skips_golden_tickets(name, adaptations):
+    chosen = _select(name, adaptations, 3, 4)
+
+    np.testing.assert_array_equal(chosen, _select(name, adaptations, 3, 4))
+    assert chosen.dtype.kind == "i"
+    assert len(chosen) <= 4
+    assert np.all((chosen >= 3) & (chosen < len(adaptations)))
+    assert np.all(np.diff(chosen) >= 0)
+
+
+@pytest.mark.parametrize("name", list(selection_schemes))
+def test_nothing_left_to_choose(name):
+    assert len(_select(name, ADAPTATIONS, 3, 0)) == 0
+    assert len(_select(name, ADAPTATIONS[:3], 3, 4)) == 0
+
+
+def test_truncation():
+    np.testing.assert_array_equal(_select("truncation", ADAPTATIONS, 2, 3), [2, 3, 4])
+    np.testing.assert_array_equal(_select("truncation", ADAPTATIONS, 7, 5), [7, 8, 9])
+
+
+def test_tournament():
+    config = NeuroevolutionConfig(tournament_size=1)
+    np.random.seed(0)
+    expected = np.sort(np.random.randint(8, size=(6, 1)).min(axis=1)) + 2
+
+    np.testing.assert_array_equal(
+        _select("tournament", ADAPTATIONS, 2, 6, config), expected
+    )
+    # with huge tournaments the best candidate wins every one of them
+    config = NeuroevolutionConfig(tournament_size=1000)
+    np.testing.assert_array_equal(
+        _select("tournament", ADAPTATIONS, 2, 3, config), [2, 2, 2]
+    )
+
+
+def test_rank():
+    np.testing.assert_array_equal(_select("rank", ADAPTATIONS, 6, 10), [6, 7, 8, 9])
+
+    chosen = _select("rank", ADAPTATIONS, 1, 5)
+    assert len(np.unique(chosen)) == 5
+    # better ranks are chosen more often
+    counts = np.bincount(
+        np.concatenate(
+            [_select("rank", ADAPTATIONS, 1, 3, seed=s) for s in range(500)]
+        ),
+        minlength=10,
+    )
+    assert counts[1] > counts[5] > counts[9]
+
+
+def test_proportional():
+    # with exponent 0 every candidate has probability 1
+    config = NeuroevolutionConfig(selection_exponent=0.0)
+    np.testing.assert_array_equal(
+        _select("proportional", ADAPTATIONS, 2, 3, config), [2, 3, 4]
+    )
+    # nobody is fitter than the worst individual of an all-zero population
+    assert len(_select("proportional", np.zeros(10), 2, 3)) == 0
+
+
+def test_stochastic_universal():
+    # the adaptations of the candidates sum up to count, pointers are a step apart
+    adaptations = np.array([5.0, 5.0, 2.0, 1.0, 1.0, 0.0])
+    for seed in range(10):
+        np.testing.assert_array_equal(
+            _select("sus", adaptations, 2, 4, seed=seed), [2, 2, 3, 4]
+        )
+    # all-zero adaptations give every candidate the same share
+    np.testing.assert_array_equal(
+        _select("sus", np.zeros(6), 2, 4, seed=0), [2, 3, 4, 5]
+    )
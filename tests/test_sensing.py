@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from conftest import TRACKS_FILE
+
+pytest.importorskip("planar")
+
+from planar import Vec2  # noqa: E402
+from planar.transform import Affine  # noqa: E402
+
+from model.car.car import Car  # noqa: E402
+from model.car.directed_rect import SURROUNDING_RAYS_COUNT  # noqa: E402
+from model.car.sensing import IncrementalSensing  # noqa: E402
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork  # noqa: E402
+from model.simulation import CAR_SIZE  # noqa: E402
+from model.track.catalog import TrackCatalog  # noqa: E402
+from model.track.track import Track  # noqa: E402
+
+
+def _closest(track: Track, car: Car) -> list:
+    """Distances to the closest walls, testing every wall of the track."""
+    distances = []
+    for sensor in car.sensors:
+        hits = [sensor.check_distance(wall) for wall in track.walls]
+        distances.append(min(d for d in hits if d is not None))
+    return distances
+
+
+def _cars(track: Track, count: int, rng: np.random.Generator) -> list:
+    network = NeuralNetwork([LayerInfo(SURROUNDING_RAYS_COUNT + 1, "tanh")] * 2, 2)
+    cars = []
+    for segment in rng.integers(1, len(track.segments) - 1, count):
+        car = Car.with_standard_sensors(CAR_SIZE, network)
+        car.transform(Affine.rotation(rng.uniform(0, 360)))
+        car.transform(Affine.translation(track.segments[segment].region.centroid))
+        cars.append(car)
+    return cars
+
+
+@pytest.mark.parametrize("name", ["First", "DNA"])
+def test_sensed_distances_are_the_closest_ones(name: str) -> None:
+    track = TrackCatalog(TRACKS_FILE).get(name)
+    rng = np.random.default_rng(0)
+    cars = _cars(track, 20, rng)
+    sensing = IncrementalSensing(track, len(cars), SURROUNDING_RAYS_COUNT)
+    indexes = list(range(len(cars)))
+
+    for _ in range(4):
+        distances = sensing.sense(indexes, [car.sensors for car in cars])
+        expected = [_closest(track, car) for car in cars]
+        np.testing.assert_allclose(distances, expected, rtol=1e-9)
+        for car in cars:
+            car.transform(Affine.rotation(rng.uniform(-10, 10), car.rect.center))
+            car.transform(Affine.translation(car.rect.direction * 3.0))
+
+    stats = sensing.stats
+    assert stats.searches >= len(cars) * SURROUNDING_RAYS_COUNT
+    assert stats.full_scans == 0
+    assert stats.hits > 0
+    assert stats.total == 4 * len(cars) * SURROUNDING_RAYS_COUNT
+
+
+def test_a_closer_wall_than_the_last_hit_one_is_found() -> None:
+    track = Track.from_points(
+        [((x, 0.0), (x, 20.0)) for x in np.arange(0.0, 201.0, 10.0)]
+    )
+    car = _cars(track, 1, np.random.default_rng(1))[0]
+    car.transform(Affine.translation(Vec2(100.0, 10.0) - car.rect.center))
+    sensing = IncrementalSensing(track, 1, SURROUNDING_RAYS_COUNT)
+    sensing.sense([0], [car.sensors])
+
+    # far away from the walls hit before, sideways rays hit other walls now
+    car.transform(Affine.translation(Vec2(-60.0, 0.0)))
+    distances = sensing.sense([0], [car.sensors])
+
+    np.testing.assert_allclose(distances[0], _closest(track, car), rtol=1e-9)
@@ -0,0 +1,47 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from conftest import TRACKS_FILE
+
+pytest.importorskip("planar")
+
+from model.car.directed_rect import SURROUNDING_RAYS_COUNT  # noqa: E402
+from model.environment.environment import Environment  # noqa: E402
+from model.environment.remote import RemoteEnvironment  # noqa: E402
+from model.environment.server import EvaluationServer  # noqa: E402
+from model.neural_network.neural_network import LayerInfo, NeuralNetwork  # noqa: E402
+from model.track.catalog import TrackCatalog  # noqa: E402
+from view.silent_environment import SilentEnvironment  # noqa: E402
+
+LAYERS = [LayerInfo(SURROUNDING_RAYS_COUNT + 1, "tanh"), LayerInfo(4, "tanh")]
+
+
+def test_server_evaluates_a_generation():
+    np.random.seed(0)
+    points = TrackCatalog(TRACKS_FILE).points("Straight")
+    # a generation of random networks, sent in two groups like children and parents
+    networks = [NeuralNetwork(LAYERS, 2) for _ in range(12)]
+    groups = {"children": networks[:8], "parents": networks[8:]}
+    expected = Environment.compute_adaptations(
+        SilentEnvironment(TrackCatalog(TRACKS_FILE).get("Straight")), groups
+    )
+
+    async def serve() -> None:
+        server = EvaluationServer({"straight": points}, processes=0, min_chunk=4)
+        address = await server.start(("127.0.0.1", 0))
+        loop = asyncio.get_running_loop()
+        with RemoteEnvironment(address, "straight", timeout=60) as remote:
+            # the client blocks, so it runs in a thread while the loop serves it
+            adaptations = await loop.run_in_executor(None, remote.evaluate, groups)
+            assert server.evaluated == len(networks)
+            for name, group in expected.items():
+                np.testing.assert_allclose(list(adaptations[name]), list(group))
+
+            await asyncio.wait_for(server.close(), 10)
+            assert not server._connections
+            with pytest.raises((ConnectionError, OSError)):
+                await loop.run_in_executor(None, remote.evaluate, groups)
+
+    asyncio.run(serve())
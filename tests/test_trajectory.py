@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+planar = pytest.importorskip("planar")
+
+from model.trajectory import (  # noqa: E402
+    SEGMENT,
+    X,
+    TrajectoryRecorder,
+    load_trajectories,
+    save_trajectories,
+)
+
+
+def _car(x: float, segment: int = 0) -> SimpleNamespace:
+    rect = SimpleNamespace(center=planar.Vec2(x, 0.0), direction=planar.Vec2(1.0, 0.0))
+    return SimpleNamespace(
+        rect=rect, speed=10.0, active_segment=segment, distances=[1.0] * 5
+    )
+
+
+def _recorder(max_ticks: int = 10) -> TrajectoryRecorder:
+    recorder = TrajectoryRecorder(max_ticks)
+    recorder.start({"cars": 2}, 0.1, np.zeros((3, 2, 2)), (10.0, 20.0))
+    return recorder
+
+
+def test_only_crashed_cars_are_marked() -> None:
+    recorder = _recorder()
+    for tick in range(3):
+        recorder.record("cars", 0, _car(tick))
+        if tick == 2:
+            recorder.crash("cars", 1)
+        recorder.record("cars", 1, _car(tick, segment=tick))
+
+    running, crashed = recorder.trajectory("cars", 0), recorder.trajectory("cars", 1)
+    assert not running.crashed
+    assert not running.crashed_at(2)
+    assert crashed.crashed
+    assert not crashed.crashed_at(1)
+    assert crashed.crashed_at(2)
+    assert crashed.crashed_at(5)
+    assert crashed.data[:, SEGMENT].tolist() == [0, 1, 2]
+
+
+def test_crash_after_the_last_recorded_tick_is_ignored() -> None:
+    recorder = _recorder(max_ticks=2)
+    for tick in range(2):
+        recorder.record("cars", 0, _car(tick))
+    recorder.crash("cars", 0)
+    recorder.record("cars", 0, _car(2))
+
+    trajectory = recorder.trajectory("cars", 0)
+    assert len(trajectory) == 2
+    assert not trajectory.crashed
+
+
+def test_saved_trajectories_are_loaded_back(tmp_path) -> None:
+    recorder = _recorder()
+    for tick in range(4):
+        recorder.record("cars", 0, _car(tick))
+    recorder.crash("cars", 1)
+    recorder.record("cars", 1, _car(0))
+    file = str(tmp_path / "trajectories.npz")
+    save_trajectories(file, [recorder.trajectory("cars", i) for i in range(2)])
+
+    first, second = load_trajectories(file)
+    assert first.data[:, X].tolist() == [0, 1, 2, 3]
+    assert not first.crashed
+    assert len(second) == 1
+    assert second.crashed
+    assert second.car_size == (10.0, 20.0)
+
+
+def test_trajectories_saved_without_crashes_count_as_crashed(tmp_path) -> None:
+    file = str(tmp_path / "legacy.npz")
+    np.savez_compressed(
+        file,
+        data=np.zeros((1, 2, 10)),
+        lengths=np.array([2]),
+        car_size=np.array((10.0, 20.0)),
+        delta_time=np.array(0.1),
+        track_points=np.zeros((3, 2, 2)),
+    )
+
+    (trajectory,) = load_trajectories(file)
+    assert trajectory.crashed
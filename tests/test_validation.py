@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from conftest import TRACKS_FILE
+
+pytest.importorskip("planar")
+
+from model.track.catalog import TrackCatalog, track_key  # noqa: E402
+from model.track.validation import InvalidTrack, validate_points  # noqa: E402
+
+
+def _straight(segments: int = 4) -> list:
+    return [[(x, 0.0), (x, 10.0)] for x in np.arange(segments + 1) * 10.0]
+
+
+def test_straight_track_is_valid():
+    report = validate_points(_straight())
+
+    assert report.valid
+    assert report.intersections.shape == (0, 2)
+
+
+def test_short_wall_and_thin_segment():
+    points = _straight()
+    # the last cross-section collapses into a point
+    points[-1] = [(40.0, 5.0), (40.0, 5.0)]
+
+    report = validate_points(points)
+
+    assert not report.valid
+    np.testing.assert_array_equal(report.short_walls, [9])
+    np.testing.assert_array_equal(report.degenerate_segments, [3])
+
+
+def test_flat_segment():
+    points = _straight()
+    # both walls of segment 1 on the same line as its cross-sections
+    points[1] = [(10.0, 0.0), (10.0, 0.0)]
+    points[2] = [(10.0, 0.0), (10.0, 10.0)]
+
+    report = validate_points(points)
+
+    assert 1 in report.degenerate_segments
+
+
+def test_crossed_segment():
+    points = _straight()
+    # the walls of segment 2 cross each other
+    points[3] = [(30.0, 10.0), (30.0, 0.0)]
+
+    report = validate_points(points)
+
+    np.testing.assert_array_equal(report.non_simple_segments, [2, 3])
+
+
+def test_crossing_walls():
+    # the track turns back up and then goes down across its segment 1
+    points = _straight(2) + [
+        [(15.0, 30.0), (25.0, 30.0)],
+        [(15.0, -20.0), (25.0, -20.0)],
+    ]
+
+    report = validate_points(points)
+
+    assert not report.valid
+    pairs = report.intersections.tolist()
+    # left wall of segment 3 crosses both walls of segment 1
+    assert [2, 6] in pairs and [3, 6] in pairs
+    point = report.intersection_points[pairs.index([2, 6])]
+    np.testing.assert_allclose(point, (15.0, 0.0))
+    assert all(report.wall_segment(a) != report.wall_segment(b) for a, b in pairs)
+    assert "wall intersections" in report.summary()
+
+
+def test_catalog_rejects_invalid_tracks():
+    catalog = TrackCatalog(TRACKS_FILE, validate=True)
+
+    assert catalog.get("First").segments
+    with pytest.raises(InvalidTrack) as error:
+        catalog.get("Second")
+    assert not error.value.report.valid
+
+
+def test_catalog_checks_tracks_given_on_command_line():
+    catalog = TrackCatalog(TRACKS_FILE)
+
+    assert catalog.check(track_key(TrackCatalog.DEFAULT_TRACK)) == "First"
+    assert catalog.check(track_key("3")) == "Straight"
+    with pytest.raises(InvalidTrack):
+        catalog.check(track_key("1"))
+    with pytest.raises(KeyError):
+        catalog.check(track_key("Fourth"))